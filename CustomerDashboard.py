@@ -1,13 +1,12 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tksheet
 from tkinter import messagebox
 from datetime import datetime
 import tkinter.ttk as ttk
-import re
 import logging
 from typing import Dict, Optional
+from table_sync import TreeviewSync
+from dashboard_models import CustomerDashboardModel, RECENT_BOOKINGS_LIMIT
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +18,9 @@ class CustomerDashboard(ctk.CTkFrame):
         self.db = db  # Using the shared DatabaseManager instance
         self.current_user = None
         self.sheet = None
+        # Widgets are built once and then follow this model
+        self.model = CustomerDashboardModel()
+        self._built = False
 
         # Configure grid layout
         self.grid_rowconfigure(0, weight=1)
@@ -33,26 +35,38 @@ class CustomerDashboard(ctk.CTkFrame):
         self.main_content.grid_rowconfigure(1, weight=1)
         self.main_content.grid_columnconfigure(0, weight=1)
 
+        self.create_sidebar()
+
         # Placeholder for initial empty state
         self.show_loading_state()
+
+        # The dashboard reloads itself when shown, so changes made meanwhile are not replayed
+        self.controller.change_feed.subscribe(
+            ("reservations",),
+            self.on_reservations_changed,
+            owner=self,
+            catch_up=False
+        )
         logger.info("CustomerDashboard initialized")
 
     def update_user_display(self, user_data: Dict) -> None:
-        """Update the dashboard with user data"""
+        """Bind the dashboard to user_data and refresh its figures in the background"""
         try:
             logger.info(f"Updating dashboard for customer: {user_data.get('email', 'unknown')}")
             self.current_user = user_data
 
-            # Clear existing widgets
-            for widget in self.sidebar.winfo_children():
-                widget.destroy()
-
-            for widget in self.main_content.winfo_children():
-                widget.destroy()
+            if not self._built:
+                for widget in self.main_content.winfo_children():
+                    widget.destroy()
+                self.create_main_content()
+                self._built = True
 
-            # Recreate components
-            self.create_sidebar()
-            self.create_main_content()
+            if self.model.set_user(user_data):
+                # Someone else signed in: never show the previous customer's figures
+                self.render_metrics()
+                self.render_recent_bookings()
+            self.render_user()
+            self.load_summary()
 
         except Exception as e:
             error_msg = f"Failed to update dashboard: {str(e)}"
@@ -60,6 +74,53 @@ class CustomerDashboard(ctk.CTkFrame):
             messagebox.showerror("Error", error_msg)
             self.show_error_state()
 
+    def load_summary(self) -> None:
+        """Fetch the signed-in customer's figures on a background worker"""
+        if self.model.user_id is None:
+            return
+        self.controller.db_executor.submit(
+            self._fetch_summary,
+            self.model.user_id,
+            on_success=self._apply_summary,
+            on_error=lambda e: logger.error(f"Database error loading customer dashboard: {e}"),
+            owner=self,
+            key="summary"
+        )
+
+    def on_reservations_changed(self, event) -> None:
+        """Reload after a reservation write, possibly made from another terminal"""
+        # The feed only knows reservation ids, so drop this customer's cached summary outright
+        self.db.invalidate_customer(self.model.user_id)
+        self.load_summary()
+
+    def _fetch_summary(self, user_id: int) -> Dict:
+        """Everything the dashboard shows for one customer; runs off the Tk thread"""
+        return self.db.get_customer_summary(user_id, RECENT_BOOKINGS_LIMIT)
+
+    def _apply_summary(self, summary: Dict) -> None:
+        """Update only the widgets whose data changed"""
+        changed = self.model.apply(summary)
+        if "metrics" in changed:
+            self.render_metrics()
+        if "recent_bookings" in changed:
+            self.render_recent_bookings()
+
+    def render_user(self) -> None:
+        self.username_label.configure(text=self.model.first_name)
+        self.welcome_label.configure(text=f"Welcome back, {self.model.full_name}")
+
+    def render_metrics(self) -> None:
+        for label, text in zip(self.metric_value_labels, self.model.metric_texts()):
+            label.configure(text=text)
+
+    def render_recent_bookings(self) -> None:
+        bookings = self.model.recent_bookings
+        self.bookings_sync.sync(bookings)
+        if bookings:
+            self.no_bookings_label.pack_forget()
+        elif self.model.metrics is not None:
+            self.no_bookings_label.pack(pady=50)
+
     def show_loading_state(self) -> None:
         """Show loading state before user data is available"""
         loading_frame = ctk.CTkFrame(self.main_content, fg_color="white")
@@ -76,6 +137,7 @@ class CustomerDashboard(ctk.CTkFrame):
         """Show error state if something goes wrong"""
         for widget in self.main_content.winfo_children():
             widget.destroy()
+        self._built = False
 
         error_frame = ctk.CTkFrame(self.main_content, fg_color="white")
         error_frame.pack(expand=True, fill="both")
@@ -151,11 +213,8 @@ class CustomerDashboard(ctk.CTkFrame):
             raise
 
     def create_main_content(self) -> None:
-        """Create the main content area with dashboard widgets"""
+        """Build the dashboard widgets once; data is filled in by the render_* methods"""
         try:
-            if not self.current_user:
-                return
-
             # ===== HEADER SECTION =====
             header_frame = ctk.CTkFrame(self.main_content, height=70, fg_color="white", corner_radius=0)
             header_frame.grid(row=0, column=0, sticky="ew", padx=0, pady=0)
@@ -190,18 +249,16 @@ class CustomerDashboard(ctk.CTkFrame):
                 ).pack(side="left", padx=15)
 
             # User info
-            if self.current_user:
-                username = self.current_user.get('full_name', '').split()[0]
-                if username:
-                    user_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
-                    user_frame.grid(row=0, column=2, padx=20, sticky="e")
-
-                    ctk.CTkLabel(
-                        user_frame,
-                        text=username,
-                        font=("Arial", 14),
-                        text_color="#64748b"
-                    ).pack(side="left", padx=5)
+            user_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
+            user_frame.grid(row=0, column=2, padx=20, sticky="e")
+
+            self.username_label = ctk.CTkLabel(
+                user_frame,
+                text="",
+                font=("Arial", 14),
+                text_color="#64748b"
+            )
+            self.username_label.pack(side="left", padx=5)
 
             # ===== CONTENT AREA =====
             content = ctk.CTkScrollableFrame(self.main_content, fg_color="#f8fafc")
@@ -211,50 +268,41 @@ class CustomerDashboard(ctk.CTkFrame):
             welcome_frame = ctk.CTkFrame(content, fg_color="transparent")
             welcome_frame.pack(fill="x", padx=20, pady=(20, 10))
 
-            ctk.CTkLabel(
+            self.welcome_label = ctk.CTkLabel(
                 welcome_frame,
-                text=f"Welcome back, {self.current_user.get('full_name', 'Customer')}",
+                text="Welcome back",
                 font=("Arial", 20, "bold"),
                 text_color="#2c3e50"
-            ).pack(side="left")
+            )
+            self.welcome_label.pack(side="left")
 
             # ===== METRICS CARDS =====
             metrics_frame = ctk.CTkFrame(content, fg_color="transparent")
             metrics_frame.pack(fill="x", padx=20, pady=20)
 
-            try:
-                total_bookings_cost = self.db.get_customer_total_bookings_cost(self.current_user['user_id'])
-                upcoming_reservations = self.db.get_customer_upcoming_reservations_count(self.current_user['user_id'])
-                past_reservations = self.db.get_customer_past_reservations_count(self.current_user['user_id'])
-            except Exception as e:
-                logger.error(f"Database error loading metrics: {e}")
-                messagebox.showerror("Database Error", f"Failed to load metrics: {str(e)}")
-                total_bookings_cost = 0
-                upcoming_reservations = 0
-                past_reservations = 0
-
             metrics = [
-                (f"${total_bookings_cost:,.2f}", "Total bookings cost", "CustomerReservationPage"),
-                (f"{upcoming_reservations:,}", "Upcoming reservations", "CustomerReservationPage"),
-                (f"{past_reservations:,}", "Past reservations", "CustomerReservationPage"),
+                ("Total bookings cost", "CustomerReservationPage"),
+                ("Upcoming reservations", "CustomerReservationPage"),
+                ("Past reservations", "CustomerReservationPage"),
             ]
 
-            for value, label, target_frame in metrics:
+            self.metric_value_labels = []
+            for label, target_frame in metrics:
                 card = ctk.CTkFrame(metrics_frame, fg_color="white", corner_radius=12, height=120)
                 card.pack(side="left", expand=True, fill="both", padx=10)
 
                 # Make clickable
                 card.bind("<Button-1>", lambda e, fn=target_frame: self.controller.show_frame(fn))
-                for child in card.winfo_children():
-                    child.bind("<Button-1>", lambda e, fn=target_frame: self.controller.show_frame(fn))
 
-                ctk.CTkLabel(
+                value_label = ctk.CTkLabel(
                     card,
-                    text=value,
+                    text="—",
                     font=("Arial", 24, "bold"),
                     text_color="#2c3e50",
                     cursor="hand2"
-                ).pack(pady=(25, 5), padx=20, anchor="w")
+                )
+                value_label.pack(pady=(25, 5), padx=20, anchor="w")
+                self.metric_value_labels.append(value_label)
 
                 ctk.CTkLabel(
                     card,
@@ -292,137 +340,94 @@ class CustomerDashboard(ctk.CTkFrame):
             )
             view_all_btn.pack(side="right")
 
-            # Create Treeview for recent bookings
-            try:
-                # Get recent bookings (limit to 5 most recent)
-                all_bookings = self.db.get_user_reservations(self.current_user['user_id'])
-                recent_bookings = sorted(
-                    all_bookings,
-                    key=lambda x: self.parse_date_string(x.get("check_in", "Jan 01, 2000")),
-                    reverse=True
-                )[:5]  # Only show 5 most recent
-
-                # Create scrollable frame
-                scroll_frame = ctk.CTkFrame(recent_bookings_frame, fg_color="white")
-                scroll_frame.pack(fill="both", expand=True, padx=0, pady=0)
-
-                # Create vertical scrollbar
-                scrollbar = ttk.Scrollbar(scroll_frame)
-                scrollbar.pack(side="right", fill="y")
-
-                # Create the Treeview widget
-                self.reservations_tree = ttk.Treeview(
-                    scroll_frame,
-                    yscrollcommand=scrollbar.set,
-                    selectmode="browse",
-                    height=5,  # Show 5 rows by default
-                    style="Custom.Treeview"
-                )
+            # Create scrollable frame
+            scroll_frame = ctk.CTkFrame(recent_bookings_frame, fg_color="white")
+            scroll_frame.pack(fill="both", expand=True, padx=0, pady=0)
+
+            # Create vertical scrollbar
+            scrollbar = ttk.Scrollbar(scroll_frame)
+            scrollbar.pack(side="right", fill="y")
+
+            # Create the Treeview widget
+            self.reservations_tree = ttk.Treeview(
+                scroll_frame,
+                yscrollcommand=scrollbar.set,
+                selectmode="browse",
+                height=5,  # Show 5 rows by default
+                style="Custom.Treeview"
+            )
 
-                # Configure the style (same as in CustomerReservationPage)
-                style = ttk.Style()
-                style.theme_use("default")
-
-                style.configure("Custom.Treeview",
-                                background="white",
-                                foreground="#334155",
-                                rowheight=35,
-                                fieldbackground="white",
-                                bordercolor="#d1d5db",
-                                borderwidth=1,
-                                font=('Arial', 11)
-                                )
-                style.configure("Custom.Treeview.Heading",
-                                background="#f1f5f9",
-                                foreground="#334155",
-                                relief="flat",
-                                font=('Arial', 12, 'bold'),
-                                padding=(10, 5)
-                                )
-                style.map("Custom.Treeview",
-                        background=[('selected', '#3b82f6')],
-                        foreground=[('selected', 'white')]
-                        )
-
-                # Define columns
-                self.reservations_tree['columns'] = ('reservation_id', 'room_type', 'check_in', 'check_out', 'amount', 'status')
-
-                # Format columns
-                self.reservations_tree.column('#0', width=0, stretch=False)  # Hide first empty column
-                self.reservations_tree.column('reservation_id', anchor='w', width=150, minwidth=100)
-                self.reservations_tree.column('room_type', anchor='w', width=100, minwidth=80)
-                self.reservations_tree.column('check_in', anchor='w', width=120, minwidth=100)
-                self.reservations_tree.column('check_out', anchor='w', width=120, minwidth=100)
-                self.reservations_tree.column('amount', anchor='w', width=100, minwidth=80)
-                self.reservations_tree.column('status', anchor='w', width=100, minwidth=80)
-
-                # Create headings
-                self.reservations_tree.heading('reservation_id', text='Reservation ID', anchor='w')
-                self.reservations_tree.heading('room_type', text='Room Type', anchor='w')
-                self.reservations_tree.heading('check_in', text='Check-in', anchor='w')
-                self.reservations_tree.heading('check_out', text='Check-out', anchor='w')
-                self.reservations_tree.heading('amount', text='Amount', anchor='w')
-                self.reservations_tree.heading('status', text='Status', anchor='w')
-
-                self.reservations_tree.pack(fill="both", expand=True, padx=0, pady=0)
-                scrollbar.config(command=self.reservations_tree.yview)
-
-                # Add tag for alternating row colors
-                self.reservations_tree.tag_configure('oddrow', background='white')
-                self.reservations_tree.tag_configure('evenrow', background='#f8fafc')
-
-                # Add data to the Treeview
-                if not recent_bookings:
-                    no_data_label = ctk.CTkLabel(
-                        scroll_frame,
-                        text="No recent bookings found",
-                        font=("Arial", 12),
-                        text_color="#64748b"
+            # Configure the style (same as in CustomerReservationPage)
+            style = ttk.Style()
+            style.theme_use("default")
+
+            style.configure("Custom.Treeview",
+                            background="white",
+                            foreground="#334155",
+                            rowheight=35,
+                            fieldbackground="white",
+                            bordercolor="#d1d5db",
+                            borderwidth=1,
+                            font=('Arial', 11)
+                            )
+            style.configure("Custom.Treeview.Heading",
+                            background="#f1f5f9",
+                            foreground="#334155",
+                            relief="flat",
+                            font=('Arial', 12, 'bold'),
+                            padding=(10, 5)
+                            )
+            style.map("Custom.Treeview",
+                    background=[('selected', '#3b82f6')],
+                    foreground=[('selected', 'white')]
                     )
-                    no_data_label.pack(pady=50)
-                else:
-                    for i, res in enumerate(recent_bookings):
-                        tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-                    
-                        # Format amount
-                        amount_str = res.get("amount", "$0.00")
-                        if isinstance(amount_str, (int, float)):
-                            amount_str = f"${amount_str:.2f}"
-                        elif isinstance(amount_str, str) and not amount_str.startswith('$'):
-                            try:
-                                amount_float = float(re.sub(r'[^\d.]', '', amount_str))
-                                amount_str = f"${amount_float:.2f}"
-                            except (ValueError, TypeError):
-                                pass  # Keep as is
-                            
-                        self.reservations_tree.insert(
-                            parent='',
-                            index='end',
-                            iid=i,
-                            text='',
-                            values=(
-                                res.get("reservation_id", ""),
-                                res.get("room_type", ""),
-                                res.get("check_in", ""),
-                                res.get("check_out", ""),
-                                amount_str,
-                                res.get("status", "Pending")
-                            ),
-                            tags=(tag,)
-                        )
-
-            except Exception as e:
-                logger.error(f"Error creating recent bookings table: {str(e)}")
-                ctk.CTkLabel(
-                    recent_bookings_frame,
-                    text="Could not load recent bookings",
-                    text_color="#ef4444"
-                ).pack(pady=50)
+
+            # Define columns
+            self.reservations_tree['columns'] = ('reservation_id', 'room_type', 'check_in', 'check_out', 'amount', 'status')
+
+            # Format columns
+            self.reservations_tree.column('#0', width=0, stretch=False)  # Hide first empty column
+            self.reservations_tree.column('reservation_id', anchor='w', width=150, minwidth=100)
+            self.reservations_tree.column('room_type', anchor='w', width=100, minwidth=80)
+            self.reservations_tree.column('check_in', anchor='w', width=120, minwidth=100)
+            self.reservations_tree.column('check_out', anchor='w', width=120, minwidth=100)
+            self.reservations_tree.column('amount', anchor='w', width=100, minwidth=80)
+            self.reservations_tree.column('status', anchor='w', width=100, minwidth=80)
+
+            # Create headings
+            self.reservations_tree.heading('reservation_id', text='Reservation ID', anchor='w')
+            self.reservations_tree.heading('room_type', text='Room Type', anchor='w')
+            self.reservations_tree.heading('check_in', text='Check-in', anchor='w')
+            self.reservations_tree.heading('check_out', text='Check-out', anchor='w')
+            self.reservations_tree.heading('amount', text='Amount', anchor='w')
+            self.reservations_tree.heading('status', text='Status', anchor='w')
+
+            self.reservations_tree.pack(fill="both", expand=True, padx=0, pady=0)
+            scrollbar.config(command=self.reservations_tree.yview)
+
+            # Add tag for alternating row colors
+            self.reservations_tree.tag_configure('oddrow', background='white')
+            self.reservations_tree.tag_configure('evenrow', background='#f8fafc')
+
+            # Rows are reconciled by reservation id rather than rebuilt
+            self.bookings_sync = TreeviewSync(
+                self.reservations_tree,
+                key=lambda res: res.get("reservation_id"),
+                values=CustomerDashboardModel.booking_values,
+                tags=lambda res, i: ('evenrow',) if i % 2 == 0 else ('oddrow',)
+            )
+
+            # Shown in place of the rows when the customer has no bookings
+            self.no_bookings_label = ctk.CTkLabel(
+                scroll_frame,
+                text="No recent bookings found",
+                font=("Arial", 12),
+                text_color="#64748b"
+            )
 
         except Exception as e:
             logger.error(f"Error creating dashboard content: {str(e)}")
-            messagebox.showerror("Error", f"Failed to create dashboard content: {str(e)}")
-            self.show_error_state()
+            raise
 
     def parse_date_string(self, date_str):
         """Parse date string from various possible formats (same as in CustomerReservationPage)"""
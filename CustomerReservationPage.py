@@ -2,14 +2,13 @@ import customtkinter as ctk
 from datetime import datetime
 import logging
 from typing import Dict, Optional, List
-from PIL import Image, ImageTk
 import os
 from CustomerDashboard import CustomerDashboard
 from datetime import datetime, timedelta
 import tkinter as tk
-from tkcalendar import Calendar
 import re
 import tkinter.ttk as ttk
+from table_sync import TreeviewSync
 
 logger = logging.getLogger(__name__)
 
@@ -289,6 +288,8 @@ class CustomerReservationPage(ctk.CTkFrame):
             except ValueError:
                 min_date = datetime.now() + timedelta(days=1)
 
+        from tkcalendar import Calendar  # loaded on first use of the date picker
+
         cal = Calendar(
             self.calendar_window,
             selectmode='day',
@@ -447,6 +448,14 @@ class CustomerReservationPage(ctk.CTkFrame):
         self.reservations_tree.tag_configure('oddrow', background='white')
         self.reservations_tree.tag_configure('evenrow', background='#f8fafc')
 
+        # Refreshes reconcile rows by reservation_id/updated_at instead of rebuilding the tree
+        self.reservations_sync = TreeviewSync(
+            self.reservations_tree,
+            key=lambda res: res.get("reservation_id", ""),
+            values=self._reservation_row_values,
+            tags=lambda res, i: ('evenrow',) if i % 2 == 0 else ('oddrow',)
+        )
+
         # Button frame for Refresh and Cancel buttons
         button_frame = ctk.CTkFrame(table_frame, fg_color="transparent")
         button_frame.pack(fill="x", padx=10, pady=10)
@@ -475,12 +484,9 @@ class CustomerReservationPage(ctk.CTkFrame):
 
     def update_reservation_table(self):
         """Update the Treeview with reservation data"""
-        # Clear existing items
-        for item in self.reservations_tree.get_children():
-            self.reservations_tree.delete(item)
-
         # Show message if no reservations
         if not self.reservations:
+            self.reservations_sync.sync([])
             self.no_data_label = ctk.CTkLabel(
                 self.reservations_tree.master,
                 text="No reservations found.",
@@ -505,36 +511,30 @@ class CustomerReservationPage(ctk.CTkFrame):
             logger.error(f"Error sorting reservations: {e}")
             sorted_reservations = self.reservations
 
-        # Add data to the Treeview
-        for i, res in enumerate(sorted_reservations):
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-        
-            # Format amount
-            amount_str = res.get("amount", "$0.00")
-            if isinstance(amount_str, (int, float)):
-                amount_str = f"${amount_str:.2f}"
-            elif isinstance(amount_str, str) and not amount_str.startswith('$'):
-                try:
-                    amount_float = float(re.sub(r'[^\d.]', '', amount_str))
-                    amount_str = f"${amount_float:.2f}"
-                except (ValueError, TypeError):
-                    pass  # Keep as is
-                
-            self.reservations_tree.insert(
-                parent='',
-                index='end',
-                iid=i,
-                text='',
-                values=(
-                    res.get("reservation_id", ""),
-                    res.get("room_type", ""),
-                    res.get("check_in", ""),
-                    res.get("check_out", ""),
-                    amount_str,
-                    res.get("status", "Pending")
-                ),
-                tags=(tag,)
-            )
+        # Apply only the inserts, updates and deletes since the last refresh
+        self.reservations_sync.sync(sorted_reservations)
+
+    def _reservation_row_values(self, res):
+        """Treeview values for one reservation"""
+        # Format amount
+        amount_str = res.get("amount", "$0.00")
+        if isinstance(amount_str, (int, float)):
+            amount_str = f"${amount_str:.2f}"
+        elif isinstance(amount_str, str) and not amount_str.startswith('$'):
+            try:
+                amount_float = float(re.sub(r'[^\d.]', '', amount_str))
+                amount_str = f"${amount_float:.2f}"
+            except (ValueError, TypeError):
+                pass  # Keep as is
+
+        return (
+            res.get("reservation_id", ""),
+            res.get("room_type", ""),
+            res.get("check_in", ""),
+            res.get("check_out", ""),
+            amount_str,
+            res.get("status", "Pending")
+        )
 
     def close_reservations_tab(self):
         """Close the reservations tab and return to dashboard"""
@@ -598,6 +598,14 @@ class CustomerReservationPage(ctk.CTkFrame):
 
             # Save to database
             if self.db:
+                free_rooms = self.db.check_availability(room_type, checkin_date, checkout_date)
+                if free_rooms is not None and not free_rooms:
+                    self.show_message(
+                        f"No {room_type} room is free from {checkin_date:%b %d, %Y} to {checkout_date:%b %d, %Y}",
+                        "error"
+                    )
+                    return
+
                 # Get customer_id from user_id
                 customer_id = None
                 if 'customer_id' in self.current_user:
@@ -623,7 +631,7 @@ class CustomerReservationPage(ctk.CTkFrame):
 
                 logger.debug(f"Creating reservation with data: {new_reservation}")
 
-                success = self.db.create_reservation(new_reservation)
+                success, message = self.db.create_reservation(new_reservation)
                 if success:
                     logger.info(f"Reservation created with ID: {reservation_id}")
                     self.show_message("Reservation created successfully!", "success")
@@ -639,7 +647,7 @@ class CustomerReservationPage(ctk.CTkFrame):
                     self.tab_view.set("My Reservations")
                     self.load_user_reservations()
                 else:
-                    self.show_message("Failed to create reservation", "error")
+                    self.show_message(f"Failed to create reservation: {message}", "error")
             else:
                 self.show_message("Database connection error", "error")
 
@@ -3,7 +3,11 @@ from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
 import csv
 import os
-from fpdf import FPDF
+import threading
+from history_export import export_history
+
+REPORTS_REFRESH_MS = 5 * 60 * 1000
+EXPORT_POLL_MS = 250
 
 
 class HotelReportsPage(ctk.CTkFrame):
@@ -11,6 +15,7 @@ class HotelReportsPage(ctk.CTkFrame):
         super().__init__(parent)
         self.controller = controller
         self.db = db if db is not None else controller.db
+        self.running_export = None  # state of the export running in the background, if any
 
         # Configure grid layout
         self.grid_rowconfigure(0, weight=1)
@@ -27,48 +32,63 @@ class HotelReportsPage(ctk.CTkFrame):
 
         self.create_sidebar()
         self.create_main_content()
-        self.refresh_data()
-        self.after(30000, self.auto_refresh)
+        # Runs on first show, then on a slow timer while the page is visible;
+        # reservation and customer changes request it early
+        self.refresh_job = self.controller.scheduler.register(
+            "reports",
+            self._fetch_reports_data,
+            on_result=self._apply_reports_data,
+            on_error=self._on_refresh_error,
+            interval_ms=REPORTS_REFRESH_MS,
+            owner=self,
+            run_now=True
+        )
+        self.controller.change_feed.subscribe(
+            ("reservations", "customers"),
+            lambda event: self.refresh_data(),
+            owner=self
+        )
 
     def refresh_data(self):
-        """Refresh all data from database"""
-        try:
-            # Get data from database
-            customer_growth = self.db.get_customer_growth() or {}
-            total_customers = self._calculate_cumulative_customers(customer_growth)
-            booking_trends = self.db.get_booking_trends() or {}
-            revenue_trends = self.db.get_revenue_trends() or {}
-            total_revenue = self.db.get_total_bookings_cost() or 0.0
-
-
-            self.reports_data = {
-                "new_customers": customer_growth,
-                "total_customers": total_customers,
-                "revenue_data": {"Total": total_revenue},
-                "booking_data": booking_trends,
-                "new_customers_list": self.db.get_recent_customers(5) or []
-            }
-
-            # Fill in missing months with zeros
-            months = self._get_last_six_months()
-            for metric in ["new_customers", "total_customers", "revenue_data", "booking_data"]:
-                for month in months:
-                    if month not in self.reports_data[metric]:
-                        self.reports_data[metric][month] = 0
+        """Refresh all data from database on a background worker"""
+        self.controller.scheduler.request(self.refresh_job)
+
+    def _fetch_reports_data(self):
+        """Query everything the reports page shows; runs off the Tk thread"""
+        customer_growth = self.db.get_customer_growth() or {}
+        return {
+            "new_customers": customer_growth,
+            "total_customers": self._calculate_cumulative_customers(customer_growth),
+            "revenue_data": {"Total": self.db.get_total_bookings_cost() or 0.0},
+            "booking_data": self.db.get_booking_trends() or {},
+            "new_customers_list": self.db.get_recent_customers(5) or [],
+            "customer_count": self.db.get_total_customers() or 0
+        }
 
-            self.update_ui()
+    def _apply_reports_data(self, reports_data):
+        """Store fetched data and redraw the page"""
+        self.reports_data = reports_data
 
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to load data: {str(e)}")
-            months = self._get_last_six_months()
-            self.reports_data = {
-                "new_customers": {month: 0 for month in months},
-                "total_customers": {month: 0 for month in months},
-                "revenue_data": {month: 0 for month in months},
-                "booking_data": {month: 0 for month in months},
-                "new_customers_list": []
-            }
-            self.update_ui()
+        # Fill in missing months with zeros
+        months = self._get_last_six_months()
+        for metric in ["new_customers", "total_customers", "revenue_data", "booking_data"]:
+            for month in months:
+                if month not in self.reports_data[metric]:
+                    self.reports_data[metric][month] = 0
+
+        self.update_ui()
+
+    def _on_refresh_error(self, e):
+        messagebox.showerror("Database Error", f"Failed to load data: {str(e)}")
+        months = self._get_last_six_months()
+        self.reports_data = {
+            "new_customers": {month: 0 for month in months},
+            "total_customers": {month: 0 for month in months},
+            "revenue_data": {month: 0 for month in months},
+            "booking_data": {month: 0 for month in months},
+            "new_customers_list": []
+        }
+        self.update_ui()
 
     def _calculate_cumulative_customers(self, customer_growth):
         """Calculate cumulative total customers from growth data"""
@@ -98,7 +118,7 @@ class HotelReportsPage(ctk.CTkFrame):
             last_month = months[-1]
 
             # Total Customers
-            total = self.db.get_total_customers()
+            total = self.reports_data.get("customer_count", 0)
             self.total_customers_label.configure(text=f"{total:,}")
 
             # Bookings
@@ -328,11 +348,6 @@ class HotelReportsPage(ctk.CTkFrame):
             font=("Arial", 8)
         )
 
-    def auto_refresh(self):
-        """Auto-refresh data at intervals"""
-        self.refresh_data()
-        self.after(10000, self.auto_refresh)
-
     def create_sidebar(self):
         """Create the sidebar navigation"""
         sidebar = ctk.CTkFrame(self, width=250, fg_color="#f0f9ff", corner_radius=0)
@@ -492,6 +507,24 @@ class HotelReportsPage(ctk.CTkFrame):
             command=self.export_data
         ).pack(side="left", padx=5)
 
+        self.history_button = ctk.CTkButton(
+            action_frame,
+            text="Export History",
+            fg_color="#8b5cf6",
+            hover_color="#7c3aed",
+            command=self.export_history
+        )
+        self.history_button.pack(side="left", padx=5)
+
+        self.analytics_button = ctk.CTkButton(
+            action_frame,
+            text="Export Parquet",
+            fg_color="#f59e0b",
+            hover_color="#d97706",
+            command=self.export_analytics
+        )
+        self.analytics_button.pack(side="left", padx=5)
+
         # Metrics cards
         self.create_metrics_cards(content)
 
@@ -720,6 +753,9 @@ class HotelReportsPage(ctk.CTkFrame):
 
     def _create_pdf_report(self, file_path):
         """Helper method to create PDF report"""
+        # fpdf is only needed here, so it is not imported with the page
+        from fpdf import FPDF
+
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", size=12)
@@ -878,4 +914,111 @@ class HotelReportsPage(ctk.CTkFrame):
             messagebox.showerror(
                 "Export Failed",
                 f"Error exporting data: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    def export_history(self):
+        """Export every reservation with its customer to CSV; a name ending in .gz is gzip-compressed"""
+        if self._export_running():
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = filedialog.asksaveasfilename(
+            initialdir=self._export_dir(),
+            initialfile=f"reservation_history_{timestamp}.csv.gz",
+            title="Export Reservation History As",
+            defaultextension=".csv",
+            filetypes=[("Compressed CSV", "*.csv.gz"), ("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_path:  # User cancelled
+            return
+
+        def job(report):
+            return export_history(self.db, file_path, progress=lambda rows: report(f"{rows:,} rows"))
+
+        def done(count):
+            if count is None:
+                messagebox.showerror("Export Failed", "Could not read the reservation history from the database")
+            else:
+                messagebox.showinfo("Export Successful", f"{count:,} reservations exported to:\n{file_path}")
+
+        self._run_export(self.history_button, "Export History", job, done)
+
+    def export_analytics(self):
+        """Export reservations, customers, transactions and occupancy as month-partitioned Parquet"""
+        if self._export_running():
+            return
+        try:
+            # pyarrow is only needed here, so it is not imported with the page
+            from parquet_export import export_analytics
+        except ImportError:
+            messagebox.showerror("Export Failed", "The Parquet export needs pyarrow (pip install pyarrow)")
+            return
+
+        root = filedialog.askdirectory(initialdir=self._export_dir(), title="Export Analytics Datasets To")
+        if not root:  # User cancelled
+            return
+
+        def job(report):
+            return export_analytics(self.db, root, progress=lambda table, rows: report(f"{table} {rows:,}"))
+
+        def done(counts):
+            failed = [table for table, count in counts.items() if count is None]
+            summary = "\n".join(f"{table}: {count:,} rows" for table, count in counts.items() if count is not None)
+            if failed:
+                messagebox.showerror("Export Failed", f"Could not export {', '.join(failed)}\n\n{summary}")
+            else:
+                messagebox.showinfo("Export Successful", f"Datasets written under:\n{root}\n\n{summary}")
+
+        self._run_export(self.analytics_button, "Export Parquet", job, done)
+
+    @staticmethod
+    def _export_dir():
+        initial_dir = os.path.expanduser("~/Documents")
+        return initial_dir if os.path.exists(initial_dir) else os.path.expanduser("~")
+
+    def _export_running(self):
+        if self.running_export is None:
+            return False
+        messagebox.showinfo("Export Running", "Another export is still running")
+        return True
+
+    def _run_export(self, button, idle_text, job, done):
+        """Run ``job(report)`` on a background thread, then ``done(result)`` on the Tk thread
+
+        Exports stream from their own database connection, so the page and
+        the shared query worker stay responsive.  ``report(text)`` may be
+        called from the thread; the latest text is shown on ``button``.
+        """
+        state = {"text": "", "done": False, "result": None, "error": None}
+
+        def report(text):
+            state["text"] = text
+
+        def run():
+            try:
+                state["result"] = job(report)
+            except Exception as e:
+                state["error"] = e
+            finally:
+                state["done"] = True
+
+        self.running_export = state
+        button.configure(state="disabled", text="Exporting...")
+        threading.Thread(target=run, name="report-export", daemon=True).start()
+        self.after(EXPORT_POLL_MS, self._poll_export, button, idle_text, done)
+
+    def _poll_export(self, button, idle_text, done):
+        if not self.winfo_exists():
+            return
+        state = self.running_export
+        if not state["done"]:
+            button.configure(text=f"Exporting... {state['text']}")
+            self.after(EXPORT_POLL_MS, self._poll_export, button, idle_text, done)
+            return
+
+        self.running_export = None
+        button.configure(state="normal", text=idle_text)
+        if state["error"] is not None:
+            messagebox.showerror("Export Failed", f"Error exporting data: {state['error']}")
+        else:
+            done(state["result"])
@@ -4,7 +4,10 @@ from datetime import datetime
 import tkinter as tk
 from db_helper import DatabaseManager
 import logging
-from tkcalendar import Calendar
+from paging import KeysetPager, PageControls, PAGE_SIZE
+from virtual_table import VirtualTreeview
+from availability import as_date
+from reservation_edits import changes_between, merge_edit, describe_conflicts
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,10 @@ class HotelReservationsPage(ctk.CTkFrame):
         self.selected_reservation_id = None
         self.sort_column = None
         self.sort_descending = False
+        # Only one keyset page is fetched and rendered at a time
+        self.pager = KeysetPager()
+        self.page_sort = "check_in"
+        self.page_descending = True
 
         # Configure grid layout
         self.grid_rowconfigure(0, weight=1)
@@ -30,21 +37,53 @@ class HotelReservationsPage(ctk.CTkFrame):
 
         # Load data immediately
         self.load_data()
+        self.controller.change_feed.subscribe(
+            ("reservations", "customers"),
+            lambda event: self.load_data(),
+            owner=self,
+            catch_up=False
+        )
 
-    def load_data(self):
-        """Load reservations data from database with proper date handling"""
-        try:
+    def update_user_display(self, user_data):
+        """Reload reservations whenever the page is shown"""
+        self.load_data()
 
-            self.reservations = self.db.get_reservations()
-            logger.info(f"Loaded {len(self.reservations)} reservations")
-            self.display_reservations()
-            self.update_button_states()
+    def load_data(self):
+        """Load the current page of reservations on a background worker"""
+        self.controller.db_executor.submit(
+            self.db.get_reservations_page,
+            search=self.search_entry.get().strip(),
+            sort=self.page_sort,
+            descending=self.page_descending,
+            after=self.pager.cursor,
+            limit=PAGE_SIZE,
+            on_success=self._on_reservations_loaded,
+            on_error=self._on_load_error,
+            owner=self,
+            key="reservations"
+        )
 
-        except Exception as e:
-            logger.error(f"Failed to load data: {str(e)}")
-            messagebox.showerror("Error", f"Failed to load data: {str(e)}")
-            self.reservations = []
-            self.display_reservations()
+    def _on_reservations_loaded(self, page):
+        self.reservations = page["rows"]
+        self.pager.loaded(page)
+        self.page_controls.update_state(self.pager)
+        logger.info(f"Loaded page {self.pager.page_number} ({len(self.reservations)} reservations)")
+        self.display_reservations()
+        self.update_button_states()
+
+    def next_page(self):
+        if self.pager.advance():
+            self.load_data()
+
+    def previous_page(self):
+        if self.pager.back():
+            self.load_data()
+
+    def _on_load_error(self, e):
+        logger.error(f"Failed to load data: {str(e)}")
+        messagebox.showerror("Error", f"Failed to load data: {str(e)}")
+        self.reservations = []
+        self.display_reservations()
 
     def update_button_states(self):
         """Enable/disable buttons based on selection"""
@@ -53,11 +92,10 @@ class HotelReservationsPage(ctk.CTkFrame):
             self.delete_btn.configure(state="disabled")
             return
 
-        selected_item = self.tree.focus()
-        if not selected_item:
+        reservation_data = self.tree.selected_values()
+        if not reservation_data:
             return
 
-        reservation_data = self.tree.item(selected_item)['values']
         is_cancelled = reservation_data[7].lower() == 'cancelled'
 
         self.edit_btn.configure(state="normal" if not is_cancelled else "disabled")
@@ -70,32 +108,33 @@ class HotelReservationsPage(ctk.CTkFrame):
         """Save or cancel reservation data in database"""
         try:
             if reservation_data and 'id' in reservation_data:
-                existing_reservation = self.db.get_reservation_by_id(reservation_data['id'])
+                # The loaded page already has the row; no extra read before saving
+                page_row = self._page_row(reservation_data['id'])
 
-                if existing_reservation:
+                if page_row:
+                    base = self._edit_fields(page_row)
                     update_data = {
-                        'guest_name': reservation_data.get('name', existing_reservation['guest_name']),
-                        'checkin_date': self._parse_date(reservation_data.get('checkin',
-                                                                              existing_reservation
-                                                                                  ['checkin_date'].strftime
-                                                                                  ('%b %d, %Y'))),
-                        'checkout_date': self._parse_date(reservation_data.get('checkout',
-                                                                               existing_reservation
-                                                                                   ['checkout_date'].strftime
-                                                                                   ('%b %d, %Y'))),
-                        'booking_amount': float(reservation_data.get('amount', '0').replace('$', '').replace(',', '')),
-                        'payment_status': reservation_data.get('payment_status',
-                                                               existing_reservation['payment_status']),
-                        'fulfillment_status': reservation_data.get('fulfillment_status',
-                                                                   existing_reservation['fulfillment_status']),
-                        'room_type': reservation_data.get('room_type', existing_reservation['room_type'])
+                        'guest_name': reservation_data.get('name', base['guest_name']),
+                        'checkin_date': self._parse_date(reservation_data.get('checkin', base['checkin_date'])),
+                        'checkout_date': self._parse_date(reservation_data.get('checkout', base['checkout_date'])),
+                        'booking_amount': float(
+                            str(reservation_data.get('amount', base['booking_amount'])).replace('$', '').replace(',', '')
+                        ),
+                        'payment_status': reservation_data.get('payment_status', base['payment_status']),
+                        'fulfillment_status': reservation_data.get('fulfillment_status', base['fulfillment_status']),
+                        'room_type': reservation_data.get('room_type', base['room_type'])
                     }
 
                     if update_data['checkout_date'] <= update_data['checkin_date']:
                         messagebox.showerror("Error", "Check-out date must be after check-in date")
                         return False
 
-                    success = self.db.update_reservation(reservation_data['id'], update_data)
+                    if update_data['fulfillment_status'] != 'Cancelled' and not self._room_available(
+                            update_data['room_type'], update_data['checkin_date'],
+                            update_data['checkout_date'], reservation_data['id']):
+                        return False
+
+                    return self._save_edit(page_row, base, update_data)
                 else:
                     new_reservation = {
                         "reservation_id": self.db.generate_reservation_id(),
@@ -113,7 +152,14 @@ class HotelReservationsPage(ctk.CTkFrame):
                         messagebox.showerror("Error", "Check-out date must be after check-in date")
                         return False
 
-                    success = self.db.create_reservation(new_reservation)
+                    if not self._room_available(new_reservation['room_type'], new_reservation['checkin_date'],
+                                                new_reservation['checkout_date']):
+                        return False
+
+                    success, message = self.db.create_reservation(new_reservation)
+                    if not success:
+                        messagebox.showerror("Error", message)
+                        return False
             elif delete_id:
                 # Cancel the reservation instead of deleting
                 update_data = {
@@ -138,6 +184,90 @@ class HotelReservationsPage(ctk.CTkFrame):
             messagebox.showerror("Error", f"Database operation failed: {str(e)}")
             return False
 
+    def _page_row(self, reservation_id):
+        return next((r for r in self.reservations if r.get('reservation_id') == reservation_id), None)
+
+    @staticmethod
+    def _edit_fields(page_row):
+        """A loaded page row under the field names update_reservation_checked uses"""
+        return {
+            'guest_name': page_row.get('guest_name'),
+            'room_type': page_row.get('room_type'),
+            'checkin_date': page_row.get('check_in'),
+            'checkout_date': page_row.get('check_out'),
+            'booking_amount': page_row.get('amount'),
+            'payment_status': page_row.get('payment_status'),
+            'fulfillment_status': page_row.get('status'),
+        }
+
+    def _save_edit(self, page_row, base, edited):
+        """Save an edit only if the row is still the version it was opened from
+
+        When someone else saved it meanwhile, edits to different fields are
+        merged onto their version automatically; if both changed the same
+        field the user chooses between their own values and the saved row.
+        """
+        reservation_id = page_row['reservation_id']
+        changes = changes_between(base, edited)
+        if not changes:
+            return True
+
+        status, row = self.db.update_reservation_checked(reservation_id, changes, page_row.get('version'))
+        if status == "conflict":
+            changes, clashes = merge_edit(base, edited, row)
+            if clashes and not messagebox.askyesno(
+                    "Reservation Changed",
+                    f"Reservation {reservation_id} was changed by someone else while you were editing it:\n\n"
+                    f"{describe_conflicts(clashes, edited, row)}\n\n"
+                    "Save your values anyway? Choose No to keep the saved version."
+            ):
+                self.show_saved_row(row)
+                return False
+            status, row = self.db.update_reservation_checked(reservation_id, changes, row["version"])
+
+        if status == "updated":
+            self.show_saved_row(row)
+            return True
+        if status == "conflict":
+            self.show_saved_row(row)
+            messagebox.showerror("Error", f"Reservation {reservation_id} changed again while saving; please retry")
+        elif status == "unavailable":
+            messagebox.showerror("Not Available", f"No {edited['room_type']} room is free for the new dates")
+        elif status == "missing":
+            self.load_data()
+            messagebox.showerror("Error", f"Reservation {reservation_id} no longer exists")
+        else:
+            messagebox.showerror("Error", "Database operation failed")
+        return False
+
+    def show_saved_row(self, row):
+        """Update the loaded page row from update_reservation_checked's result and redraw"""
+        page_row = self._page_row(row['reservation_id'])
+        if page_row is None:
+            return
+        page_row.update({
+            'guest_name': row['guest_name'],
+            'room_type': row['room_type'],
+            'check_in': as_date(row['checkin_date']).strftime('%Y-%m-%d'),
+            'check_out': as_date(row['checkout_date']).strftime('%Y-%m-%d'),
+            'amount': row['booking_amount'],
+            'payment_status': row['payment_status'],
+            'status': row['fulfillment_status'],
+            'version': row['version'],
+        })
+        self.display_reservations()
+
+    def _room_available(self, room_type, checkin, checkout, reservation_id=None):
+        """Check the availability engine; tell the user and return False if the type is full"""
+        free_rooms = self.db.check_availability(room_type, checkin, checkout, exclude=reservation_id)
+        if free_rooms is not None and not free_rooms:
+            messagebox.showerror(
+                "Not Available",
+                f"No {room_type} room is free from {checkin:%b %d, %Y} to {checkout:%b %d, %Y}"
+            )
+            return False
+        return True
+
     def _parse_date(self, date_str):
         """Parse date from string in format 'MMM DD, YYYY' to date object"""
         try:
@@ -149,22 +279,13 @@ class HotelReservationsPage(ctk.CTkFrame):
                 return datetime.now().date()
 
     def display_reservations(self, reservations=None):
-        """Display reservations in the treeview with properly formatted dates"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        self.selected_row = None
-        self.selected_reservation_id = None
-
+        """Load reservations into the table model; only the visible rows are drawn"""
         display_data = reservations if reservations is not None else self.reservations
 
-        if not display_data:
-            return
-
+        rows = []
         for reservation in display_data:
             try:
-                is_cancelled = reservation.get('status', '').lower() == 'cancelled'
-                values = (
+                rows.append((
                     reservation.get('reservation_id', 'N/A'),
                     reservation.get('guest_name', 'Unknown Guest'),
                     reservation.get('room_type', 'Single'),
@@ -173,12 +294,16 @@ class HotelReservationsPage(ctk.CTkFrame):
                     reservation.get('amount', '$0.00'),
                     reservation.get('payment_status', 'Pending'),
                     reservation.get('status', 'Pending')
-                )
-                item = self.tree.insert("", "end", values=values)
-                if is_cancelled:
-                    self.tree.item(item, tags=('cancelled',))
+                ))
             except Exception as e:
                 logger.error(f"Error displaying reservation: {e}")
+        self.tree.set_rows(rows)
+
+        # The selection survives a reload only if the reservation is still listed
+        values = self.tree.selected_values()
+        self.selected_reservation_id = values[0] if values else None
+        if not values:
+            self.selected_row = None
 
     def create_sidebar(self):
         """Create the sidebar navigation"""
@@ -377,6 +502,9 @@ class HotelReservationsPage(ctk.CTkFrame):
         self.search_entry.pack(side="left")
         self.search_entry.bind("<KeyRelease>", self.search_reservations)
 
+        self.page_controls = PageControls(search_frame, self.previous_page, self.next_page)
+        self.page_controls.pack(side="right")
+
         # Treeview container
         tree_container = ctk.CTkFrame(content, fg_color="white", corner_radius=12)
         tree_container.pack(fill="both", expand=True, padx=30, pady=(0, 30))
@@ -414,13 +542,13 @@ class HotelReservationsPage(ctk.CTkFrame):
             ('Treeheading.separator', {'sticky': 'nswe'})
         ])
 
-        # Create the Treeview widget with all columns
-        self.tree = ttk.Treeview(
+        # Create the Treeview widget with all columns; only the visible rows exist as items
+        self.tree = VirtualTreeview(
             tree_container,
             style="Custom.Treeview",
             columns=("id", "name", "room_type", "checkin", "checkout", "amount", "payment", "fulfillment"),
-            show="headings",
-            selectmode="browse"
+            selectmode="browse",
+            row_tags=lambda r: ("cancelled",) if str(r[7]).lower() == "cancelled" else ()
         )
 
         # Define headings with left alignment
@@ -447,8 +575,8 @@ class HotelReservationsPage(ctk.CTkFrame):
         self.tree.tag_configure('cancelled', foreground='red')
 
         # Add scrollbar
-        tree_scroll = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll = ttk.Scrollbar(tree_container, orient="vertical")
+        self.tree.set_scrollbar(tree_scroll)
 
         # Grid layout
         self.tree.grid(row=0, column=0, sticky="nsew")
@@ -473,33 +601,26 @@ class HotelReservationsPage(ctk.CTkFrame):
 
     def on_tree_select(self, event):
         """Handle treeview selection"""
-        selected_item = self.tree.focus()
-        if selected_item:
-            self.selected_row = selected_item
-            self.selected_reservation_id = self.tree.item(selected_item)['values'][0]
+        values = self.tree.selected_values()
+        if values:
+            self.selected_row = self.tree.focus()
+            self.selected_reservation_id = values[0]
             self.update_button_states()
 
     def search_reservations(self, event=None):
-        """Filter reservations based on search query"""
-        query = self.search_entry.get().lower()
-
-        if not query:
-            self.display_reservations()
-            return
-
-        filtered = [
-            r for r in self.reservations
-            if (query in str(r.get("reservation_id", "")).lower() or
-                query in r.get("guest_name", "").lower() or
-                query in r.get("check_in", "").lower() or
-                query in r.get("check_out", "").lower() or
-                query in r.get("payment_status", "").lower() or
-                query in r.get("status", "").lower())
-        ]
-        self.display_reservations(filtered)
+        """Search reservations in the database, starting again from the first page"""
+        self.pager.reset()
+        self.load_data()
 
     def sort_tree(self, column):
-        """Sort tree by column"""
+        """Sort by column; keyset-sortable columns are re-queried, the rest sort the current page"""
+        server_sorts = {
+            "id": "reservation_id",
+            "name": "guest_name",
+            "checkin": "check_in",
+            "checkout": "check_out",
+            "amount": "amount"
+        }
         column_mapping = {
             "id": 0,
             "name": 1,
@@ -512,7 +633,6 @@ class HotelReservationsPage(ctk.CTkFrame):
         }
 
         col_index = column_mapping.get(column, 0)
-        items = [(self.tree.set(child, col_index), child) for child in self.tree.get_children('')]
 
         if self.sort_column == column:
             self.sort_descending = not self.sort_descending
@@ -520,18 +640,19 @@ class HotelReservationsPage(ctk.CTkFrame):
             self.sort_column = column
             self.sort_descending = False
 
-        if column in ("checkin", "checkout"):
-            items.sort(key=lambda x: datetime.strptime(x[0], "%b %d, %Y") if x[0] else datetime.min,
-                       reverse=self.sort_descending)
-        elif column in ("amount"):
-            items.sort(key=lambda x: float(x[0].replace("$", "").replace(",", "")) if x[0] else 0,
-                       reverse=self.sort_descending)
-        else:
-            items.sort(key=lambda x: x[0].lower() if x[0] else "", reverse=self.sort_descending)
+        self._update_sort_headings(column)
+
+        if column in server_sorts:
+            self.page_sort = server_sorts[column]
+            self.page_descending = self.sort_descending
+            self.tree.sort(None)
+            self.pager.reset()
+            self.load_data()
+            return
 
-        for index, (val, child) in enumerate(items):
-            self.tree.move(child, '', index)
+        self.tree.sort(col_index, self.sort_descending)
 
+    def _update_sort_headings(self, column):
         for col in ["id", "name", "room_type", "checkin", "checkout", "amount", "payment", "fulfillment"]:
             self.tree.heading(col, text=self.tree.heading(col)['text'].rstrip(" ↑↓"))
 
@@ -556,6 +677,8 @@ class HotelReservationsPage(ctk.CTkFrame):
         cal_frame = ttk.Frame(top)
         cal_frame.pack(padx=10, pady=10)
 
+        from tkcalendar import Calendar  # loaded on first use of the date picker
+
         cal = Calendar(cal_frame, selectmode="day")
         cal.pack(pady=10)
 
@@ -733,13 +856,11 @@ class HotelReservationsPage(ctk.CTkFrame):
             messagebox.showwarning("Warning", "Please select a reservation to edit")
             return
 
-        selected_item = self.tree.focus()
-        if not selected_item:
+        reservation_data = self.tree.selected_values()
+        if not reservation_data:
             messagebox.showerror("Error", "No reservation selected")
             return
 
-        reservation_data = self.tree.item(selected_item)['values']
-
         # Check if reservation is already cancelled
         if reservation_data[7].lower() == 'cancelled':
             messagebox.showwarning(
@@ -895,14 +1016,11 @@ class HotelReservationsPage(ctk.CTkFrame):
             messagebox.showwarning("Warning", "Please select a reservation to cancel")
             return
 
-        # Get the selected item from the treeview
-        selected_item = self.tree.focus()
-        if not selected_item:
+        # Get all values from the selected row
+        reservation_values = self.tree.selected_values()
+        if not reservation_values:
             messagebox.showerror("Error", "No reservation selected")
             return
-
-        # Get all values from the selected row
-        reservation_values = self.tree.item(selected_item)['values']
         reservation_id = reservation_values[0]
         guest_name = reservation_values[1]
 
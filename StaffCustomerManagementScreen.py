@@ -2,6 +2,8 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
 from db_helper import DatabaseManager
+from paging import KeysetPager, PageControls, PAGE_SIZE
+from table_sync import TreeviewSync
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,9 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
+        # Only one keyset page is fetched and rendered at a time
+        self.pager = KeysetPager()
+
         # Create components
         self.create_sidebar()
         self.create_main_content()
@@ -258,6 +263,14 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
         self.tree.tag_configure('active_badge', background='#10b981', foreground='white')
         self.tree.tag_configure('inactive_badge', background='#6b7280', foreground='white')
 
+        # Refreshes reconcile rows by customer_id/updated_at instead of rebuilding the tree
+        self.tree_sync = TreeviewSync(
+            self.tree,
+            key=lambda c: c['customer_id'],
+            values=lambda c: (c['customer_id'], c['full_name'], c['email'], c['phone'], c['status']),
+            tags=lambda c, i: ('active_badge',) if c['status'] == 'Active' else ('inactive_badge',)
+        )
+
         # Add scrollbars
         y_scroll = ctk.CTkScrollbar(tree_frame, orientation="vertical", command=self.tree.yview)
         x_scroll = ctk.CTkScrollbar(tree_frame, orientation="horizontal", command=self.tree.xview)
@@ -272,6 +285,9 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
         action_frame = ctk.CTkFrame(content, fg_color="transparent")
         action_frame.grid(row=4, column=0, sticky="e", pady=(0, 20))
 
+        self.page_controls = PageControls(action_frame, self.previous_page, self.next_page)
+        self.page_controls.pack(side="left", padx=(0, 20))
+
         # Edit button
         edit_btn = ctk.CTkButton(
             action_frame,
@@ -296,29 +312,8 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
         self.tree.bind("<Double-1>", lambda e: self.edit_selected_customer())
 
     def populate_table(self, customers):
-        """Populate the Treeview with customer data"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        if not customers:
-            return
-
-        # Add customer data
-        for customer in customers:
-            item_id = self.tree.insert("", "end", values=(
-                customer['customer_id'],
-                customer['full_name'],
-                customer['email'],
-                customer['phone'],
-                customer['status']
-            ))
-
-            # Apply tag based on status
-            if customer['status'] == 'Active':
-                self.tree.item(item_id, tags=('active_badge',))
-            else:
-                self.tree.item(item_id, tags=('inactive_badge',))
+        """Show customer data, touching only rows that were added, changed or removed"""
+        self.tree_sync.sync(customers or [])
 
     def get_selected_customer(self):
         """Get the currently selected customer"""
@@ -351,28 +346,54 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
     def filter_customers(self, status):
         """Filter customers by status"""
         self.active_filter.set(status)
+        self.pager.reset()
         try:
-            customers = self.db.get_customers(status)
-            self.populate_table(customers)
+            self.load_page()
         except Exception as e:
             logger.error(f"Error filtering customers: {e}")
             messagebox.showerror("Error", "Failed to filter customers")
 
     def search_customers(self, event):
         """Search customers based on input"""
-        query = self.search_entry.get().strip()
-
-        if not query:
-            self.filter_customers(self.active_filter.get())
-            return
-
+        self.pager.reset()
         try:
-            customers = self.db.search_customers(query)
-            self.populate_table(customers)
+            self.load_page()
         except Exception as e:
             logger.error(f"Error searching customers: {e}")
             messagebox.showerror("Error", "Failed to search customers")
 
+    def load_page(self):
+        """Fetch the current page for the active filter and search on a background worker"""
+        # No owner: the screen does not reload when shown again, so leaving it
+        # must not drop the page; the key lets a newer search supersede it
+        self.controller.db_executor.submit(
+            self.db.get_customers_page,
+            self.active_filter.get(),
+            search=self.search_entry.get().strip(),
+            after=self.pager.cursor,
+            limit=PAGE_SIZE,
+            on_success=self._on_page_loaded,
+            on_error=self._on_load_error,
+            key="staff_customers_page"
+        )
+
+    def _on_page_loaded(self, page):
+        self.pager.loaded(page)
+        self.page_controls.update_state(self.pager)
+        self.populate_table(page["rows"])
+
+    def _on_load_error(self, e):
+        logger.error(f"Failed to load customers: {str(e)}")
+        messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
+
+    def next_page(self):
+        if self.pager.advance():
+            self.load_page()
+
+    def previous_page(self):
+        if self.pager.back():
+            self.load_page()
+
     def open_add_customer_dialog(self):
         """Open dialog to add new customer"""
         dialog = ctk.CTkToplevel(self)
@@ -395,16 +416,7 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
 
     def generate_customer_id(self):
         """Generate a new customer ID like CUST0001"""
-        try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT MAX(CAST(SUBSTRING(customer_id, 5) AS UNSIGNED)) FROM customers")
-                result = cursor.fetchone()
-                max_id = result[0] if result and result[0] is not None else 0
-                return f"CUST{max_id + 1:04d}"
-        except Exception as e:
-            import time
-            logger.error(f"Error generating customer ID: {str(e)}")
-            return f"CUST{int(time.time())}"
+        return self.db.generate_customer_id()
  
 
     def edit_customer(self, customer):
@@ -482,7 +494,7 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
         try:
             if self.db.add_customer(customer_data):
                 messagebox.showinfo("Success", "Customer added successfully!")
-                self.filter_customers(self.active_filter.get())
+                self.load_page()
                 dialog.destroy()
             else:
                 messagebox.showerror("Error", "Failed to add customer")
@@ -506,7 +518,7 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
         try:
             if self.db.update_customer(customer_id, updated_data):
                 messagebox.showinfo("Success", "Customer updated successfully!")
-                self.filter_customers(self.active_filter.get())
+                self.load_page()
                 dialog.destroy()
             else:
                 messagebox.showerror("Error", "Failed to update customer")
@@ -520,7 +532,7 @@ class StaffCustomerManagementScreen(ctk.CTkFrame):
             try:
                 if self.db.delete_customer(customer['customer_id']):
                     messagebox.showinfo("Success", "Customer deleted")
-                    self.filter_customers(self.active_filter.get())
+                    self.load_page()
                 else:
                     messagebox.showerror("Error", "Failed to delete customer")
             except Exception as e:
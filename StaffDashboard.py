@@ -1,13 +1,15 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tksheet
 import logging
 from typing import Dict, Optional
 from datetime import datetime
+from table_sync import SheetSync
+from charts import LineChart
 
 logger = logging.getLogger(__name__)
 
+DASHBOARD_REFRESH_MS = 60000
+
 
 class StaffDashboard(ctk.CTkFrame):
     def __init__(self, parent, controller, db):
@@ -16,6 +18,18 @@ class StaffDashboard(ctk.CTkFrame):
         self.db = db
         self.current_user = None
         self.sheet = None
+        self._sheet_placeholder = False
+        # Periodic snapshot refresh; the scheduler only runs it while this frame is shown
+        self.snapshot_job = self.controller.scheduler.register(
+            "staff_dashboard",
+            self.db.get_dashboard_snapshot,
+            "staff",
+            on_result=self._apply_snapshot,
+            on_error=lambda e: logger.error(f"Error loading dashboard snapshot: {e}"),
+            interval_ms=DASHBOARD_REFRESH_MS,
+            priority=5,
+            owner=self
+        )
 
         # Configure grid layout
         self.grid_rowconfigure(0, weight=1)
@@ -24,6 +38,13 @@ class StaffDashboard(ctk.CTkFrame):
         # Create components
         self.create_sidebar()
         self.create_main_content()
+        # The dashboard reloads itself when shown, so changes made meanwhile are not replayed
+        self.controller.change_feed.subscribe(
+            ("reservations", "customers"),
+            lambda event: self.load_snapshot(),
+            owner=self,
+            catch_up=False
+        )
         logger.info("StaffDashboard initialized")
 
     def update_user_display(self, user_data: Dict) -> None:
@@ -39,21 +60,33 @@ class StaffDashboard(ctk.CTkFrame):
     def refresh_dashboard_data(self) -> None:
         """Refresh all data-dependent widgets"""
         try:
-            if hasattr(self, 'metrics_frame'):
-                self.metrics_frame.destroy()
-                self.create_metrics(self.scrollable_content)
-
             if hasattr(self, 'welcome_frame'):
                 for widget in self.welcome_frame.winfo_children():
                     widget.destroy()
                 self.create_welcome_message()
 
-            if hasattr(self, 'sheet'):
-                self.update_reservations_table()
+            self.load_snapshot()
 
         except Exception as e:
             logger.error(f"Error during dashboard refresh: {e}")
 
+    def load_snapshot(self) -> None:
+        """Fetch metrics, revenue trend and recent reservations in one background round trip"""
+        self.controller.scheduler.request(self.snapshot_job)
+
+    def _apply_snapshot(self, snapshot: Dict) -> None:
+        """Fill every data-driven widget from a dashboard snapshot"""
+        values = (
+            snapshot.get("total_reservations", 0),
+            snapshot.get("active_customers", 0),
+            snapshot.get("pending_reservations", 0),
+        )
+        for label, value in zip(self.metric_value_labels, values):
+            label.configure(text=f"{value:,}")
+
+        self._plot_revenue(snapshot.get("revenue_trends") or {})
+        self.update_reservations_table(snapshot.get("recent_bookings", []))
+
     def create_sidebar(self) -> None:
         """Create sidebar navigation"""
         try:
@@ -216,6 +249,8 @@ class StaffDashboard(ctk.CTkFrame):
             # Recent bookings table
             self.create_reservations_table(self.scrollable_content)
 
+            self.load_snapshot()
+
         except Exception as e:
             logger.error(f"Error creating scrollable content: {e}")
             raise
@@ -244,21 +279,14 @@ class StaffDashboard(ctk.CTkFrame):
             self.metrics_frame.grid_columnconfigure(1, weight=1)
             self.metrics_frame.grid_columnconfigure(2, weight=1)
 
-            # Get data from database with error handling
-            try:
-                total_bookings = self.db.get_total_reservations() or 0
-                active_customers = self.db.get_active_customers_count() or 0
-                pending_reservations = self.db.get_pending_reservations_count() or 0
-            except Exception as e:
-                logger.error(f"Error fetching metrics: {e}")
-                total_bookings = active_customers = pending_reservations = 0
-
+            # Values are filled in by _apply_snapshot
             metrics = [
-                (0, f"{total_bookings:,}", "Total bookings", "StaffReservationsPage"),
-                (1, f"{active_customers:,}", "Active customers", "StaffCustomerManagementScreen"),
-                (2, f"{pending_reservations:,}", "Pending reservations", "StaffReservationsPage"),
+                (0, "—", "Total bookings", "StaffReservationsPage"),
+                (1, "—", "Active customers", "StaffCustomerManagementScreen"),
+                (2, "—", "Pending reservations", "StaffReservationsPage"),
             ]
 
+            self.metric_value_labels = []
             for col, value, label, target_frame in metrics:
                 card = ctk.CTkFrame(
                     self.metrics_frame,
@@ -273,13 +301,15 @@ class StaffDashboard(ctk.CTkFrame):
                 for child in card.winfo_children():
                     child.bind("<Button-1>", lambda e, fn=target_frame: self.controller.show_frame(fn))
 
-                ctk.CTkLabel(
+                value_label = ctk.CTkLabel(
                     card,
                     text=value,
                     font=("Arial", 24, "bold"),
                     text_color="#2c3e50",
                     cursor="hand2"
-                ).pack(pady=(25, 5), padx=20, anchor="w")
+                )
+                value_label.pack(pady=(25, 5), padx=20, anchor="w")
+                self.metric_value_labels.append(value_label)
 
                 ctk.CTkLabel(
                     card,
@@ -306,34 +336,21 @@ class StaffDashboard(ctk.CTkFrame):
                 text_color="#2c3e50"
             ).pack(pady=(20, 15), padx=20, anchor="w")
 
-            # Get data from database with error handling
-            try:
-                revenue_data = self.db.get_revenue_trends() or {}
-                months = list(revenue_data.keys()) or ["Jan", "Feb", "Mar"]
-                revenue = list(revenue_data.values()) or [0, 0, 0]
-            except Exception as e:
-                logger.error(f"Error fetching revenue data: {e}")
-                months = ["Jan", "Feb", "Mar"]
-                revenue = [0, 0, 0]
-
-            fig, ax = plt.subplots(figsize=(10, 3), dpi=100)
-            ax.plot(months, revenue, color='#3b82f6', linewidth=2, marker='o')
-            ax.fill_between(months, revenue, color='#3b82f6', alpha=0.1)
-            ax.grid(axis='y', linestyle='--', alpha=0.7)
-            ax.set_facecolor('white')
-            fig.patch.set_facecolor('white')
-
-            for spine in ax.spines.values():
-                spine.set_visible(False)
-
-            canvas = FigureCanvasTkAgg(fig, master=revenue_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="x", padx=20, pady=(0, 20))
+            # One figure for the page's lifetime; data is plotted when the snapshot arrives
+            self.revenue_chart = LineChart(revenue_frame)
+            self.revenue_chart.widget.pack(fill="x", padx=20, pady=(0, 20))
+            self._plot_revenue({})
 
         except Exception as e:
             logger.error(f"Error creating revenue graph: {e}")
             raise
 
+    def _plot_revenue(self, revenue_data: Dict) -> None:
+        """Update the revenue line for the given month -> revenue mapping"""
+        months = list(revenue_data.keys()) or ["Jan", "Feb", "Mar"]
+        revenue = list(revenue_data.values()) or [0, 0, 0]
+        self.revenue_chart.set_data(months, revenue)
+
     def create_quick_access(self, parent) -> None:
         """Create quick access cards using grid layout"""
         try:
@@ -445,8 +462,14 @@ class StaffDashboard(ctk.CTkFrame):
             )
             self.sheet.enable_bindings()
             self.sheet.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+            self.sheet.headers(["Booking ID", "Check-In", "Check-Out", "Status", "Payment", "Amount"])
 
-            self.update_reservations_table()
+            # Snapshot refreshes rewrite only rows whose reservation_id/updated_at changed
+            self.sheet_sync = SheetSync(
+                self.sheet,
+                key=lambda res: res.get("reservation_id"),
+                values=self._booking_row
+            )
 
         except Exception as e:
             logger.error(f"Error creating reservations table: {e}")
@@ -565,48 +588,22 @@ class StaffDashboard(ctk.CTkFrame):
     #
     #     except Exception as e:
     #         logger.error(f"Error formatting table: {e}")
-    def update_reservations_table(self) -> None:
-        """Update the reservations table with current data - matching admin dashboard exactly"""
+    def update_reservations_table(self, reservations) -> None:
+        """Render the snapshot's most recent reservations - matching admin dashboard exactly"""
+        # Match admin dashboard headers exactly
+        headers = ["Booking ID", "Check-In", "Check-Out", "Status", "Payment", "Amount"]
         try:
-            # Match admin dashboard headers exactly
-            headers = ["Booking ID", "Check-In", "Check-Out", "Status", "Payment", "Amount"]
             self.sheet.headers(headers)
 
-            # Get data from database with error handling
-            try:
-                reservations = self.db.get_reservations() or []
-                # Limit to 10 most recent reservations like admin dashboard
-                reservations = reservations[:10]
-            except Exception as e:
-                logger.error(f"Error fetching reservations: {e}")
-                reservations = []
-
-            data = []
-            for res in reservations:
-                try:
-                    # Match admin dashboard data formatting exactly
-                    amount = res.get("booking_amount", res.get("amount", 0))
-                    if isinstance(amount, str) and amount.startswith('$'):
-                        amount = amount[1:]
-                    try:
-                        formatted_amount = f"${float(amount):,.2f}"
-                    except (ValueError, TypeError):
-                        formatted_amount = f"${0:,.2f}"
-
-                    row = [
-                        str(res.get("reservation_id", "N/A")),
-                        str(res.get("checkin_date", res.get("check_in", "N/A"))),
-                        str(res.get("checkout_date", res.get("check_out", "N/A"))),
-                        str(res.get("fulfillment_status", res.get("status", "Pending"))),
-                        str(res.get("payment_status", "Pending")),
-                        formatted_amount
-                    ]
-                    data.append(row)
-                except Exception as e:
-                    logger.error(f"Error processing reservation row: {e}")
-                    continue
-
-            self.sheet.set_sheet_data(data if data else [["No data available"] * len(headers)])
+            if not reservations:
+                self.sheet_sync.reset()
+                self.sheet.set_sheet_data([["No data available"] * len(headers)])
+                self._sheet_placeholder = True
+            else:
+                if self._sheet_placeholder:
+                    self.sheet_sync.reset()
+                    self._sheet_placeholder = False
+                self.sheet_sync.sync(reservations)
 
             # Match admin dashboard column widths exactly
             self.sheet.column_width(column=0, width=100)  # Booking ID
@@ -621,7 +618,29 @@ class StaffDashboard(ctk.CTkFrame):
         except Exception as e:
             logger.error(f"Error updating reservations table: {e}")
             if hasattr(self, 'sheet'):
+                self.sheet_sync.reset()
                 self.sheet.set_sheet_data([["Error loading data"] * len(headers)])
+                self._sheet_placeholder = True
+
+    @staticmethod
+    def _booking_row(res: Dict) -> list:
+        """Sheet row for one reservation - matching admin dashboard formatting exactly"""
+        amount = res.get("booking_amount", res.get("amount", 0))
+        if isinstance(amount, str) and amount.startswith('$'):
+            amount = amount[1:]
+        try:
+            formatted_amount = f"${float(amount):,.2f}"
+        except (ValueError, TypeError):
+            formatted_amount = f"${0:,.2f}"
+
+        return [
+            str(res.get("reservation_id", "N/A")),
+            str(res.get("checkin_date", res.get("check_in", "N/A"))),
+            str(res.get("checkout_date", res.get("check_out", "N/A"))),
+            str(res.get("fulfillment_status", res.get("status", "Pending"))),
+            str(res.get("payment_status", "Pending")),
+            formatted_amount
+        ]
 
     def format_table(self) -> None:
         """Apply identical formatting to admin dashboard"""
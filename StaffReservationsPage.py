@@ -4,10 +4,14 @@ from tkinter import messagebox, ttk
 from datetime import datetime
 from db_helper import DatabaseManager
 import logging
-from tkcalendar import Calendar
+from virtual_table import VirtualTreeview
+from reservation_edits import from_grid_row, to_grid_row, changes_between, merge_edit, describe_conflicts
 
 logger = logging.getLogger(__name__)
 
+# Larger change sets are cheaper to pick up with one full reload
+MAX_DELTA_ROWS = 500
+
 
 class StaffReservationsPage(ctk.CTkFrame):
     def __init__(self, parent, controller, db=None):
@@ -15,10 +19,10 @@ class StaffReservationsPage(ctk.CTkFrame):
         self.controller = controller
         self.db = db if db is not None else DatabaseManager()
 
-        # Initialize data
-        self.reservations = []
+        # Initialize data; the full result set lives in self.tree.model
         self.selected_row = None
         self.selected_reservation_id = None
+        self.versions = {}  # reservation_id -> row version the grid shows
         self.sort_column = None
         self.sort_descending = False
 
@@ -30,121 +34,182 @@ class StaffReservationsPage(ctk.CTkFrame):
         self.create_sidebar()
         self.create_main_content()
 
-        # Load initial data
+        # Load initial data, then follow the change feed for just the rows that change
         self.load_data()
+        self.controller.change_feed.subscribe(("reservations",), self.on_reservations_changed, owner=self)
 
     def load_data(self):
-        """Load reservations data from database"""
-        try:
-            if not hasattr(self, 'db') or not self.db.connection.is_connected():
-                self.db = DatabaseManager()
-                self.db.connect()
-
-            with self.db.connection.cursor(dictionary=True) as cursor:
-                cursor.execute("""
-                    SELECT 
-                        reservation_id as id,
-                        guest_name as name,
-                        room_type,
-                        DATE_FORMAT(checkin_date, '%b %d, %Y') as checkin,
-                        DATE_FORMAT(checkout_date, '%b %d, %Y') as checkout,
-                        CONCAT('$', FORMAT(booking_amount, 2)) as amount,
-                        payment_status,
-                        fulfillment_status
-                    FROM reservations
-                    ORDER BY checkin_date DESC
-                """)
-                self.reservations = cursor.fetchall()
-
-            self.display_reservations()
+        """Load every reservation into the table on a background worker"""
+        # No owner: the page only reloads fully when it is built or the feed
+        # reports a large change, so navigating away must not drop the result
+        self.controller.db_executor.submit(
+            self.db.get_reservation_grid_rows,
+            on_success=self.display_reservations,
+            on_error=self._on_load_error,
+            key="staff_reservations"
+        )
 
-        except Exception as e:
-            logger.error(f"Error loading reservations: {str(e)}")
-            self.reservations = []
-            self.display_reservations()
+    def _on_load_error(self, e):
+        logger.error(f"Error loading reservations: {str(e)}")
+        self.display_reservations([])
+
+    def on_reservations_changed(self, event):
+        """Re-read only the reservations named in a change-feed event"""
+        changed = sorted(event.upserted("reservations"))
+        deleted = event.deleted("reservations")
+        if len(changed) > MAX_DELTA_ROWS:
+            self.load_data()
+            return
+        self.refresh_reservations(changed, deleted)
+
+    def refresh_reservations(self, reservation_ids, deleted=()):
+        """Re-read ``reservation_ids`` on a background worker and patch them into the table"""
+        # No owner: navigating away must not drop a patch the table still needs
+        self.controller.db_executor.submit(
+            self.db.get_reservation_grid_rows,
+            list(reservation_ids),
+            on_success=lambda rows: self.apply_reservation_delta(rows, deleted),
+            on_error=lambda e: logger.error(f"Error loading changed reservations: {e}")
+        )
+
+    def apply_reservation_delta(self, rows, deleted):
+        """Patch changed rows into the table, keeping filter, sort and selection"""
+        for row in rows:
+            self.versions[row[0]] = row[8]
+        for reservation_id in deleted:
+            self.versions.pop(reservation_id, None)
+        self.tree.apply_delta([tuple(row[:8]) for row in rows], deleted)
+        values = self.tree.selected_values()
+        self.selected_reservation_id = values[0] if values else None
+        if not values:
+            self.selected_row = None
 
     def save_data(self, reservation_data=None, delete_id=None):
         """Save or delete reservation data in database"""
         try:
-            if not hasattr(self, 'db') or not self.db.connection.is_connected():
-                self.db = DatabaseManager()
-                self.db.connect()
-
-            with self.db.connection.cursor() as cursor:
-                if reservation_data and 'id' in reservation_data:
-                    try:
-                        checkin_date = datetime.strptime(reservation_data['checkin'], "%b %d, %Y").date()
-                        checkout_date = datetime.strptime(reservation_data['checkout'], "%b %d, %Y").date()
-                        amount = float(reservation_data['amount'].replace('$', '').replace(',', ''))
-                        payment_status = reservation_data.get('payment_status', 'Pending')
-                        fulfillment_status = reservation_data.get('fulfillment_status', 'Pending')
-                        room_type = reservation_data.get('room_type', 'Single')
-                    except ValueError as e:
-                        messagebox.showerror("Error", f"Invalid format: {str(e)}")
-                        return False
-
-                    if any(r['id'] == reservation_data['id'] for r in self.reservations):
-                        cursor.execute("""
-                            UPDATE reservations 
-                            SET guest_name = %s, 
-                                room_type = %s,
-                                checkin_date = %s, 
-                                checkout_date = %s,
-                                booking_amount = %s,
-                                payment_status = %s,
-                                fulfillment_status = %s
-                            WHERE reservation_id = %s
-                        """, (
-                            reservation_data['name'],
-                            room_type,
-                            checkin_date,
-                            checkout_date,
-                            amount,
-                            payment_status,
-                            fulfillment_status,
-                            reservation_data['id']
-                        ))
-                    else:
-                        # Generate new ID if not provided
-                        if not reservation_data.get('id'):
-                            reservation_data['id'] = self.db.generate_reservation_id()
-
-                        cursor.execute("""
-                            INSERT INTO reservations 
-                            (reservation_id, guest_name, room_type, checkin_date, checkout_date, 
-                             booking_amount, payment_status, fulfillment_status)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            reservation_data['id'],
-                            reservation_data['name'],
-                            room_type,
-                            checkin_date,
-                            checkout_date,
-                            amount,
-                            payment_status,
-                            fulfillment_status
-                        ))
-                elif delete_id:
-                    cursor.execute("""
-                        DELETE FROM reservations 
-                        WHERE reservation_id = %s
-                    """, (delete_id,))
-
-                self.db.connection.commit()
-                self.load_data()
-                return True
+            if reservation_data and 'id' in reservation_data:
+                try:
+                    checkin_date = datetime.strptime(reservation_data['checkin'], "%b %d, %Y").date()
+                    checkout_date = datetime.strptime(reservation_data['checkout'], "%b %d, %Y").date()
+                    amount = float(reservation_data['amount'].replace('$', '').replace(',', ''))
+                    payment_status = reservation_data.get('payment_status', 'Pending')
+                    fulfillment_status = reservation_data.get('fulfillment_status', 'Pending')
+                    room_type = reservation_data.get('room_type', 'Single')
+                except ValueError as e:
+                    messagebox.showerror("Error", f"Invalid format: {str(e)}")
+                    return False
+
+                existing = self.tree.model.get(reservation_data['id']) is not None
+                if fulfillment_status != 'Cancelled' and not self._room_available(
+                        room_type, checkin_date, checkout_date, reservation_data['id'] if existing else None):
+                    return False
+
+                if existing:
+                    # Patches just this row; no table reload
+                    return self._save_edit(reservation_data['id'], {
+                        'guest_name': reservation_data['name'],
+                        'room_type': room_type,
+                        'checkin_date': checkin_date,
+                        'checkout_date': checkout_date,
+                        'booking_amount': amount,
+                        'payment_status': payment_status,
+                        'fulfillment_status': fulfillment_status
+                    })
+                else:
+                    # Generate new ID if not provided
+                    if not reservation_data.get('id'):
+                        reservation_data['id'] = self.db.generate_reservation_id()
+
+                    current_user = self.controller.current_user or {}
+                    refreshed, deleted = [reservation_data['id']], []
+                    success, message = self.db.create_reservation({
+                        'reservation_id': reservation_data['id'],
+                        'user_id': current_user.get('user_id'),
+                        'guest_name': reservation_data['name'],
+                        'room_type': room_type,
+                        'checkin_date': checkin_date,
+                        'checkout_date': checkout_date,
+                        'booking_amount': amount,
+                        'payment_status': payment_status,
+                        'fulfillment_status': fulfillment_status
+                    })
+            elif delete_id:
+                refreshed, deleted = [], [delete_id]
+                success, message = self.db.delete_reservation(delete_id), "Database operation failed"
+            else:
+                return False
+
+            if not success:
+                messagebox.showerror("Error", message)
+                return False
+
+            # Patch just the affected row instead of reloading the whole table
+            if deleted:
+                self.apply_reservation_delta([], deleted)
+            else:
+                self.refresh_reservations(refreshed)
+            return True
 
         except Exception as e:
             logger.error(f"Error saving reservation: {str(e)}")
             messagebox.showerror("Error", f"Database operation failed: {str(e)}")
-            if "MySQL Connection not available" in str(e):
-                try:
-                    self.db.connect()
-                    return self.save_data(reservation_data, delete_id)
-                except:
-                    pass
             return False
 
+    def _save_edit(self, reservation_id, edited):
+        """Save an edit only if the row is still the version it was opened from
+
+        When someone else saved it meanwhile, edits to different fields are
+        merged onto their version automatically; if both changed the same
+        field the user chooses between their own values and the saved row.
+        """
+        base = from_grid_row(self.tree.model.get(reservation_id))
+        changes = changes_between(base, edited)
+        if not changes:
+            return True
+
+        status, row = self.db.update_reservation_checked(reservation_id, changes, self.versions.get(reservation_id))
+        if status == "conflict":
+            changes, clashes = merge_edit(base, edited, row)
+            if clashes and not messagebox.askyesno(
+                    "Reservation Changed",
+                    f"Reservation {reservation_id} was changed by someone else while you were editing it:\n\n"
+                    f"{describe_conflicts(clashes, edited, row)}\n\n"
+                    "Save your values anyway? Choose No to keep the saved version."
+            ):
+                self.show_saved_row(row)
+                return False
+            status, row = self.db.update_reservation_checked(reservation_id, changes, row["version"])
+
+        if status == "updated":
+            self.show_saved_row(row)
+            return True
+        if status == "conflict":
+            self.show_saved_row(row)
+            messagebox.showerror("Error", f"Reservation {reservation_id} changed again while saving; please retry")
+        elif status == "unavailable":
+            messagebox.showerror("Not Available", f"No {edited['room_type']} room is free for the new dates")
+        elif status == "missing":
+            self.apply_reservation_delta([], [reservation_id])
+            messagebox.showerror("Error", f"Reservation {reservation_id} no longer exists")
+        else:
+            messagebox.showerror("Error", "Database operation failed")
+        return False
+
+    def show_saved_row(self, row):
+        """Show a row as returned by update_reservation_checked"""
+        self.apply_reservation_delta([to_grid_row(row) + (row["version"],)], ())
+
+    def _room_available(self, room_type, checkin, checkout, reservation_id=None):
+        """Check the availability engine; tell the user and return False if the type is full"""
+        free_rooms = self.db.check_availability(room_type, checkin, checkout, exclude=reservation_id)
+        if free_rooms is not None and not free_rooms:
+            messagebox.showerror(
+                "Not Available",
+                f"No {room_type} room is free from {checkin:%b %d, %Y} to {checkout:%b %d, %Y}"
+            )
+            return False
+        return True
+
     def create_sidebar(self):
         """Create the sidebar navigation"""
         sidebar = ctk.CTkFrame(self, width=250, fg_color="#f0f9ff", corner_radius=0)
@@ -370,13 +435,13 @@ class StaffReservationsPage(ctk.CTkFrame):
             ('Treeheading.separator', {'sticky': 'nswe'})
         ])
 
-        # Create the Treeview widget with all columns
-        self.tree = ttk.Treeview(
+        # Create the Treeview widget with all columns; only the visible rows exist as items
+        self.tree = VirtualTreeview(
             tree_container,
             style="Custom.Treeview",
             columns=("id", "name", "room_type", "checkin", "checkout", "amount", "payment", "fulfillment"),
-            show="headings",
-            selectmode="browse"
+            selectmode="browse",
+            row_tags=lambda r: ("cancelled",) if str(r[7]).lower() == "cancelled" else ()
         )
 
         # Define headings with left alignment
@@ -403,8 +468,8 @@ class StaffReservationsPage(ctk.CTkFrame):
         self.tree.tag_configure('cancelled', foreground='red')
 
         # Add scrollbar
-        tree_scroll = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll = ttk.Scrollbar(tree_container, orient="vertical")
+        self.tree.set_scrollbar(tree_scroll)
 
         # Grid layout
         self.tree.grid(row=0, column=0, sticky="nsew")
@@ -429,58 +494,25 @@ class StaffReservationsPage(ctk.CTkFrame):
 
     def on_tree_select(self, event):
         """Handle treeview selection"""
-        selected_item = self.tree.focus()
-        if selected_item:
-            self.selected_row = selected_item
-            self.selected_reservation_id = self.tree.item(selected_item)['values'][0]
-
-    def display_reservations(self, reservations=None):
-        """Display reservations in the treeview"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        self.selected_row = None
-        self.selected_reservation_id = None
-
-        display_data = reservations if reservations is not None else self.reservations
-
-        if not display_data:
-            return
-
-        for reservation in display_data:
-            is_cancelled = reservation.get("fulfillment_status", "").lower() == "cancelled"
-            tags = ("cancelled",) if is_cancelled else ()
-            self.tree.insert("", "end", values=(
-                reservation["id"],
-                reservation["name"],
-                reservation.get("room_type", ""),
-                reservation["checkin"],
-                reservation.get("checkout", ""),
-                reservation["amount"],
-                reservation.get("payment_status", "Pending"),
-                reservation.get("fulfillment_status", "Pending")
-            ),  tags=tags)
+        values = self.tree.selected_values()
+        if values:
+            self.selected_row = self.tree.focus()
+            self.selected_reservation_id = values[0]
+
+    def display_reservations(self, reservations):
+        """Load reservation rows (id, name, room_type, checkin, checkout, amount, payment, fulfillment, version)"""
+        self.versions = {row[0]: row[8] for row in reservations}
+        self.tree.set_rows([tuple(row[:8]) for row in reservations])
+
+        # The selection survives a reload only if the reservation still exists
+        values = self.tree.selected_values()
+        self.selected_reservation_id = values[0] if values else None
+        if not values:
+            self.selected_row = None
 
     def search_reservations(self, event=None):
         """Filter reservations based on search query"""
-        query = self.search_entry.get().lower()
-
-        if not query:
-            self.display_reservations()
-            return
-
-        filtered = [
-            r for r in self.reservations
-            if (query in r["id"].lower() or
-                query in r["name"].lower() or
-                query in r.get("room_type", "").lower() or
-                query in r["checkin"].lower() or
-                query in r.get("checkout", "").lower() or
-                query in r.get("payment_status", "").lower() or
-                query in r.get("fulfillment_status", "").lower())
-        ]
-
-        self.display_reservations(filtered)
+        self.tree.filter(self.search_entry.get())
 
     def sort_tree(self, column):
         """Sort tree by column"""
@@ -496,7 +528,6 @@ class StaffReservationsPage(ctk.CTkFrame):
         }
 
         col_index = column_mapping.get(column, 0)
-        items = [(self.tree.set(child, col_index), child) for child in self.tree.get_children('')]
 
         if self.sort_column == column:
             self.sort_descending = not self.sort_descending
@@ -504,17 +535,14 @@ class StaffReservationsPage(ctk.CTkFrame):
             self.sort_column = column
             self.sort_descending = False
 
+        # Sorting reorders the model's view; only the visible rows are redrawn
         if column in ("checkin", "checkout"):
-            items.sort(key=lambda x: datetime.strptime(x[0], "%b %d, %Y") if x[0] else datetime.min,
-                       reverse=self.sort_descending)
-        elif column in ("amount"):
-            items.sort(key=lambda x: float(x[0].replace("$", "").replace(",", "")) if x[0] else 0,
-                       reverse=self.sort_descending)
+            key = lambda v: datetime.strptime(v, "%b %d, %Y") if v else datetime.min
+        elif column == "amount":
+            key = lambda v: float(v.replace("$", "").replace(",", "")) if v else 0
         else:
-            items.sort(key=lambda x: x[0].lower() if x[0] else "", reverse=self.sort_descending)
-
-        for index, (val, child) in enumerate(items):
-            self.tree.move(child, '', index)
+            key = None
+        self.tree.sort(col_index, self.sort_descending, key)
 
         for col in ["id", "name", "room_type", "checkin", "checkout", "amount", "payment", "fulfillment"]:
             self.tree.heading(col, text=self.tree.heading(col)['text'].rstrip(" ↑↓"))
@@ -542,6 +570,8 @@ class StaffReservationsPage(ctk.CTkFrame):
         cal_frame = ttk.Frame(top)
         cal_frame.pack(padx=10, pady=10)
 
+        from tkcalendar import Calendar  # loaded on first use of the date picker
+
         cal = Calendar(cal_frame, selectmode="day")
         cal.pack(pady=10)
 
@@ -720,13 +750,11 @@ class StaffReservationsPage(ctk.CTkFrame):
             messagebox.showwarning("Warning", "Please select a reservation to edit")
             return
 
-        selected_item = self.tree.focus()
-        if not selected_item:
+        reservation_data = self.tree.selected_values()
+        if not reservation_data:
             messagebox.showerror("Error", "No reservation selected")
             return
 
-        reservation_data = self.tree.item(selected_item)['values']
-
         # Check if reservation is already cancelled
         if reservation_data[7].lower() == 'cancelled':
             messagebox.showwarning(
@@ -908,36 +936,31 @@ class StaffReservationsPage(ctk.CTkFrame):
             messagebox.showwarning("Warning", "Please select a reservation to cancel")
             return
 
-        reservation = next(
-            (r for r in self.reservations if r["id"] == self.selected_reservation_id),
-            None
-        )
+        reservation = self.tree.model.get(self.selected_reservation_id)
 
         if not reservation:
             messagebox.showerror("Error", "Selected reservation not found")
             return
 
-        if reservation.get("fulfillment_status", "").lower() == "cancelled":
+        reservation_id, guest_name, fulfillment_status = reservation[0], reservation[1], reservation[7]
+        if (fulfillment_status or "").lower() == "cancelled":
             messagebox.showinfo("Info", "Reservation is already cancelled")
             return
 
         if not messagebox.askyesno(
             "Confirm Cancellation",
-            f"Are you sure you want to cancel reservation {reservation['id']} for {reservation['name']}?\n"
+            f"Are you sure you want to cancel reservation {reservation_id} for {guest_name}?\n"
             "This will mark the reservation as 'Cancelled' but retain the record."
         ):
             return
 
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE reservations
-                    SET fulfillment_status = %s,
-                        payment_status = %s
-                    WHERE reservation_id = %s
-                """, ("Cancelled", "Cancelled", reservation["id"]))
-            self.db.connection.commit()
-            self.load_data()
+            if not self.db.update_reservation(reservation_id, {
+                'fulfillment_status': 'Cancelled',
+                'payment_status': 'Cancelled'
+            }):
+                raise RuntimeError("Reservation could not be updated")
+            self.refresh_reservations([reservation_id])
             messagebox.showinfo("Success", "Reservation marked as cancelled")
         except Exception as e:
             logger.error(f"Error cancelling reservation: {str(e)}")
@@ -0,0 +1,254 @@
+import bisect
+import logging
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (check-in, check-out, reservation_id); a stay occupies [check-in, check-out)
+Stay = Tuple[date, date, str]
+
+
+class RoomUnavailable(Exception):
+    """The room (or every room of the type) is taken for the requested dates"""
+
+
+def as_date(value) -> date:
+    """A date from a date, datetime or 'YYYY-MM-DD' / 'Mon DD, YYYY' string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%b %d, %Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value!r}")
+
+
+def _check_range(checkin: date, checkout: date) -> None:
+    if checkout <= checkin:
+        raise ValueError("Check-out date must be after check-in date")
+
+
+class RoomSchedule:
+    """One room's stays as a sorted list of non-overlapping intervals
+
+    Because stays in one room never overlap, ordering them by check-in also
+    orders them by check-out; an overlap test is a bisect for the last stay
+    starting before the requested check-out and a look at its neighbours.
+    """
+
+    def __init__(self):
+        self._starts: List[date] = []
+        self._stays: List[Stay] = []
+
+    def __len__(self) -> int:
+        return len(self._stays)
+
+    def __iter__(self):
+        return iter(self._stays)
+
+    def overlapping(self, checkin: date, checkout: date) -> List[str]:
+        """Reservation ids whose stays overlap [checkin, checkout), earliest first"""
+        found = []
+        i = bisect.bisect_left(self._starts, checkout) - 1
+        while i >= 0 and self._stays[i][1] > checkin:
+            found.append(self._stays[i][2])
+            i -= 1
+        return found[::-1]
+
+    def is_free(self, checkin: date, checkout: date, ignore: Optional[str] = None) -> bool:
+        """No stay other than ``ignore`` overlaps [checkin, checkout); O(log n)"""
+        i = bisect.bisect_left(self._starts, checkout) - 1
+        while i >= 0 and self._stays[i][1] > checkin:
+            if self._stays[i][2] != ignore:
+                return False
+            i -= 1
+        return True
+
+    def add(self, checkin: date, checkout: date, reservation_id: str) -> None:
+        if not self.is_free(checkin, checkout):
+            raise RoomUnavailable(f"{reservation_id} overlaps {self.overlapping(checkin, checkout)}")
+        i = bisect.bisect_right(self._starts, checkin)
+        self._starts.insert(i, checkin)
+        self._stays.insert(i, (checkin, checkout, reservation_id))
+
+    def remove(self, checkin: date, reservation_id: str) -> bool:
+        i = bisect.bisect_left(self._starts, checkin)
+        while i < len(self._stays) and self._starts[i] == checkin:
+            if self._stays[i][2] == reservation_id:
+                del self._starts[i]
+                del self._stays[i]
+                return True
+            i += 1
+        return False
+
+
+class AvailabilityEngine:
+    """In-memory room inventory and bookings, for instant availability answers
+
+    Holds every room with its type and a RoomSchedule of the active
+    (non-cancelled) stays assigned to it.  ``is_free`` is logarithmic in the
+    room's bookings; ``free_rooms`` checks each room of a type the same way.
+    The database stays the authority: DatabaseManager re-checks a room under
+    a row lock before assigning it and keeps this engine in step after every
+    write.  All methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._room_types: Dict[str, str] = {}
+        self._rooms_by_type: Dict[str, List[str]] = {}
+        self._schedules: Dict[str, RoomSchedule] = {}
+        self._bookings: Dict[str, Tuple[str, date, date]] = {}
+
+    def load(self, rooms: Iterable[Tuple[str, str]],
+             bookings: Iterable[Tuple[str, str, date, date]]) -> List[str]:
+        """Replace everything with ``rooms`` (number, type) and ``bookings``
+        (reservation_id, room_number, check-in, check-out)
+
+        Returns the ids of bookings that could not be placed (unknown room or
+        overlapping an earlier stay in the same room).
+        """
+        with self._lock:
+            self._room_types = {}
+            self._rooms_by_type = {}
+            self._schedules = {}
+            self._bookings = {}
+            for room_number, room_type in rooms:
+                self.add_room(room_number, room_type)
+            return self._place_all(bookings)
+
+    def _place_all(self, bookings: Iterable[Tuple[str, str, date, date]]) -> List[str]:
+        rejected = []
+        for reservation_id, room_number, checkin, checkout in bookings:
+            try:
+                self.book(reservation_id, room_number, checkin, checkout)
+            except (RoomUnavailable, KeyError, ValueError) as e:
+                logger.warning(f"Booking {reservation_id} not placed in room {room_number}: {e}")
+                rejected.append(reservation_id)
+        return rejected
+
+    def add_room(self, room_number: str, room_type: str) -> None:
+        with self._lock:
+            if room_number in self._room_types:
+                return
+            self._room_types[room_number] = room_type
+            self._rooms_by_type.setdefault(room_type, []).append(room_number)
+            self._schedules[room_number] = RoomSchedule()
+
+    def room_type(self, room_number: str) -> Optional[str]:
+        return self._room_types.get(room_number)
+
+    def rooms(self, room_type: Optional[str] = None) -> List[str]:
+        with self._lock:
+            if room_type is None:
+                return list(self._room_types)
+            return list(self._rooms_by_type.get(room_type, []))
+
+    # ----- bookings -----
+
+    def booking(self, reservation_id: str) -> Optional[Tuple[str, date, date]]:
+        """(room_number, check-in, check-out) of an active booking"""
+        return self._bookings.get(reservation_id)
+
+    def book(self, reservation_id: str, room_number: str, checkin, checkout) -> None:
+        """Place (or move) a booking; raises RoomUnavailable if the room is taken"""
+        checkin, checkout = as_date(checkin), as_date(checkout)
+        _check_range(checkin, checkout)
+        with self._lock:
+            schedule = self._schedules[room_number]
+            previous = self._bookings.get(reservation_id)
+            if previous == (room_number, checkin, checkout):
+                return
+            if not schedule.is_free(checkin, checkout, ignore=reservation_id):
+                raise RoomUnavailable(
+                    f"Room {room_number} is taken from {checkin} to {checkout} "
+                    f"by {schedule.overlapping(checkin, checkout)}"
+                )
+            if previous is not None:
+                self.release(reservation_id)
+            schedule.add(checkin, checkout, reservation_id)
+            self._bookings[reservation_id] = (room_number, checkin, checkout)
+
+    def release(self, reservation_id: str) -> bool:
+        """Forget a cancelled or deleted booking"""
+        with self._lock:
+            previous = self._bookings.pop(reservation_id, None)
+            if previous is None:
+                return False
+            room_number, checkin, _ = previous
+            return self._schedules[room_number].remove(checkin, reservation_id)
+
+    def replace_room(self, room_number: str, bookings: Iterable[Tuple[str, date, date]]) -> List[str]:
+        """Reset one room's stays to ``bookings`` (reservation_id, check-in, check-out)"""
+        with self._lock:
+            for reservation_id, _, _ in list(self._schedules[room_number]):
+                self._bookings.pop(reservation_id, None)
+            self._schedules[room_number] = RoomSchedule()
+            return self._place_all(
+                (reservation_id, room_number, checkin, checkout)
+                for reservation_id, checkin, checkout in bookings
+            )
+
+    # ----- queries -----
+
+    def is_free(self, room_number: str, checkin, checkout, ignore: Optional[str] = None) -> bool:
+        checkin, checkout = as_date(checkin), as_date(checkout)
+        _check_range(checkin, checkout)
+        with self._lock:
+            schedule = self._schedules.get(room_number)
+            return schedule is not None and schedule.is_free(checkin, checkout, ignore)
+
+    def overlapping(self, room_number: str, checkin, checkout) -> List[str]:
+        """Reservations in ``room_number`` whose stays overlap the dates"""
+        checkin, checkout = as_date(checkin), as_date(checkout)
+        with self._lock:
+            schedule = self._schedules.get(room_number)
+            return schedule.overlapping(checkin, checkout) if schedule is not None else []
+
+    def free_rooms(self, room_type: str, checkin, checkout, ignore: Optional[str] = None) -> List[str]:
+        """Rooms of ``room_type`` with nothing booked between the dates (``ignore`` excepted)"""
+        checkin, checkout = as_date(checkin), as_date(checkout)
+        _check_range(checkin, checkout)
+        with self._lock:
+            return [
+                room for room in self._rooms_by_type.get(room_type, [])
+                if self._schedules[room].is_free(checkin, checkout, ignore)
+            ]
+
+    def free_counts(self, checkin, checkout) -> Dict[str, int]:
+        """Number of free rooms of every type for the dates"""
+        with self._lock:
+            return {
+                room_type: len(self.free_rooms(room_type, checkin, checkout))
+                for room_type in self._rooms_by_type
+            }
+
+
+def assign_rooms(rooms: Iterable[Tuple[str, str]],
+                 stays: Iterable[Tuple[str, str, date, date]]) -> Tuple[Dict[str, str], List[str]]:
+    """First-fit room numbers for stays that only have a type
+
+    ``stays`` are (reservation_id, room_type, check-in, check-out).  Returns
+    {reservation_id: room_number} plus the ids that found no free room, e.g.
+    when the old data overbooked a type.
+    """
+    engine = AvailabilityEngine()
+    engine.load(rooms, [])
+    assigned, unplaced = {}, []
+    for reservation_id, room_type, checkin, checkout in sorted(stays, key=lambda s: (s[2], s[0])):
+        try:
+            free = engine.free_rooms(room_type, checkin, checkout)
+        except ValueError:
+            free = []
+        if not free:
+            unplaced.append(reservation_id)
+            continue
+        engine.book(reservation_id, free[0], checkin, checkout)
+        assigned[reservation_id] = free[0]
+    return assigned, unplaced
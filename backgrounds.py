@@ -0,0 +1,98 @@
+import os
+import hashlib
+import logging
+import threading
+from typing import Dict, Tuple
+from PIL import Image, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.getenv("BACKGROUND_CACHE_DIR", os.path.join(APP_DIR, ".cache", "backgrounds"))
+# Bump when the rendering steps change so old variants are not reused
+RENDER_VERSION = 1
+
+# Background of each auth screen: (asset, display size, blur radius)
+AUTH_BACKGROUNDS = {
+    "landing": ("hotel_lobby.jpg", (2000, 1000), 5),
+    "login": ("Welcome.jpg", (1920, 1080), 5),
+    "register": ("registration.jpg", (1920, 1080), 5),
+    "password_recovery": ("password.jpg", (1920, 1080), 5),
+}
+
+_images: Dict[Tuple, Image.Image] = {}
+_lock = threading.Lock()
+
+
+def _source_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _variant_path(path: str, size: Tuple[int, int], radius: int) -> str:
+    """Cache file for one rendering of ``path``, keyed by its content hash and target size"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = f"{stem}-{_source_digest(path)}-{size[0]}x{size[1]}-blur{radius}-v{RENDER_VERSION}.jpg"
+    return os.path.join(CACHE_DIR, name)
+
+
+def _render(path: str, size: Tuple[int, int], radius: int) -> Image.Image:
+    image = Image.open(path)
+    # Let the JPEG decoder downscale while decoding when the source is much larger
+    image.draft("RGB", size)
+    image = image.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+    return image.filter(ImageFilter.GaussianBlur(radius=radius))
+
+
+def blurred_background(filename: str, size: Tuple[int, int], radius: int = 5) -> Image.Image:
+    """Display-sized, blurred copy of an image asset
+
+    The first call renders it and writes the result under CACHE_DIR; later
+    launches just decode that file, and every frame in this process shares
+    the same decoded image.
+    """
+    path = filename if os.path.isabs(filename) else os.path.join(APP_DIR, filename)
+    key = (path, tuple(size), radius)
+    with _lock:
+        image = _images.get(key)
+        if image is not None:
+            return image
+
+        variant = _variant_path(path, size, radius)
+        if os.path.exists(variant):
+            image = Image.open(variant)
+            image.load()
+        else:
+            image = _render(path, size, radius)
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                # Write to a temporary name first so a crash never leaves half a file
+                partial = f"{variant}.{os.getpid()}.tmp"
+                image.save(partial, "JPEG", quality=92)
+                os.replace(partial, variant)
+                logger.info(f"Rendered background {os.path.basename(variant)}")
+            except OSError as e:
+                logger.warning(f"Could not cache background {filename}: {e}")
+
+        _images[key] = image
+        return image
+
+
+def screen_background(screen: str) -> Image.Image:
+    """Blurred background for one of the AUTH_BACKGROUNDS screens"""
+    filename, size, radius = AUTH_BACKGROUNDS[screen]
+    return blurred_background(filename, size, radius)
+
+
+def prerender_backgrounds() -> None:
+    """Render and decode every auth background (meant for a background thread at startup)"""
+    for screen in AUTH_BACKGROUNDS:
+        try:
+            screen_background(screen)
+        except Exception as e:
+            logger.warning(f"Could not prepare {screen} background: {e}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    prerender_backgrounds()
@@ -0,0 +1,161 @@
+"""Contention benchmark for booking the same rooms from several terminals
+
+Run ``python bench_bookings.py`` against a scratch database.  Every terminal
+(a thread with its own DatabaseManager, like a separate front-desk PC) keeps
+booking short stays in a throwaway room type with only a few rooms, so most
+attempts compete for the same rooms.  The run prints throughput and latency,
+and exits non-zero if any room ended up double-booked.  Everything it creates
+is deleted again afterwards.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+BENCH_ROOM_TYPE = "Benchmark"
+# Far enough ahead that real bookings never share the dates
+BENCH_START = date(2099, 1, 1)
+
+
+def find_overlaps(stays: Iterable[Tuple[str, date, date, str]]) -> List[Tuple[str, str]]:
+    """Pairs of reservation ids sharing a room on some night; stays are (room, check-in, check-out, id)"""
+    by_room: Dict[str, List[Tuple[date, date, str]]] = {}
+    for room, checkin, checkout, reservation_id in stays:
+        by_room.setdefault(room, []).append((checkin, checkout, reservation_id))
+
+    overlaps = []
+    for room_stays in by_room.values():
+        room_stays.sort()
+        latest_end, latest_id = None, None
+        for checkin, checkout, reservation_id in room_stays:
+            if latest_end is not None and checkin < latest_end:
+                overlaps.append((latest_id, reservation_id))
+            if latest_end is None or checkout > latest_end:
+                latest_end, latest_id = checkout, reservation_id
+    return overlaps
+
+
+def summarize(latencies: Sequence[float], booked: int, elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (ms) for one run"""
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))] * 1000
+
+    return {
+        "attempts": len(ordered),
+        "booked": booked,
+        "rejected": len(ordered) - booked,
+        "attempts_per_s": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "booked_per_s": booked / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def _terminal(user_id: int, attempts: int, days: int, seed: int, results: List, errors: List) -> None:
+    from db_helper import DatabaseManager
+
+    rng = random.Random(seed)
+    try:
+        with DatabaseManager() as db:
+            for _ in range(attempts):
+                checkin = BENCH_START + timedelta(days=rng.randrange(days))
+                reservation = {
+                    "reservation_id": db.generate_reservation_id(),
+                    "user_id": user_id,
+                    "guest_name": "Benchmark Guest",
+                    "room_type": BENCH_ROOM_TYPE,
+                    "checkin_date": checkin,
+                    "checkout_date": checkin + timedelta(days=rng.randint(1, 3)),
+                    "booking_amount": 100.0,
+                }
+                started = time.perf_counter()
+                booked, _ = db.create_reservation(reservation)
+                results.append((time.perf_counter() - started, booked))
+    except Exception as e:
+        errors.append(e)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terminals", type=int, default=8, help="concurrent terminals (threads)")
+    parser.add_argument("--attempts", type=int, default=25, help="booking attempts per terminal")
+    parser.add_argument("--rooms", type=int, default=4, help="rooms of the benchmark type")
+    parser.add_argument("--days", type=int, default=14, help="check-in dates are spread over this many days")
+    parser.add_argument("--keep", action="store_true", help="leave the benchmark rows in place")
+    args = parser.parse_args()
+
+    from db_helper import DatabaseManager
+
+    with DatabaseManager() as db:
+        with db.connection.cursor() as cursor:
+            cursor.execute("SELECT user_id FROM users ORDER BY user_id LIMIT 1")
+            row = cursor.fetchone()
+            if row is None:
+                print("❌ The database has no users to book for")
+                return 2
+            user_id = row[0]
+            rooms = [f"BX{i:03d}" for i in range(1, args.rooms + 1)]
+            cursor.executemany(
+                "INSERT IGNORE INTO rooms (room_number, room_type) VALUES (%s, %s)",
+                [(room, BENCH_ROOM_TYPE) for room in rooms]
+            )
+        db.connection.commit()
+
+        results: List[Tuple[float, bool]] = []
+        errors: List[Exception] = []
+        threads = [
+            threading.Thread(target=_terminal, args=(user_id, args.attempts, args.days, seed, results, errors))
+            for seed in range(args.terminals)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        with db.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT room_number, checkin_date, checkout_date, reservation_id FROM reservations
+                WHERE room_type = %s AND fulfillment_status <> 'Cancelled'
+                """,
+                (BENCH_ROOM_TYPE,)
+            )
+            stays = cursor.fetchall()
+        overlaps = find_overlaps(stays)
+
+        stats = summarize([latency for latency, _ in results], sum(1 for _, ok in results if ok), elapsed)
+        print(f"{args.terminals} terminals x {args.attempts} attempts on {args.rooms} rooms in {elapsed:.2f}s")
+        print(f"  booked {stats['booked']}, turned away {stats['rejected']}")
+        print(f"  {stats['attempts_per_s']:.1f} attempts/s, {stats['booked_per_s']:.1f} bookings/s")
+        print(f"  latency p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+        for error in errors:
+            print(f"❌ Terminal failed: {error}")
+
+        if not args.keep:
+            # Through delete_reservation so rollups and occupancy are backed out too
+            for _, _, _, reservation_id in stays:
+                db.delete_reservation(reservation_id)
+            with db.connection.cursor() as cursor:
+                cursor.execute("DELETE FROM reservations WHERE room_type = %s", (BENCH_ROOM_TYPE,))
+                cursor.execute("DELETE FROM rooms WHERE room_type = %s", (BENCH_ROOM_TYPE,))
+            db.connection.commit()
+
+    if overlaps:
+        print(f"❌ {len(overlaps)} double bookings, e.g. {overlaps[:5]}")
+        return 1
+    print("✅ No room was double-booked")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
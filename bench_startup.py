@@ -0,0 +1,92 @@
+"""Startup import budget for main.py, measured with ``python -X importtime``
+
+Run ``python bench_startup.py`` to print the slowest top-level imports on the
+path to the landing page.  It exits non-zero if a library that should only
+load on demand (charts, sheets, calendar popups, PDF export) is imported at
+startup, or if the total import time exceeds the budget.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries that page modules import on first use, never before the landing page
+DEFERRED_MODULES = ("matplotlib", "tksheet", "tkcalendar", "fpdf", "numpy")
+IMPORT_BUDGET_MS = 600
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, nesting depth) for each ``-X importtime`` line"""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def check_budget(imports, budget_ms: float = IMPORT_BUDGET_MS, deferred=DEFERRED_MODULES) -> List[str]:
+    """Problems with an import profile: deferred libraries loaded, or budget exceeded"""
+    problems = []
+    loaded = {name.split(".")[0] for name, _, _, _ in imports}
+    for module in deferred:
+        if module in loaded:
+            problems.append(f"{module} is imported at startup")
+    total_ms = sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000
+    if total_ms > budget_ms:
+        problems.append(f"startup imports take {total_ms:.0f} ms (budget {budget_ms} ms)")
+    return problems
+
+
+def profile(module: str = "main") -> List[Tuple[str, int, int, int]]:
+    """Import ``module`` in a fresh interpreter and return its import profile"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    return parse_importtime(result.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=15, help="number of top-level imports to list")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="take the fastest of this many cold starts")
+    args = parser.parse_args()
+
+    try:
+        runs = [profile(args.module) for _ in range(max(1, args.runs))]
+    except RuntimeError as e:
+        print(f"❌ Could not import {args.module}: {e}")
+        return 2
+    imports = min(runs, key=lambda run: sum(c for _, _, c, d in run if d == 0))
+    top_level = sorted((i for i in imports if i[3] == 0), key=lambda i: -i[2])
+    total_ms = sum(i[2] for i in top_level) / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms across {len(imports)} modules")
+    for name, _, cumulative, _ in top_level[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    problems = check_budget(imports, args.budget_ms)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print(f"✅ Within the {args.budget_ms:.0f} ms budget; no deferred libraries loaded")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
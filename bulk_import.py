@@ -0,0 +1,297 @@
+"""Bulk import of reservations or customers from CSV and JSON files
+
+    python bulk_import.py reservations bookings.csv [--user-id 1] [--batch-size 500]
+    python bulk_import.py customers customers.jsonl
+
+Files are read as a stream: .csv with a header row, .jsonl with one object
+per line, or .json holding a list of objects.  Every row is normalized and
+validated here; batches of good rows go to DatabaseManager.import_reservations
+or import_customers, which resolve ids with one set-based lookup per batch
+and write with executemany.  A bad row is reported with its line number and
+skipped without aborting the rest of its batch.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from availability import as_date
+
+DEFAULT_BATCH_SIZE = 500
+
+# Alternative column names (after lower-casing, spaces to underscores) -> column
+RESERVATION_ALIASES = {
+    "id": "reservation_id",
+    "name": "guest_name",
+    "guest": "guest_name",
+    "checkin": "checkin_date",
+    "check_in": "checkin_date",
+    "checkout": "checkout_date",
+    "check_out": "checkout_date",
+    "amount": "booking_amount",
+    "payment": "payment_status",
+    "status": "fulfillment_status",
+    "room": "room_number",
+}
+CUSTOMER_ALIASES = {
+    "id": "customer_id",
+    "name": "full_name",
+}
+
+PAYMENT_STATUSES = ("Paid", "Pending", "Cancelled")
+FULFILLMENT_STATUSES = ("Confirmed", "Pending", "Cancelled")
+CUSTOMER_STATUSES = ("Active", "Inactive")
+
+
+def read_records(path: str) -> Iterator[Tuple[int, object]]:
+    """(line or record number, raw row) for every row of a CSV, JSON or JSON-lines file
+
+    A JSON line that does not parse comes through as None so it is reported
+    like any other invalid row.
+    """
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    elif lower.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    yield number, None
+    elif lower.endswith(".json"):
+        # A JSON array has to be parsed whole; use .jsonl for files that do not fit in memory
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"{path} does not hold a JSON list of rows")
+        yield from enumerate(records, 1)
+    else:
+        raise ValueError(f"Unsupported file type: {path} (expected .csv, .json or .jsonl)")
+
+
+def _clean(raw, aliases: Dict[str, str]) -> Dict:
+    if not isinstance(raw, dict):
+        raise ValueError("Not a row object")
+    row = {}
+    for key, value in raw.items():
+        if key is None:
+            continue  # surplus CSV fields
+        key = str(key).strip().lower().replace(" ", "_").replace("-", "_")
+        if isinstance(value, str):
+            value = value.strip()
+        row[aliases.get(key, key)] = None if value == "" else value
+    return row
+
+
+def _text(row: Dict, field: str, max_length: int, required: bool = True) -> Optional[str]:
+    value = row.get(field)
+    if value is None:
+        if required:
+            raise ValueError(f"Missing {field}")
+        return None
+    value = str(value)
+    if len(value) > max_length:
+        raise ValueError(f"{field} is longer than {max_length} characters")
+    return value
+
+
+def _choice(row: Dict, field: str, choices: Tuple[str, ...], default: str) -> str:
+    value = row.get(field)
+    if value is None:
+        return default
+    for choice in choices:
+        if str(value).lower() == choice.lower():
+            return choice
+    raise ValueError(f"{field} must be one of {', '.join(choices)}, not {value!r}")
+
+
+def _int(row: Dict, field: str, default: Optional[int] = None) -> Optional[int]:
+    value = row.get(field, default)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a whole number, not {value!r}") from None
+
+
+def _timestamp(row: Dict, field: str) -> Optional[datetime]:
+    value = row.get(field)
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return datetime.combine(as_date(value), datetime.min.time())
+
+
+def normalize_reservation(raw, default_user_id: Optional[int] = None) -> Dict:
+    """A reservations row ready for import_reservations; raises ValueError saying what is wrong"""
+    row = _clean(raw, RESERVATION_ALIASES)
+    reservation_id = _text(row, "reservation_id", 20, required=False)
+    user_id = _int(row, "user_id", default_user_id)
+    if user_id is None:
+        raise ValueError("Missing user_id")
+
+    try:
+        checkin = as_date(row["checkin_date"]) if row.get("checkin_date") is not None else None
+        checkout = as_date(row["checkout_date"]) if row.get("checkout_date") is not None else None
+    except ValueError as e:
+        raise ValueError(str(e)) from None
+    if checkin is None or checkout is None:
+        raise ValueError("Missing check-in or check-out date")
+    if checkout <= checkin:
+        raise ValueError("Check-out date must be after check-in date")
+
+    amount = row.get("booking_amount")
+    try:
+        amount = round(float(str(amount).replace("$", "").replace(",", "")), 2) if amount is not None else None
+    except ValueError:
+        raise ValueError(f"booking_amount is not a number: {row['booking_amount']!r}") from None
+    if amount is None or amount < 0:
+        raise ValueError("Missing or negative booking_amount")
+
+    return {
+        "reservation_id": reservation_id.lstrip("#") if reservation_id else None,
+        "user_id": user_id,
+        "customer_id": _text(row, "customer_id", 20, required=False),
+        "guest_name": _text(row, "guest_name", 100),
+        "room_type": _text(row, "room_type", 50),
+        "room_number": _text(row, "room_number", 10, required=False),
+        "checkin_date": checkin,
+        "checkout_date": checkout,
+        "booking_amount": amount,
+        "payment_status": _choice(row, "payment_status", PAYMENT_STATUSES, "Pending"),
+        "fulfillment_status": _choice(row, "fulfillment_status", FULFILLMENT_STATUSES, "Pending"),
+        "created_at": _timestamp(row, "created_at"),
+    }
+
+
+def normalize_customer(raw) -> Dict:
+    """A customers row ready for import_customers; raises ValueError saying what is wrong"""
+    row = _clean(raw, CUSTOMER_ALIASES)
+    email = _text(row, "email", 100)
+    if "@" not in email:
+        raise ValueError(f"Invalid email {email!r}")
+    return {
+        "customer_id": _text(row, "customer_id", 20, required=False),
+        "user_id": _int(row, "user_id"),
+        "full_name": _text(row, "full_name", 100),
+        "email": email,
+        "address": _text(row, "address", 65535),
+        "phone": _text(row, "phone", 20),
+        "status": _choice(row, "status", CUSTOMER_STATUSES, "Active"),
+        "created_at": _timestamp(row, "created_at"),
+    }
+
+
+class ImportReport:
+    """Row counts, per-row errors and throughput of one import run"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started = clock()
+        self.read = 0
+        self.imported = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def fail(self, line: int, message: str) -> None:
+        self.errors.append((line, message))
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    @property
+    def rows_per_s(self) -> float:
+        elapsed = self.elapsed
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.read} rows read, {self.imported} imported, {len(self.errors)} rejected "
+                f"in {self.elapsed:.2f}s ({self.rows_per_s:.0f} rows/s)")
+
+
+def import_records(db, kind: str, records: Iterable[Tuple[int, object]],
+                   batch_size: int = DEFAULT_BATCH_SIZE, default_user_id: Optional[int] = None,
+                   report: Optional[ImportReport] = None,
+                   progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+    """Normalize ``records`` and send them to ``db`` in batches of ``batch_size``
+
+    ``kind`` is "reservations" or "customers".  ``progress`` is called with
+    the report after every batch.
+    """
+    if kind == "reservations":
+        normalize = lambda raw: normalize_reservation(raw, default_user_id)
+        write = db.import_reservations
+    elif kind == "customers":
+        normalize, write = normalize_customer, db.import_customers
+    else:
+        raise ValueError(f"Unknown import kind '{kind}'")
+    report = report or ImportReport()
+
+    def flush(batch: List[Tuple[int, Dict]]) -> None:
+        failed = write([row for _, row in batch])
+        for i, (line, _) in enumerate(batch):
+            if i in failed:
+                report.fail(line, failed[i])
+            else:
+                report.imported += 1
+        if progress:
+            progress(report)
+
+    batch: List[Tuple[int, Dict]] = []
+    for line, raw in records:
+        report.read += 1
+        try:
+            batch.append((line, normalize(raw)))
+        except ValueError as e:
+            report.fail(line, str(e))
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=("reservations", "customers"))
+    parser.add_argument("path", help=".csv, .json or .jsonl file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per database batch")
+    parser.add_argument("--user-id", type=int, help="user_id for reservation rows that have none")
+    parser.add_argument("--show-errors", type=int, default=20, help="rejected rows to list (0 for all)")
+    args = parser.parse_args()
+
+    from db_helper import DatabaseManager
+
+    with DatabaseManager() as db:
+        try:
+            report = import_records(
+                db, args.kind, read_records(args.path), args.batch_size, args.user_id,
+                progress=lambda r: print(f"  {r.read} rows read, {r.imported} imported ({r.rows_per_s:.0f} rows/s)")
+            )
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 2
+
+    shown = report.errors if args.show_errors == 0 else report.errors[:args.show_errors]
+    for line, message in shown:
+        print(f"  line {line}: {message}")
+    if len(shown) < len(report.errors):
+        print(f"  ... and {len(report.errors) - len(shown)} more")
+    print(f"{'❌' if report.errors else '✅'} {report.summary()}")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
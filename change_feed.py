@@ -0,0 +1,222 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_INTERVAL_MS = 3000
+# change_log ids are allocated before commit, so a slow transaction can land
+# below ids already read; the poller re-reads this many ids behind its
+# watermark and skips the ones it has published
+REREAD_WINDOW = 200
+PRUNE_INTERVAL_MS = 10 * 60 * 1000
+RETENTION_HOURS = 24
+
+# Cached aggregates that are derived from each logged table
+DERIVED_TABLES = {
+    "reservations": ("monthly_rollups",),
+    "customers": ("monthly_rollups",),
+}
+
+
+def collapse_changes(rows: Iterable[Dict]) -> Dict[str, Tuple[Set[str], Set[str]]]:
+    """Group change_log rows into {table: (upserted keys, deleted keys)}; the last op per row wins"""
+    changes: Dict[str, Tuple[Set[str], Set[str]]] = {}
+    for row in sorted(rows, key=lambda r: r["change_id"]):
+        upserted, deleted = changes.setdefault(row["table_name"], (set(), set()))
+        key = row["row_key"]
+        if row["op"] == "delete":
+            upserted.discard(key)
+            deleted.add(key)
+        else:
+            deleted.discard(key)
+            upserted.add(key)
+    return changes
+
+
+class ChangeEvent:
+    """Rows that changed between two change_log ids, grouped by table"""
+
+    def __init__(self, since: int, until: int, changes: Dict[str, Tuple[Set[str], Set[str]]]):
+        self.since = since
+        self.until = until
+        self.changes = changes
+
+    @property
+    def tables(self) -> Set[str]:
+        return set(self.changes)
+
+    def upserted(self, table: str) -> Set[str]:
+        """Keys of rows inserted or updated in ``table``"""
+        return self.changes.get(table, (set(), set()))[0]
+
+    def deleted(self, table: str) -> Set[str]:
+        return self.changes.get(table, (set(), set()))[1]
+
+    def only(self, tables: Iterable[str]) -> Optional["ChangeEvent"]:
+        """The part of this event touching ``tables``, or None if there is none"""
+        changes = {t: c for t, c in self.changes.items() if t in tables}
+        return ChangeEvent(self.since, self.until, changes) if changes else None
+
+    def merge(self, later: "ChangeEvent") -> "ChangeEvent":
+        """Combine with a later event, as if both had been read in one poll"""
+        changes = {t: (set(up), set(down)) for t, (up, down) in self.changes.items()}
+        for table, (upserted, deleted) in later.changes.items():
+            mine_up, mine_down = changes.setdefault(table, (set(), set()))
+            mine_up.difference_update(deleted)
+            mine_down.difference_update(upserted)
+            mine_up.update(upserted)
+            mine_down.update(deleted)
+        return ChangeEvent(min(self.since, later.since), max(self.until, later.until), changes)
+
+
+class Subscription:
+    def __init__(self, tables: Set[str], callback: Callable, owner, catch_up: bool):
+        self.tables = tables
+        self.callback = callback
+        self.owner = owner
+        self.catch_up = catch_up
+        self.pending: Optional[ChangeEvent] = None
+
+
+class ChangeFeed:
+    """Single background poller over change_log that fans changes out to frames
+
+    Triggers record every insert, update and delete on the logged tables, so
+    the feed also sees writes from other terminals.  Polls are a
+    RefreshScheduler job (so they back off and pause with the rest of the
+    app's refreshes); on the Tk thread the new rows are
+    collapsed into one ChangeEvent, matching QueryCache entries are
+    invalidated and subscribers are called so they can re-read just the
+    changed keys.  A subscription owned by a frame is only called while that
+    frame is the one shown (see ``set_active``); with ``catch_up`` the changes
+    made meanwhile are replayed as one event when it is shown again,
+    otherwise they are dropped because the screen reloads itself on show.
+    """
+
+    def __init__(self, db, scheduler, interval_ms: int = CHANGE_FEED_INTERVAL_MS, batch_size: int = 1000):
+        self.db = db
+        self.scheduler = scheduler
+        self.interval_ms = interval_ms
+        self.batch_size = max(batch_size, REREAD_WINDOW * 2)
+        self.watermark: Optional[int] = None
+        self.active_owner = None
+        self._floor = 0
+        self._published: Set[int] = set()
+        self._subscriptions: List[Subscription] = []
+        self._poll_job = None
+
+    # ----- subscriptions -----
+
+    def subscribe(self, tables: Iterable[str], callback: Callable[[ChangeEvent], None],
+                  owner=None, catch_up: bool = True) -> Subscription:
+        """Call ``callback(event)`` whenever rows of ``tables`` change"""
+        subscription = Subscription(set(tables), callback, owner, catch_up)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, owner) -> None:
+        self._subscriptions = [s for s in self._subscriptions if s.owner is not owner]
+
+    def set_active(self, owner) -> None:
+        """Mark ``owner`` as the frame on screen and replay changes it missed"""
+        self.active_owner = owner
+        for subscription in list(self._subscriptions):
+            if subscription.owner is owner and subscription.pending is not None:
+                event, subscription.pending = subscription.pending, None
+                self._deliver(subscription, event)
+
+    # ----- polling -----
+
+    def start(self) -> None:
+        if self._poll_job is not None:
+            return
+        self._poll_job = self.scheduler.register(
+            "change_feed",
+            self._read,
+            on_result=self._on_read,
+            on_error=lambda e: logger.warning(f"Change feed poll failed: {e}"),
+            interval_ms=self.interval_ms,
+            priority=10,
+            owner=self,
+            visible_only=False,
+            run_now=True
+        )
+        self.scheduler.register(
+            "change_log_prune",
+            self.db.prune_change_log,
+            RETENTION_HOURS,
+            interval_ms=PRUNE_INTERVAL_MS,
+            priority=-10,
+            owner=self,
+            visible_only=False
+        )
+
+    def stop(self) -> None:
+        self.scheduler.unregister(self)
+        self._poll_job = None
+
+    def _read(self) -> Tuple[str, object]:
+        """One poll; runs on a worker thread"""
+        if self.watermark is None:
+            # Start from "now": history before the app started is not replayed
+            return "watermark", self.db.get_change_watermark()
+        return "changes", self.db.get_changes_since(max(0, self.watermark - REREAD_WINDOW), self.batch_size)
+
+    def _on_read(self, result: Tuple[str, object]) -> None:
+        kind, value = result
+        if kind == "watermark":
+            if value is not None:
+                self.watermark = self._floor = value
+        else:
+            self._publish(value)
+            # A full batch means more rows are waiting; fetch them straight away
+            if len(value) >= self.batch_size and self._poll_job is not None:
+                self.scheduler.request(self._poll_job)
+
+    def _publish(self, rows: List[Dict]) -> None:
+        """Turn freshly read change_log rows into one event for the subscribers"""
+        fresh = [r for r in rows if r["change_id"] > self._floor and r["change_id"] not in self._published]
+        since = self.watermark
+        if rows:
+            self.watermark = max(self.watermark, max(r["change_id"] for r in rows))
+        self._published.update(r["change_id"] for r in fresh)
+        low = self.watermark - REREAD_WINDOW
+        self._published = {i for i in self._published if i > low}
+
+        if fresh:
+            self._dispatch(ChangeEvent(since, self.watermark, collapse_changes(fresh)))
+
+    def _dispatch(self, event: ChangeEvent) -> None:
+        cache = getattr(self.db, "cache", None)
+        if cache is not None:
+            stale = set(event.tables)
+            for table in event.tables:
+                stale.update(DERIVED_TABLES.get(table, ()))
+            cache.invalidate(stale)
+
+        logger.debug(f"Change feed: {sorted(event.tables)} changed in ({event.since}, {event.until}]")
+        for subscription in list(self._subscriptions):
+            relevant = event.only(subscription.tables)
+            if relevant is None:
+                continue
+            owner = subscription.owner
+            if owner is not None and hasattr(owner, "winfo_exists"):
+                try:
+                    alive = owner.winfo_exists()
+                except Exception:
+                    alive = False
+                if not alive:
+                    self._subscriptions.remove(subscription)
+                    continue
+            if owner is None or owner is self.active_owner:
+                self._deliver(subscription, relevant)
+            elif subscription.catch_up:
+                pending = subscription.pending
+                subscription.pending = pending.merge(relevant) if pending is not None else relevant
+
+    @staticmethod
+    def _deliver(subscription: Subscription, event: ChangeEvent) -> None:
+        try:
+            subscription.callback(event)
+        except Exception as e:
+            logger.error(f"Change feed subscriber failed: {e}")
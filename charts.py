@@ -0,0 +1,108 @@
+import logging
+from typing import List, Sequence, Tuple
+from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+logger = logging.getLogger(__name__)
+
+
+class LineChart:
+    """Embedded matplotlib line-and-fill chart that is updated in place
+
+    The chart owns one Figure for its whole life (created with
+    ``matplotlib.figure.Figure``, so pyplot never keeps a reference to it).
+    ``set_data`` moves the existing line and fill; when the month labels and
+    the y range still fit, only those two artists are re-blitted over a
+    cached background instead of re-rendering the whole figure.  The figure
+    is released when the Tk widget is destroyed.
+    """
+
+    def __init__(self, master, figsize: Tuple[float, float] = (10, 3), dpi: int = 100,
+                 color: str = "#3b82f6", fill_alpha: float = 0.1):
+        self.figure = Figure(figsize=figsize, dpi=dpi, facecolor="white")
+        self.ax = self.figure.add_subplot()
+        self.ax.set_facecolor("white")
+        self.ax.grid(axis="y", linestyle="--", alpha=0.7)
+        for spine in self.ax.spines.values():
+            spine.set_visible(False)
+
+        # Animated artists are left out of full renders and blitted on top
+        (self.line,) = self.ax.plot([], [], color=color, linewidth=2, marker="o", animated=True)
+        self.fill = PolyCollection([], facecolors=color, alpha=fill_alpha, animated=True)
+        self.ax.add_collection(self.fill, autolim=False)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self._labels: List[str] = []
+        self._background = None
+        self._draw_cid = self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.widget.bind("<Destroy>", self._on_destroy, add="+")
+        self.closed = False
+
+    def set_data(self, labels: Sequence, values: Sequence[float]) -> None:
+        """Show ``values`` against the category ``labels`` (e.g. month names)"""
+        if self.closed:
+            return
+        labels = [str(label) for label in labels]
+        values = [float(v or 0) for v in values]
+        xs = list(range(len(values)))
+
+        self.line.set_data(xs, values)
+        self.fill.set_verts([self._fill_outline(xs, values)] if xs else [])
+
+        if labels != self._labels or not self._fits(values):
+            self._labels = labels
+            self._rescale(xs, labels, values)
+            # Ticks or limits changed: render everything once, which recaptures the background
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    @staticmethod
+    def _fill_outline(xs: List[int], values: List[float]) -> List[Tuple[float, float]]:
+        return [(xs[0], 0.0)] + list(zip(xs, values)) + [(xs[-1], 0.0)]
+
+    def _fits(self, values: List[float]) -> bool:
+        """Whether the current y limits still suit ``values`` (not clipped, not squashed)"""
+        low, high = self.ax.get_ylim()
+        top = max(values, default=0.0)
+        return low <= min(values, default=0.0) and top <= high and (high <= 1 or top >= high * 0.4)
+
+    def _rescale(self, xs: List[int], labels: List[str], values: List[float]) -> None:
+        self.ax.set_xticks(xs)
+        self.ax.set_xticklabels(labels)
+        self.ax.set_xlim(-0.25, max(len(xs) - 1, 0) + 0.25)
+        top = max(values, default=0.0)
+        self.ax.set_ylim(min(0.0, min(values, default=0.0)), top * 1.15 if top > 0 else 1.0)
+
+    def _on_draw(self, event=None) -> None:
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        self.figure.draw_artist(self.fill)
+        self.figure.draw_artist(self.line)
+
+    def _blit(self) -> None:
+        if self._background is None:
+            # Not rendered yet; the first draw paints the animated artists too
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self.widget:
+            self.close()
+
+    def close(self) -> None:
+        """Release the figure and the cached background"""
+        if self.closed:
+            return
+        self.closed = True
+        self.canvas.mpl_disconnect(self._draw_cid)
+        self._background = None
+        self.figure.clear()
+        logger.debug("Chart figure released")
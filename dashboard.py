@@ -1,12 +1,13 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from charts import LineChart
 import tksheet
 import logging
 from typing import Dict  # Added import for Dict type hint
 
 logger = logging.getLogger(__name__)
 
+DASHBOARD_REFRESH_MS = 60000
+
 
 class HotelBookingDashboard(ctk.CTkFrame):
     def __init__(self, parent, controller, db=None):
@@ -18,9 +19,27 @@ class HotelBookingDashboard(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
         print("Admin dashboard initialized-------->>>")
+        # Periodic snapshot refresh; the scheduler only runs it while this frame is shown
+        self.snapshot_job = self.controller.scheduler.register(
+            "admin_dashboard",
+            self.db.get_dashboard_snapshot,
+            "admin",
+            on_result=self._apply_snapshot,
+            on_error=lambda e: logger.error(f"Error loading dashboard snapshot: {e}"),
+            interval_ms=DASHBOARD_REFRESH_MS,
+            priority=5,
+            owner=self
+        )
         # Create components
         self.create_sidebar()
         self.create_main_content()
+        # The dashboard reloads itself when shown, so changes made meanwhile are not replayed
+        self.controller.change_feed.subscribe(
+            ("reservations", "customers"),
+            lambda event: self.load_snapshot(),
+            owner=self,
+            catch_up=False
+        )
         logger.info("HotelBookingDashboard initialized")
 
     def update_user_display(self, user_data: Dict) -> None:
@@ -51,12 +70,26 @@ class HotelBookingDashboard(ctk.CTkFrame):
                     widget.destroy()
                 self.create_welcome_message()
 
-            if hasattr(self, 'sheet'):
-                self.update_bookings_table()
+            self.load_snapshot()
         except Exception as e:
             logger.error(f"Error refreshing dashboard data: {e}")
             raise
 
+    def load_snapshot(self) -> None:
+        """Fetch metrics, revenue trend and recent bookings in one background round trip"""
+        self.controller.scheduler.request(self.snapshot_job)
+
+    def _apply_snapshot(self, snapshot) -> None:
+        """Fill every data-driven widget from a dashboard snapshot"""
+        self._apply_metrics((
+            f"${snapshot.get('total_bookings_cost', 0):,.2f}",
+            f"{snapshot.get('active_customers', 0):,}",
+            f"{snapshot.get('total_reservations', 0):,}",
+            f"{snapshot.get('pending_reservations', 0):,}"
+        ))
+        self._plot_revenue(snapshot.get("revenue_trends", {}))
+        self._fill_bookings_table(snapshot.get("recent_bookings", []))
+
     def create_sidebar(self):
         sidebar = ctk.CTkFrame(self, width=250, fg_color="#f0f9ff", corner_radius=0)
         sidebar.grid(row=0, column=0, sticky="nsew")
@@ -201,6 +234,8 @@ class HotelBookingDashboard(ctk.CTkFrame):
         # Recent bookings table
         self.create_bookings_table(content)
 
+        self.load_snapshot()
+
     def create_welcome_message(self):
         welcome_text = "Good morning, Admin"
         if hasattr(self, 'current_user') and self.current_user:
@@ -226,18 +261,14 @@ class HotelBookingDashboard(ctk.CTkFrame):
             self.metrics_frame.grid_columnconfigure(2, weight=1)
             self.metrics_frame.grid_columnconfigure(3, weight=1)
 
-            # Get data from database
-            total_bookings_cost = self.db.get_total_bookings_cost()
-            active_customers = self.db.get_active_customers_count()
-            total_reservations = self.db.get_total_reservations()
-            pending_reservations = self.db.get_pending_reservations_count()
-
+            # Cards show a placeholder until the background query returns
             metrics = [
-                (0, f"${total_bookings_cost:,.2f}", "Total bookings cost", "HotelReservationsPage"),
-                (1, f"{active_customers:,}", "Active customers", "CustomerManagementScreen"),
-                (2, f"{total_reservations:,}", "Total reservations", "HotelReservationsPage"),
-                (3, f"{pending_reservations:,}", "Pending reservations", "HotelReservationsPage")
+                (0, "—", "Total bookings cost", "HotelReservationsPage"),
+                (1, "—", "Active customers", "CustomerManagementScreen"),
+                (2, "—", "Total reservations", "HotelReservationsPage"),
+                (3, "—", "Pending reservations", "HotelReservationsPage")
             ]
+            self.metric_value_labels = []
 
             for col, value, label, target_frame in metrics:
                 card = ctk.CTkFrame(
@@ -253,13 +284,15 @@ class HotelBookingDashboard(ctk.CTkFrame):
                 for child in card.winfo_children():
                     child.bind("<Button-1>", lambda e, fn=target_frame: self.controller.show_frame(fn))
 
-                ctk.CTkLabel(
+                value_label = ctk.CTkLabel(
                     card,
                     text=value,
                     font=("Arial", 24, "bold"),
                     text_color="#2c3e50",
                     cursor="hand2"
-                ).pack(pady=(25, 5), padx=20, anchor="w")
+                )
+                value_label.pack(pady=(25, 5), padx=20, anchor="w")
+                self.metric_value_labels.append(value_label)
 
                 ctk.CTkLabel(
                     card,
@@ -273,6 +306,11 @@ class HotelBookingDashboard(ctk.CTkFrame):
             logger.error(f"Error creating metrics: {e}")
             raise
 
+    def _apply_metrics(self, values):
+        """Fill the metric cards once the background query returns"""
+        for label, value in zip(self.metric_value_labels, values):
+            label.configure(text=value)
+
     def create_revenue_graph(self, parent):
         """Create monthly revenue graph"""
         try:
@@ -286,32 +324,19 @@ class HotelBookingDashboard(ctk.CTkFrame):
                 text_color="#2c3e50"
             ).pack(pady=(20, 15), padx=20, anchor="w")
 
-            # Get data from database
-            revenue_data = self.db.get_revenue_trends()
-            months = list(revenue_data.keys())
-            revenue = list(revenue_data.values())
-
-            # Create matplotlib figure
-            fig, ax = plt.subplots(figsize=(10, 3), dpi=100)
-            ax.plot(months, revenue, color='#3b82f6', linewidth=2, marker='o')
-            ax.fill_between(months, revenue, color='#3b82f6', alpha=0.1)
-            ax.grid(axis='y', linestyle='--', alpha=0.7)
-            ax.set_facecolor('white')
-            fig.patch.set_facecolor('white')
-
-            # Remove borders
-            for spine in ax.spines.values():
-                spine.set_visible(False)
-
-            # Embed in Tkinter
-            canvas = FigureCanvasTkAgg(fig, master=revenue_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="x", padx=20, pady=(0, 20))
+            # One figure for the page's lifetime; data is plotted when the snapshot arrives
+            self.revenue_chart = LineChart(revenue_frame)
+            self.revenue_chart.widget.pack(fill="x", padx=20, pady=(0, 20))
+            self._plot_revenue({})
 
         except Exception as e:
             logger.error(f"Error creating revenue graph: {e}")
             raise
 
+    def _plot_revenue(self, revenue_data):
+        """Update the revenue line for the given month -> revenue mapping"""
+        self.revenue_chart.set_data(list(revenue_data.keys()), list(revenue_data.values()))
+
     def create_quick_access(self, parent):
         """Create quick access cards"""
         try:
@@ -417,25 +442,20 @@ class HotelBookingDashboard(ctk.CTkFrame):
             self.sheet.enable_bindings()
             self.sheet.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-            self.update_bookings_table()
+            # Set headers
+            headers = ["Booking ID", "Check-In", "Check-Out", "Status", "Payment", "Amount"]
+            self.sheet.headers(headers)
 
         except Exception as e:
             logger.error(f"Error creating bookings table: {e}")
             raise
 
-    def update_bookings_table(self):
-        """Update the bookings table with current reservation data"""
+    def _fill_bookings_table(self, reservations):
+        """Render the snapshot's most recent reservations into the bookings sheet"""
         try:
-            # Set headers
-            headers = ["Booking ID", "Check-In", "Check-Out", "Status", "Payment", "Amount"]
-            self.sheet.headers(headers)
-
-            # Get data from database
-            reservations = self.db.get_reservations()  # This now returns all needed fields
-
             # Prepare data for the sheet
             data = []
-            for res in reservations[:10]:  # Show only 10 most recent
+            for res in reservations:
                 amount = res.get("amount", "N/A")
                 # Format amount if it's numeric (remove $ if already present and format)
                 if isinstance(amount, str) and amount.startswith('$'):
@@ -470,8 +490,7 @@ class HotelBookingDashboard(ctk.CTkFrame):
             self.format_table()
 
         except Exception as e:
-            logger.error(f"Error updating bookings table: {e}")
-            raise
+            logger.error(f"Error filling bookings table: {e}")
 
     def format_table(self):
         """Apply enhanced formatting and colors to the table"""
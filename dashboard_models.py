@@ -0,0 +1,92 @@
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+RECENT_BOOKINGS_LIMIT = 5
+
+
+def format_amount(amount) -> str:
+    """Money as "$1,234.50" whether it arrives as a number or a formatted string"""
+    if isinstance(amount, (int, float)):
+        return f"${amount:,.2f}"
+    if isinstance(amount, str) and not amount.startswith("$"):
+        try:
+            value = float(re.sub(r"[^\d.]", "", amount))
+            return f"${value:,.2f}"
+        except ValueError:
+            return amount
+    return amount if amount is not None else "$0.00"
+
+
+class CustomerDashboardModel:
+    """What the customer dashboard shows for the signed-in user
+
+    The dashboard widgets are built once; each load is applied here first
+    and ``apply`` reports which parts actually changed, so the view only
+    touches the labels or table rows that need it.
+    """
+
+    def __init__(self):
+        self.user_id: Optional[int] = None
+        self.full_name = ""
+        self.metrics: Optional[Tuple[float, int, int]] = None
+        self.recent_bookings: List[Dict] = []
+
+    def set_user(self, user: Dict) -> bool:
+        """Switch to ``user``; returns True (and forgets the old data) if it is someone else"""
+        user_id = user.get("user_id")
+        self.full_name = user.get("full_name") or "Customer"
+        if user_id == self.user_id:
+            return False
+        self.user_id = user_id
+        self.metrics = None
+        self.recent_bookings = []
+        return True
+
+    @property
+    def first_name(self) -> str:
+        parts = self.full_name.split()
+        return parts[0] if parts else ""
+
+    def apply(self, summary: Dict) -> Set[str]:
+        """Take a freshly loaded summary; returns the names of the parts that changed
+
+        Summaries for a user other than the current one (a load that finished
+        after a logout) are ignored.
+        """
+        if summary.get("user_id") != self.user_id:
+            return set()
+
+        changed = set()
+        metrics = (
+            float(summary.get("total_spent") or 0),
+            int(summary.get("upcoming_count") or 0),
+            int(summary.get("past_count") or 0),
+        )
+        if metrics != self.metrics:
+            self.metrics = metrics
+            changed.add("metrics")
+
+        bookings = list(summary.get("recent_bookings") or [])[:RECENT_BOOKINGS_LIMIT]
+        if bookings != self.recent_bookings:
+            self.recent_bookings = bookings
+            changed.add("recent_bookings")
+        return changed
+
+    def metric_texts(self) -> Tuple[str, str, str]:
+        """Card values; dashes until the first load for this user arrives"""
+        if self.metrics is None:
+            return "—", "—", "—"
+        total_spent, upcoming, past = self.metrics
+        return f"${total_spent:,.2f}", f"{upcoming:,}", f"{past:,}"
+
+    @staticmethod
+    def booking_values(booking: Dict) -> Tuple:
+        """Recent-bookings table row for one reservation"""
+        return (
+            booking.get("reservation_id", ""),
+            booking.get("room_type", ""),
+            booking.get("check_in", ""),
+            booking.get("check_out", ""),
+            format_amount(booking.get("amount", "$0.00")),
+            booking.get("status", "Pending"),
+        )
@@ -0,0 +1,164 @@
+import queue
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRequest:
+    """Handle for one background query; cancelled requests never call back"""
+
+    def __init__(self, owner, key, on_success, on_error):
+        self.owner = owner
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class BackgroundQueryExecutor:
+    """Run DatabaseManager calls off the Tk thread and deliver results via after()
+
+    Workers never touch widgets: finished calls are queued and drained on the
+    Tk thread by a short ``after()`` poll that only runs while requests are in
+    flight.  Requests are tagged with an ``owner`` (usually the frame that
+    asked) so everything a frame started can be dropped when the user
+    navigates away, and with an optional ``key`` so a newer request of the
+    same kind supersedes an older one still running.
+    """
+
+    def __init__(self, root, db, max_workers: Optional[int] = None, poll_interval: int = 25):
+        self.root = root
+        self.db = db
+        self.poll_interval = poll_interval
+
+        if max_workers is None:
+            # A single shared connection serializes queries anyway.  With a pool,
+            # one connection is left over so the Tk thread never waits for a worker
+            max_workers = max(1, db.pool_size - 1) if getattr(db, "is_pooled", False) else 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-query")
+        self._results = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._poll_id = None
+        self._closed = False
+
+    def submit(
+            self,
+            func: Callable,
+            *args,
+            on_success: Optional[Callable] = None,
+            on_error: Optional[Callable] = None,
+            owner=None,
+            key: Optional[str] = None,
+            **kwargs
+    ) -> QueryRequest:
+        """Run ``func(*args, **kwargs)`` on a worker thread
+
+        ``on_success(result)`` or ``on_error(exception)`` is invoked on the Tk
+        thread unless the request was cancelled in the meantime.
+        """
+        if self._closed:
+            raise RuntimeError("Background query executor is shut down")
+
+        request = QueryRequest(owner, key, on_success, on_error)
+        with self._lock:
+            if key is not None:
+                previous = self._pending.get((owner, key))
+                if previous is not None:
+                    previous.cancel()
+                self._pending[(owner, key)] = request
+            else:
+                self._pending[(owner, id(request))] = request
+
+        request.future = self._executor.submit(self._run, request, func, args, kwargs)
+        self._schedule_poll()
+        return request
+
+    def cancel(self, owner, key: Optional[str] = None) -> int:
+        """Cancel pending requests for ``owner`` (optionally only ``key``)"""
+        cancelled = 0
+        with self._lock:
+            for (req_owner, req_key), request in list(self._pending.items()):
+                if req_owner is owner and (key is None or req_key == key):
+                    request.cancel()
+                    del self._pending[(req_owner, req_key)]
+                    cancelled += 1
+        if cancelled:
+            logger.debug(f"Cancelled {cancelled} stale background queries")
+        return cancelled
+
+    def shutdown(self) -> None:
+        self._closed = True
+        with self._lock:
+            for request in self._pending.values():
+                request.cancel()
+            self._pending.clear()
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, request: QueryRequest, func, args, kwargs) -> None:
+        if request.cancelled:
+            return
+        try:
+            result = func(*args, **kwargs)
+            self._results.put((request, result, None))
+        except Exception as e:
+            logger.error(f"Background query failed: {e}")
+            self._results.put((request, None, e))
+
+    def _schedule_poll(self) -> None:
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self) -> None:
+        """Drain finished requests on the Tk thread"""
+        self._poll_id = None
+        while True:
+            try:
+                request, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._deliver(request, result, error)
+
+        with self._lock:
+            self._pending = {
+                k: r for k, r in self._pending.items()
+                if r.future is None or not r.future.done()
+            }
+            still_running = bool(self._pending)
+        if still_running or not self._results.empty():
+            self._schedule_poll()
+
+    def _deliver(self, request: QueryRequest, result, error) -> None:
+        if request.cancelled:
+            return
+        owner = request.owner
+        if owner is not None and hasattr(owner, "winfo_exists"):
+            try:
+                if not owner.winfo_exists():
+                    return
+            except Exception:
+                return
+
+        try:
+            if error is None:
+                if request.on_success:
+                    request.on_success(result)
+            elif request.on_error:
+                request.on_error(error)
+        except Exception as e:
+            logger.error(f"Background query callback failed: {e}")
@@ -0,0 +1,96 @@
+import copy
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """Bounded LRU cache of query results with per-entry TTLs and table tags
+
+    Every entry records the tables its query read.  ``invalidate(tables)``
+    drops all entries tagged with any of them and bumps those tables'
+    generation counters; ``put`` refuses to store a result whose tables were
+    invalidated after the caller sampled ``generation()``, so a read racing a
+    write can never re-populate the cache with pre-write data.
+
+    Values are deep-copied on the way in and out, so callers may mutate what
+    they get back.
+    """
+
+    def __init__(self, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def generation(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot of the write generation for ``tables``; pass it back to ``put``"""
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in tables)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(True, value)`` on a fresh hit, ``(False, None)`` otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[2]
+        return True, copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, ttl: float, tables: Tuple[str, ...], generation: Tuple[int, ...]) -> bool:
+        """Store ``value`` unless one of ``tables`` was written since ``generation``"""
+        if self.max_entries <= 0 or ttl <= 0:
+            return False
+        value = copy.deepcopy(value)
+        with self._lock:
+            if tuple(self._generations.get(t, 0) for t in tables) != generation:
+                return False
+            self._entries[key] = (self._clock() + ttl, tables, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """Drop every entry that read any of ``tables``; returns how many were dropped"""
+        tables = set(tables)
+        with self._lock:
+            for t in tables:
+                self._generations[t] = self._generations.get(t, 0) + 1
+            stale = [k for k, (_, tagged, _) in self._entries.items() if tables.intersection(tagged)]
+            for k in stale:
+                del self._entries[k]
+            self.invalidations += len(stale)
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached queries for {sorted(tables)}")
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
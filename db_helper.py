@@ -2,12 +2,21 @@ import mysql.connector
 from mysql.connector import Error, errorcode
 from dotenv import load_dotenv
 import os
+import socket
 import hashlib
 import re
-from typing import Optional, Dict, Tuple, List
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional, Dict, Tuple, List
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import time
+from db_pool import ConnectionPool
+from db_migrations import migrate, REBUILD_RESERVATION_ROLLUPS, REBUILD_CUSTOMER_ROLLUPS
+from db_ids import IdAllocator, ID_FORMATS
+from db_cache import QueryCache
+from availability import AvailabilityEngine, RoomUnavailable, as_date
 
 # Configure logging
 logging.basicConfig(
@@ -19,23 +28,256 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Scalar subqueries combined into a dashboard's single KPI row
+KPI_QUERIES = {
+    "total_bookings_cost": "SELECT COALESCE(SUM(booking_amount), 0) FROM reservations",
+    "total_reservations": "SELECT COUNT(*) FROM reservations",
+    "pending_reservations": "SELECT COUNT(*) FROM reservations WHERE fulfillment_status = 'Pending'",
+    "active_customers": "SELECT COUNT(*) FROM customers WHERE status = 'Active'",
+}
+
+DASHBOARD_KPIS = {
+    "admin": ["total_bookings_cost", "active_customers", "total_reservations", "pending_reservations"],
+    "staff": ["total_reservations", "active_customers", "pending_reservations"],
+}
+
+# Keyset sort orders: result column -> SQL expression it is read from
+RESERVATION_SORTS = {
+    "check_in": "r.checkin_date",
+    "check_out": "r.checkout_date",
+    "guest_name": "r.guest_name",
+    "amount": "r.booking_amount",
+    "reservation_id": "r.reservation_id",
+}
+CUSTOMER_SORTS = {"full_name": "full_name", "email": "email", "customer_id": "customer_id"}
+STAFF_SORTS = {"full_name": "full_name", "email": "email", "staff_id": "staff_id"}
+
+# Room holds: how long a claimed room stays reserved for the terminal that
+# claimed it, and how often a hold is retried after a deadlock or lock timeout
+HOLD_TTL_SECONDS = 120
+HOLD_RETRIES = 3
+RETRYABLE_LOCK_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+HOLD_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+# Columns of the row update_reservation_checked locks, returns and compares versions on
+RESERVATION_ROW_COLUMNS = (
+    "reservation_id", "user_id", "guest_name", "room_type", "room_number", "checkin_date", "checkout_date",
+    "booking_amount", "payment_status", "fulfillment_status", "version",
+)
+
+# Full-history export: every reservation with its customer, in primary key
+# order so the server streams it straight off the index without sorting
+RESERVATION_HISTORY_QUERY = """
+    SELECT
+        r.reservation_id, r.user_id, r.customer_id, r.guest_name, r.room_type, r.room_number,
+        r.checkin_date, r.checkout_date, r.booking_amount, r.payment_status, r.fulfillment_status,
+        r.created_at, r.updated_at,
+        c.full_name AS customer_name, c.email AS customer_email,
+        c.phone AS customer_phone, c.status AS customer_status
+    FROM reservations r
+    LEFT JOIN customers c ON c.customer_id = r.customer_id
+    ORDER BY r.reservation_id
+"""
+# Analytics export (parquet_export.SCHEMAS has the matching columns), each
+# ordered by the date it is partitioned on, with that month as the last column
+ANALYTICS_EXPORT_QUERIES = {
+    "reservations": """
+        SELECT reservation_id, user_id, customer_id, guest_name, room_type, room_number,
+               checkin_date, checkout_date, booking_amount, payment_status, fulfillment_status,
+               created_at, updated_at, DATE_FORMAT(checkin_date, '%Y-%m') AS month
+        FROM reservations
+        ORDER BY checkin_date
+    """,
+    "customers": """
+        SELECT customer_id, user_id, full_name, email, phone, status, created_at, updated_at,
+               DATE_FORMAT(created_at, '%Y-%m') AS month
+        FROM customers
+        ORDER BY created_at
+    """,
+    "transactions": """
+        SELECT transaction_id, customer_id, reservation_id, amount, transaction_date,
+               DATE_FORMAT(transaction_date, '%Y-%m') AS month
+        FROM transactions
+        ORDER BY transaction_date
+    """,
+    "room_occupancy": """
+        SELECT date, room_type, occupied_rooms, total_rooms, DATE_FORMAT(date, '%Y-%m') AS month
+        FROM room_occupancy
+        ORDER BY date
+    """,
+}
+# Seconds the server waits on a streaming client that is busy writing its file
+EXPORT_NET_WRITE_TIMEOUT = 600
+
+CUSTOMER_SUMMARY_TTL = 120  # seconds; writes to the customer's reservations drop it sooner
+
+
+def customer_scope(user_id) -> str:
+    """Cache tag for reads that only cover one customer's reservations"""
+    return f"customer:{user_id}"
+
+
+def _uses_connection(method):
+    """Run a DatabaseManager method on a pooled connection when pooling is enabled.
+
+    The checked-out connection is bound to the calling thread for the duration
+    of the call, so ``self.connection`` inside the method (and in any nested
+    DatabaseManager call) resolves to it.  In single-connection mode calls are
+    serialized on a lock so background workers never share the cursor with the
+    Tk thread mid-query.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._pool is None:
+            with self._lock:
+                return method(self, *args, **kwargs)
+        if getattr(self._local, "connection", None) is not None:
+            return method(self, *args, **kwargs)
+
+        with self._pool.connection() as conn:
+            self._local.connection = conn
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._local.connection = None
+    return wrapper
+
+
+def _cached(ttl: float, *tables: str, scope: Optional[Callable[..., Tuple[str, ...]]] = None):
+    """Serve a read method from ``self.cache`` for ``ttl`` seconds.
+
+    ``tables`` are the tables the query reads; any method decorated with
+    ``_invalidates`` for one of them drops the entry immediately.  ``scope``,
+    called with the method's arguments, adds narrower tags (such as
+    ``customer_scope``) so a write can drop just the entries it affects.
+    Hits never touch the connection lock or the pool.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            hit, value = self.cache.get(key)
+            if hit:
+                return value
+            tags = tables + tuple(scope(*args, **kwargs)) if scope else tables
+            generation = self.cache.generation(tags)
+            value = method(self, *args, **kwargs)
+            self.cache.put(key, value, ttl, tags, generation)
+            return value
+        return wrapper
+    return decorator
+
+
+def _invalidates(*tables: str):
+    """Drop cached reads of ``tables`` once a write method returns."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.cache.invalidate(tables)
+        return wrapper
+    return decorator
+
 
 class DatabaseManager:
-    def __init__(self):
-        """Initialize database connection with enhanced error handling"""
-        self.connection = None
+    def __init__(
+            self,
+            pool_size: Optional[int] = None,
+            checkout_timeout: Optional[float] = None,
+            health_check: Optional[str] = None,
+            cache_size: Optional[int] = None
+    ):
+        """Initialize database connection with enhanced error handling
+
+        Pass ``pool_size`` (or set ``DB_POOL_SIZE``) to run in pooled mode, where
+        every method checks out its own connection instead of sharing one.
+        ``cache_size`` (or ``DB_CACHE_SIZE``) bounds the aggregate query cache;
+        0 disables it.
+        """
+        self._connection = None
+        self._pool = None
+        self.schema_version = 0
+        self.ids = IdAllocator(self._reserve_id_block)
+        self.cache = QueryCache(
+            cache_size if cache_size is not None else int(os.getenv("DB_CACHE_SIZE", "256"))
+        )
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._availability: Optional[AvailabilityEngine] = None
+        self._availability_lock = threading.Lock()
+        self._id_connection = None
+        self._id_lock = threading.Lock()
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("DB_POOL_SIZE", "0"))
+        self.checkout_timeout = (
+            checkout_timeout if checkout_timeout is not None
+            else float(os.getenv("DB_POOL_TIMEOUT", "10"))
+        )
+        self.health_check = health_check or os.getenv("DB_POOL_HEALTH_CHECK", "idle")
+
         self._connect()
         self._initialize_database()
         logger.info("DatabaseManager initialized")
 
-    def _connect(self) -> bool:
+    @property
+    def connection(self):
+        """Connection for the current call
+
+        In pooled mode this is the connection checked out for the running
+        DatabaseManager method.  Direct access from outside a method pins a
+        pooled connection to the calling thread until ``release_connection``.
+        """
+        if self._pool is None:
+            return self._connection
+
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._pool.acquire()
+            self._local.connection = conn
+            self._local.pinned = True
+        return conn
+
+    @connection.setter
+    def connection(self, value):
+        self._connection = value
+
+    @property
+    def is_pooled(self) -> bool:
+        return self._pool is not None
+
+    def release_connection(self) -> None:
+        """Return a connection pinned by direct ``db.connection`` access to the pool"""
+        if self._pool is None or not getattr(self._local, "pinned", False):
+            return
+        conn = self._local.connection
+        self._local.connection = None
+        self._local.pinned = False
+        self._pool.release(conn)
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block atomically on the current connection (connections default to autocommit)"""
+        if self.connection.in_transaction:
+            yield
+            return
+
+        self.connection.start_transaction()
+        try:
+            yield
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+    def _open_connection(self):
         """Establish secure connection with retry logic"""
         max_retries = 3
         retry_delay = 2  # seconds
 
         for attempt in range(max_retries):
             try:
-                self.connection = mysql.connector.connect(
+                connection = mysql.connector.connect(
                     host=os.getenv("DB_HOST"),
                     port=int(os.getenv("DB_PORT")),
                     user=os.getenv("DB_USER"),
@@ -47,217 +289,52 @@ class DatabaseManager:
                     autocommit=True
                 )
 
-                if self.connection.is_connected():
+                if connection.is_connected():
                     logger.info(f"✅ Connected to MySQL database (Attempt {attempt + 1})")
-                    return True
+                    return connection
 
             except Error as err:
                 logger.error(f"❌ Connection attempt {attempt + 1} failed: {err}")
                 if attempt < max_retries - 1:
-                    import time
                     time.sleep(retry_delay)
                     continue
                 raise RuntimeError(f"Failed to connect after {max_retries} attempts") from err
 
+    def _connect(self) -> bool:
+        """Open the shared connection, or the connection pool in pooled mode"""
+        if self.pool_size > 0:
+            if self._pool is None:
+                self._pool = ConnectionPool(
+                    self._open_connection,
+                    size=self.pool_size,
+                    checkout_timeout=self.checkout_timeout,
+                    health_check=self.health_check
+                )
+                # Open one connection up front so failures surface here
+                with self._pool.connection():
+                    pass
+                logger.info(
+                    f"Connection pool ready (size={self.pool_size}, "
+                    f"timeout={self.checkout_timeout}s, health_check={self.health_check})"
+                )
+            return True
+
+        self.connection = self._open_connection()
+        return self.connection is not None
+
+    @_uses_connection
     def _initialize_database(self) -> None:
-        """Initialize database schema with verification and updates"""
+        """Bring the schema up to date; a single version check when already current"""
         if not self.connection or not self.connection.is_connected():
             self._connect()
 
-        tables = {
-            "users": """
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INT AUTO_INCREMENT PRIMARY KEY,
-                    full_name VARCHAR(100) NOT NULL,
-                    email VARCHAR(100) NOT NULL COLLATE utf8mb4_bin,
-                    password_hash VARCHAR(255) NOT NULL,
-                    gender ENUM('Male','Female','Other') NOT NULL,
-                    role ENUM('admin','staff','customer') NOT NULL DEFAULT 'customer',
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    UNIQUE INDEX idx_email (email)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "user_sessions": """
-                CREATE TABLE IF NOT EXISTS user_sessions (
-                    session_id VARCHAR(255) PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    ip_address VARCHAR(45),
-                    user_agent TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "auth_logs": """
-                CREATE TABLE IF NOT EXISTS auth_logs (
-                    log_id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NULL,
-                    email VARCHAR(100) NOT NULL,
-                    action ENUM('register','login','logout','fail') NOT NULL,
-                    ip_address VARCHAR(45),
-                    user_agent TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "customers": """
-                CREATE TABLE IF NOT EXISTS customers (
-                    customer_id VARCHAR(20) PRIMARY KEY,
-                    user_id INT,
-                    full_name VARCHAR(100) NOT NULL,
-                    email VARCHAR(100) NOT NULL COLLATE utf8mb4_bin,
-                    address TEXT NOT NULL,
-                    phone VARCHAR(20) NOT NULL,
-                    status ENUM('Active','Inactive') NOT NULL DEFAULT 'Active',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL,
-                    UNIQUE INDEX idx_email (email),
-                    INDEX idx_status (status)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "staff": """
-                CREATE TABLE IF NOT EXISTS staff (
-                    staff_id VARCHAR(20) PRIMARY KEY,
-                    user_id INT,
-                    full_name VARCHAR(100) NOT NULL,
-                    email VARCHAR(100) NOT NULL COLLATE utf8mb4_bin,
-                    phone VARCHAR(20) NOT NULL,
-                    address TEXT NOT NULL,
-                    status ENUM('Active','Inactive') NOT NULL DEFAULT 'Active',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL,
-                    UNIQUE INDEX idx_staff_email (email)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "reservations": """
-                CREATE TABLE IF NOT EXISTS reservations (
-                    reservation_id VARCHAR(20) PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    customer_id VARCHAR(20),
-                    guest_name VARCHAR(100) NOT NULL,
-                    room_type VARCHAR(50) NOT NULL,
-                    checkin_date DATE NOT NULL,
-                    checkout_date DATE NOT NULL,
-                    booking_amount DECIMAL(10,2) NOT NULL,
-                    payment_status ENUM('Paid', 'Pending', 'Cancelled') DEFAULT 'Pending',
-                    fulfillment_status ENUM('Confirmed', 'Pending', 'Cancelled') DEFAULT 'Pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                    FOREIGN KEY (customer_id) REFERENCES customers(customer_id) ON DELETE SET NULL,
-                    INDEX idx_reservations_created (created_at),
-                    INDEX idx_reservations_user (user_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "transactions": """
-                CREATE TABLE IF NOT EXISTS transactions (
-                    transaction_id INT AUTO_INCREMENT PRIMARY KEY,
-                    customer_id VARCHAR(20),
-                    reservation_id VARCHAR(20),
-                    amount DECIMAL(10,2) NOT NULL,
-                    transaction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (customer_id) REFERENCES customers(customer_id) 
-                        ON DELETE SET NULL
-                        ON UPDATE CASCADE,
-                    FOREIGN KEY (reservation_id) REFERENCES reservations(reservation_id)
-                        ON DELETE SET NULL
-                        ON UPDATE CASCADE,
-                    INDEX idx_transactions_date (transaction_date)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "room_occupancy": """
-                CREATE TABLE IF NOT EXISTS room_occupancy (
-                    record_id INT AUTO_INCREMENT PRIMARY KEY,
-                    date DATE NOT NULL,
-                    occupied_rooms INT NOT NULL,
-                    total_rooms INT NOT NULL,
-                    UNIQUE KEY unique_date (date)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            "password_recovery_requests": """
-                CREATE TABLE IF NOT EXISTS password_recovery_requests (
-                    request_id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    username VARCHAR(100) NOT NULL,
-                    full_name VARCHAR(100) NOT NULL,
-                    request_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                    INDEX idx_recovery_status (status)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """
-        }
-
-        # Critical columns that must exist
-        required_columns = {
-            "users": [("role", "ENUM('admin','staff','customer') NOT NULL DEFAULT 'customer'")],
-            "reservations": [
-                ("room_type", "VARCHAR(50) NOT NULL"),
-                ("checkout_date", "DATE NOT NULL"),
-                ("fulfillment_status", "ENUM('Confirmed', 'Pending', 'Cancelled') DEFAULT 'Pending'")
-            ],
-            "customers": [
-                ("user_id", "INT"),
-                ("FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL")
-            ]
-        }
-
         try:
-            with self.connection.cursor() as cursor:
-                # Create all tables
-                for table_name, ddl in tables.items():
-                    try:
-                        cursor.execute(ddl)
-                        logger.info(f"Table '{table_name}' created/verified")
-                    except Error as err:
-                        if err.errno == errorcode.ER_TABLE_EXISTS_ERROR:
-                            logger.debug(f"Table '{table_name}' exists, checking columns...")
-                            # Add missing columns
-                            if table_name in required_columns:
-                                for column, definition in required_columns[table_name]:
-                                    try:
-                                        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {definition}")
-                                        logger.info(f"Added column '{column}' to '{table_name}'")
-                                    except Error as alter_err:
-                                        if alter_err.errno == errorcode.ER_DUP_FIELDNAME:
-                                            logger.debug(f"Column '{column}' already exists")
-                                        else:
-                                            logger.error(f"Error adding column '{column}': {alter_err}")
-                                            raise
-                        else:
-                            raise
-
-                self.connection.commit()
-                self._create_default_admin()
-
+            self.schema_version = migrate(self.connection)
         except Error as err:
             logger.error(f"Database initialization failed: {err}")
             raise
 
-    def _create_default_admin(self):
-        """Create default admin user if not exists"""
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT 1 FROM users WHERE email = 'admin@example.com'")
-                if not cursor.fetchone():
-                    password_hash = hashlib.sha256("admin123".encode("utf-8")).hexdigest()
-                    cursor.execute(
-                        """
-                        INSERT INTO users 
-                        (full_name, email, password_hash, gender, role)
-                        VALUES (%s, %s, %s, %s, %s)
-                        """,
-                        ("Admin User", "admin@example.com", password_hash, "Male", "admin")
-                    )
-                    self.connection.commit()
-                    logger.info("Default admin user created")
-        except Error as err:
-            logger.error(f"Error creating default admin: {err}")
-
+    @_uses_connection
     def authenticate_user(self, email: str, password: str, user_type: str) -> Optional[Dict]:
         """Authenticate user with role verification and complete data"""
         try:
@@ -305,6 +382,8 @@ class DatabaseManager:
             logger.error(f"Authentication error for {email}: {err}")
             return None
 
+    @_invalidates("users")
+    @_uses_connection
     def register_user(
             self, full_name: str, email: str, password: str, gender: str, role: str = "customer"
     ) -> Tuple[bool, str]:
@@ -351,9 +430,13 @@ class DatabaseManager:
                 return False, "Email already registered"
             return False, "Registration failed"
 
+    @_invalidates("users", "customers", "monthly_rollups")
+    @_uses_connection
     def register_customer(self, full_name: str, email: str, password: str, gender: str) -> Tuple[bool, str]:
         """Register a new customer with automatic customer record creation"""
         try:
+            email = email.strip().lower()
+
             # First register as user
             success, message = self.register_user(full_name, email, password, gender, "customer")
             if not success:
@@ -369,8 +452,7 @@ class DatabaseManager:
 
                 user_id = result[0]
 
-                # Generate customer ID
-                customer_id = f"CUST{user_id:04d}"
+                customer_id = self.generate_customer_id()
 
                 # Check if customers table has user_id column
                 cursor.execute("SHOW COLUMNS FROM customers LIKE 'user_id'")
@@ -391,6 +473,7 @@ class DatabaseManager:
                     """,
                                    (customer_id, full_name, email, "Not specified", "Not specified", "Active"))
 
+                self._rollup_customer(cursor, customer_id, 1)
                 self.connection.commit()
                 return True, "Customer registration successful"
 
@@ -399,6 +482,26 @@ class DatabaseManager:
             self.connection.rollback()
             return False, f"Customer registration failed: {err}"
 
+    @_uses_connection
+    def reset_password(self, email: str, new_password: str) -> Tuple[bool, str]:
+        """Set a new password for the account with ``email``"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE users SET password_hash = %s WHERE email = %s",
+                    (hash_password(new_password), email)
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute("SELECT 1 FROM users WHERE email = %s", (email,))
+                    if not cursor.fetchall():
+                        return False, "Email not found in our system"
+                self.connection.commit()
+                return True, "Password has been reset"
+        except Error as err:
+            logger.error(f"Password reset failed for {email}: {err}")
+            return False, "Database operation failed"
+
+    @_uses_connection
     def _log_auth_action(self, user_id: Optional[int], email: str, action: str) -> None:
         """Log authentication attempts for security monitoring"""
         try:
@@ -414,6 +517,7 @@ class DatabaseManager:
         except Error as err:
             logger.error(f"Failed to log auth action: {err}")
 
+    @_uses_connection
     def get_customer_by_email(self, email: str) -> Optional[Dict]:
         """Get customer details by email"""
         try:
@@ -428,6 +532,7 @@ class DatabaseManager:
             logger.error(f"Error getting customer by email: {err}")
             return None
 
+    @_uses_connection
     def get_customer_total_bookings_cost(self, user_id: int) -> float:
         """Get total bookings cost for specific customer"""
         try:
@@ -443,35 +548,46 @@ class DatabaseManager:
             logger.error(f"Error getting customer bookings cost: {err}")
             return 0.0
         
-    # In db_helper.py, add this method to the DatabaseManager class
-    def generate_reservation_id(self):
-        """Generate a unique reservation ID"""
-        try:
-            if not self.connection or not self.connection.is_connected():
-                self.connect()
+    def _reserve_id_block(self, prefix: str, size: int) -> int:
+        """Atomically claim the next ``size`` sequence values; returns the block's upper bound
 
-            with self.connection.cursor() as cursor:
-                # Option 1: Get the highest numeric ID
-                cursor.execute("SELECT MAX(CAST(SUBSTRING(reservation_id, 5) AS UNSIGNED)) FROM reservations")
-                result = cursor.fetchone()
-                max_id = result[0] if result and result[0] is not None else 0
-
-                # Generate new ID with prefix and increment
-                new_id = f"RES{max_id + 1:05d}"  # Formats as RES00001, RES00002, etc.
+        Runs on a connection of its own in autocommit mode: a claim made from
+        inside a caller's transaction must not be undone by its rollback
+        while the allocator keeps the block, and it never waits on the shared
+        connection's lock or a free pool slot.
+        """
+        with self._id_lock:
+            if self._id_connection is None or not self._id_connection.is_connected():
+                self._id_connection = self._open_connection()
+            with self._id_connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE id_sequences SET next_value = LAST_INSERT_ID(next_value + %s) WHERE name = %s",
+                    (size, prefix)
+                )
+                if cursor.rowcount == 0:
+                    # Prefix not seeded yet; the first terminal to get here creates it
+                    cursor.execute(
+                        """
+                        INSERT INTO id_sequences (name, next_value) VALUES (%s, LAST_INSERT_ID(%s))
+                        ON DUPLICATE KEY UPDATE next_value = LAST_INSERT_ID(next_value + %s)
+                        """,
+                        (prefix, size, size)
+                    )
+                return cursor.lastrowid
 
-                # Verify uniqueness
-                cursor.execute("SELECT COUNT(*) FROM reservations WHERE reservation_id = %s", (new_id,))
-                if cursor.fetchone()[0] > 0:
-                    # If exists (unlikely), use timestamp fallback
-                    new_id = f"RES{int(time.time())}"
+    def generate_reservation_id(self) -> str:
+        """Generate a unique reservation ID (RES00001, RES00002, ...)"""
+        return self.ids.next_id("RES")
 
-                return new_id
+    def generate_customer_id(self) -> str:
+        """Generate a unique customer ID (CUST0001, CUST0002, ...)"""
+        return self.ids.next_id("CUST")
 
-        except Exception as e:
-            logger.error(f"Error generating reservation ID: {str(e)}")
-            # Fallback to timestamp-based ID
-            return f"RES{int(time.time())}"
+    def generate_staff_id(self) -> str:
+        """Generate a unique staff ID (STAFF0001, STAFF0002, ...)"""
+        return self.ids.next_id("STAFF")
 
+    @_uses_connection
     def get_customer_upcoming_reservations_count(self, user_id: int) -> int:
         """Get count of upcoming reservations for customer"""
         try:
@@ -487,6 +603,7 @@ class DatabaseManager:
             logger.error(f"Error getting customer upcoming reservations: {err}")
             return 0
 
+    @_uses_connection
     def get_user_reservations(self, user_id: int) -> List[Dict]:
         """Get all reservations for a user with formatted dates and room types"""
         try:
@@ -500,7 +617,8 @@ class DatabaseManager:
                         checkout_date,
                         CONCAT('$', FORMAT(booking_amount, 2)) AS amount,
                         payment_status,
-                        fulfillment_status AS status
+                        fulfillment_status AS status,
+                        updated_at
                     FROM reservations
                     WHERE user_id = %s
                     ORDER BY checkin_date DESC
@@ -521,14 +639,103 @@ class DatabaseManager:
                         'check_out': check_out,
                         'amount': row['amount'],
                         'payment_status': row['payment_status'],
-                        'status': row['status']
+                        'status': row['status'],
+                        'updated_at': row['updated_at']
                     })
                 return results
 
         except Error as err:
             logger.error(f"Error getting user reservations: {err}")
             return []
+
+    @_cached(CUSTOMER_SUMMARY_TTL, scope=lambda user_id, recent_limit=5: (customer_scope(user_id),))
+    @_uses_connection
+    def get_customer_summary(self, user_id: int, recent_limit: int = 5) -> Dict:
+        """A customer's dashboard figures in one query
+
+        Returns ``total_spent``, ``upcoming_count``, ``past_count`` and the
+        ``recent_limit`` newest bookings (rows shaped like
+        ``get_user_reservations``).  Both halves are read from the
+        (user_id, checkin_date) index, and the result is cached until one of
+        this customer's reservations is written.
+        """
+        summary = {
+            "user_id": user_id,
+            "total_spent": 0.0,
+            "upcoming_count": 0,
+            "past_count": 0,
+            "recent_bookings": []
+        }
+        try:
+            with self.connection.cursor(dictionary=True) as cursor:
+                # One row per recent booking, each carrying the totals; a single
+                # row of NULL booking columns when the customer has none
+                cursor.execute("""
+                    SELECT
+                        totals.total_spent,
+                        totals.upcoming_count,
+                        totals.past_count,
+                        recent.reservation_id,
+                        recent.guest_name,
+                        recent.room_type,
+                        recent.checkin_date,
+                        recent.checkout_date,
+                        recent.booking_amount,
+                        recent.payment_status,
+                        recent.status,
+                        recent.updated_at
+                    FROM (
+                        SELECT
+                            COALESCE(SUM(booking_amount), 0) AS total_spent,
+                            COALESCE(SUM(checkin_date >= CURDATE()), 0) AS upcoming_count,
+                            COALESCE(SUM(checkout_date < CURDATE()), 0) AS past_count
+                        FROM reservations
+                        WHERE user_id = %s
+                    ) totals
+                    LEFT JOIN (
+                        SELECT
+                            reservation_id,
+                            guest_name,
+                            room_type,
+                            checkin_date,
+                            checkout_date,
+                            booking_amount,
+                            payment_status,
+                            fulfillment_status AS status,
+                            updated_at
+                        FROM reservations
+                        WHERE user_id = %s
+                        ORDER BY checkin_date DESC, reservation_id DESC
+                        LIMIT %s
+                    ) recent ON TRUE
+                    ORDER BY recent.checkin_date DESC, recent.reservation_id DESC
+                """, (user_id, user_id, recent_limit))
+                rows = cursor.fetchall()
+
+            if rows:
+                summary["total_spent"] = float(rows[0]["total_spent"] or 0)
+                summary["upcoming_count"] = int(rows[0]["upcoming_count"] or 0)
+                summary["past_count"] = int(rows[0]["past_count"] or 0)
+            for row in rows:
+                if row["reservation_id"] is None:
+                    continue
+                summary["recent_bookings"].append({
+                    'reservation_id': row['reservation_id'],
+                    'guest_name': row['guest_name'],
+                    'room_type': row['room_type'],
+                    'check_in': row['checkin_date'].strftime('%b %d, %Y') if row['checkin_date'] else '',
+                    'check_out': row['checkout_date'].strftime('%b %d, %Y') if row['checkout_date'] else '',
+                    'amount': f"${float(row['booking_amount'] or 0):,.2f}",
+                    'payment_status': row['payment_status'],
+                    'status': row['status'],
+                    'updated_at': row['updated_at']
+                })
+            return summary
+        except Error as err:
+            logger.error(f"Error getting summary for user {user_id}: {err}")
+            return summary
     
+    @_uses_connection
     def get_staff_by_email(self, email: str) -> Optional[Dict]:
         """Get complete staff member details by email"""
         try:
@@ -550,6 +757,8 @@ class DatabaseManager:
             logger.error(f"Error getting staff by email: {err}")
             return None
 
+    @_cached(30, "reservations")
+    @_uses_connection
     def get_total_bookings_cost(self) -> float:
         """Get the total cost of all bookings"""
         try:
@@ -561,6 +770,8 @@ class DatabaseManager:
             logger.error(f"Error getting total bookings cost: {err}")
             return 0.0
 
+    @_cached(30, "reservations")
+    @_uses_connection
     def get_total_reservations(self) -> int:
         """Get the total number of reservations"""
         try:
@@ -571,6 +782,8 @@ class DatabaseManager:
             logger.error(f"Error getting total reservations: {err}")
             return 0
 
+    @_cached(30, "customers")
+    @_uses_connection
     def get_active_customers_count(self) -> int:
         """Get count of active customers"""
         try:
@@ -581,6 +794,8 @@ class DatabaseManager:
             logger.error(f"Error getting active customers count: {err}")
             return 0
 
+    @_cached(30, "customers")
+    @_uses_connection
     def get_total_customers(self) -> int:
         """Get total count of all customers (active and inactive)"""
         try:
@@ -591,6 +806,8 @@ class DatabaseManager:
             logger.error(f"Error getting total customers count: {err}")
             return 0
 
+    @_cached(30, "reservations")
+    @_uses_connection
     def get_pending_reservations_count(self) -> int:
         """Get count of pending reservations"""
         try:
@@ -605,6 +822,8 @@ class DatabaseManager:
             logger.error(f"Error getting pending reservations count: {err}")
             return 0
 
+    @_cached(30, "customers")
+    @_uses_connection
     def get_recent_customers(self, limit: int = 5) -> List[Dict]:
         """Get recent customers with detailed information"""
         try:
@@ -626,26 +845,435 @@ class DatabaseManager:
             logger.error(f"Error fetching recent customers: {err}")
             return []
 
+    def _lock_reservation(self, cursor, reservation_id: str) -> Optional[Dict]:
+        """Take the row lock up front so concurrent edits queue instead of deadlocking
+
+        Returns the locked row (None if it does not exist).
+        """
+        cursor.execute(
+            f"SELECT {', '.join(RESERVATION_ROW_COLUMNS)} FROM reservations "
+            "WHERE reservation_id = %s FOR UPDATE",
+            (reservation_id,)
+        )
+        rows = cursor.fetchall()
+        return dict(zip(RESERVATION_ROW_COLUMNS, rows[0])) if rows else None
+
+    def invalidate_customer(self, user_id: Optional[int]) -> None:
+        """Drop cached per-customer reads for ``user_id`` (call after its reservations change)"""
+        if user_id is not None:
+            self.cache.invalidate((customer_scope(user_id),))
+
+    # ----- room availability -----
+
+    @property
+    def availability(self) -> AvailabilityEngine:
+        """In-memory availability engine, loaded from rooms and reservations on first use
+
+        Loading happens outside ``_availability_lock`` so it never waits on a
+        connection held by a writer that is waiting for the engine.  A write
+        that races the first load is picked up again from the change feed.
+        """
+        engine = self._availability
+        if engine is not None:
+            return engine
+        engine = AvailabilityEngine()
+        self._load_availability(engine)
+        with self._availability_lock:
+            if self._availability is None:
+                self._availability = engine
+            return self._availability
+
+    @_uses_connection
+    def _load_availability(self, engine: AvailabilityEngine) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT room_number, room_type FROM rooms WHERE status = 'Active'")
+            rooms = cursor.fetchall()
+            cursor.execute("""
+                SELECT reservation_id, room_number, checkin_date, checkout_date
+                FROM reservations
+                WHERE room_number IS NOT NULL AND fulfillment_status <> 'Cancelled'
+            """)
+            bookings = cursor.fetchall()
+        rejected = engine.load(rooms, bookings)
+        logger.info(f"Availability loaded: {len(rooms)} rooms, {len(bookings) - len(rejected)} bookings")
+
+    def load_availability(self) -> bool:
+        """Warm the availability engine (meant for a background worker after login)"""
+        try:
+            return self.availability is not None
+        except Error as err:
+            logger.error(f"Error loading room availability: {err}")
+            return False
+
+    def check_availability(self, room_type: str, checkin, checkout,
+                           exclude: Optional[str] = None) -> Optional[List[str]]:
+        """Free rooms of ``room_type`` for the stay, ignoring reservation ``exclude``
+
+        Answered from memory once the engine is loaded.  Returns None when
+        availability could not be loaded; the write itself still checks.
+        """
+        try:
+            return self.availability.free_rooms(room_type, checkin, checkout, ignore=exclude)
+        except Error as err:
+            logger.error(f"Error checking availability: {err}")
+            return None
+
+    @_uses_connection
+    def get_rooms(self) -> List[Dict]:
+        """Room inventory with type and status"""
+        try:
+            with self.connection.cursor(dictionary=True) as cursor:
+                cursor.execute("SELECT room_number, room_type, status FROM rooms ORDER BY room_number")
+                return cursor.fetchall()
+        except Error as err:
+            logger.error(f"Error getting rooms: {err}")
+            return []
+
+    def _assign_room(self, cursor, room_type: str, checkin, checkout, reservation_id: str,
+                     preferred: Optional[str] = None) -> Optional[str]:
+        """Pick and lock a free room for the stay, or None if the type is full
+
+        Candidates come from the engine; each is confirmed against the table
+        while holding the room's row lock, so two terminals booking the same
+        room queue up and the second one moves on to the next room.
+        """
+        checkin, checkout = as_date(checkin), as_date(checkout)
+        candidates = self.availability.free_rooms(room_type, checkin, checkout, ignore=reservation_id)
+        if preferred in candidates:
+            candidates.remove(preferred)
+            candidates.insert(0, preferred)
+
+        for room_number in candidates:
+            cursor.execute(
+                "SELECT room_number FROM rooms WHERE room_number = %s AND status = 'Active' FOR UPDATE",
+                (room_number,)
+            )
+            if not cursor.fetchall():
+                continue
+            # Locking read: sees rows committed after this transaction's snapshot
+            cursor.execute(
+                """
+                SELECT reservation_id FROM reservations
+                WHERE room_number = %s AND reservation_id <> %s
+                AND fulfillment_status <> 'Cancelled'
+                AND checkin_date < %s AND checkout_date > %s
+                LIMIT 1 LOCK IN SHARE MODE
+                """,
+                (room_number, reservation_id, checkout, checkin)
+            )
+            if cursor.fetchall():
+                # Booked from another terminal since the engine last heard of it
+                self._reload_room(room_number)
+                continue
+            cursor.execute(
+                """
+                SELECT hold_id FROM room_holds
+                WHERE room_number = %s AND reservation_id <> %s AND expires_at > NOW()
+                AND checkin_date < %s AND checkout_date > %s
+                LIMIT 1
+                """,
+                (room_number, reservation_id, checkout, checkin)
+            )
+            if not cursor.fetchall():
+                return room_number
+        return None
+
+    @_uses_connection
+    def hold_room(self, room_type: str, checkin, checkout, reservation_id: str, holder: Optional[str] = None,
+                  preferred: Optional[str] = None, ttl_seconds: int = HOLD_TTL_SECONDS) -> Optional[Dict]:
+        """Claim a free room of ``room_type`` for ``ttl_seconds``; None if the type is full
+
+        The room's row lock is held only for this short transaction; after it
+        commits, other terminals see the hold and skip the room until it is
+        confirmed, released or expires.  Deadlocks and lock timeouts are
+        retried up to HOLD_RETRIES times.
+        """
+        for attempt in range(HOLD_RETRIES):
+            try:
+                with self._transaction(), self.connection.cursor() as cursor:
+                    room_number = self._assign_room(cursor, room_type, checkin, checkout, reservation_id, preferred)
+                    if room_number is None:
+                        return None
+                    cursor.execute(
+                        """
+                        INSERT INTO room_holds
+                        (room_number, reservation_id, checkin_date, checkout_date, holder, expires_at)
+                        VALUES (%s, %s, %s, %s, %s, NOW() + INTERVAL %s SECOND)
+                        """,
+                        (room_number, reservation_id, as_date(checkin), as_date(checkout), holder, ttl_seconds)
+                    )
+                    hold_id = cursor.lastrowid
+                return {
+                    "hold_id": hold_id,
+                    "room_number": room_number,
+                    "reservation_id": reservation_id,
+                    "checkin_date": as_date(checkin),
+                    "checkout_date": as_date(checkout),
+                }
+            except Error as err:
+                if err.errno in RETRYABLE_LOCK_ERRORS and attempt + 1 < HOLD_RETRIES:
+                    logger.info(f"Room hold for {reservation_id} hit a lock conflict; retrying")
+                    time.sleep(0.05 * (attempt + 1))
+                    continue
+                logger.error(f"Error holding a {room_type} room: {err}")
+                return None
+        return None
+
+    @_uses_connection
+    def release_hold(self, hold_id: int) -> bool:
+        """Give a held room back before its hold expires"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("DELETE FROM room_holds WHERE hold_id = %s", (hold_id,))
+                return cursor.rowcount > 0
+        except Error as err:
+            logger.error(f"Error releasing room hold {hold_id}: {err}")
+            return False
+
+    @_uses_connection
+    def expire_room_holds(self) -> int:
+        """Delete holds past their expiry (run periodically); returns how many went"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("DELETE FROM room_holds WHERE expires_at <= NOW()")
+                if cursor.rowcount:
+                    logger.info(f"Expired {cursor.rowcount} stale room holds")
+                return cursor.rowcount
+        except Error as err:
+            logger.error(f"Error expiring room holds: {err}")
+            return 0
+
+    @_uses_connection
+    def _reload_room(self, room_number: str) -> None:
+        """Re-read one room's active stays into the engine"""
+        engine = self._availability
+        if engine is None or engine.room_type(room_number) is None:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT reservation_id, checkin_date, checkout_date FROM reservations
+                WHERE room_number = %s AND fulfillment_status <> 'Cancelled'
+                """,
+                (room_number,)
+            )
+            engine.replace_room(room_number, cursor.fetchall())
+
+    def _track_booking(self, reservation_id: str, room_number: Optional[str], checkin, checkout,
+                       fulfillment_status: Optional[str]) -> None:
+        """Mirror one committed reservation into the engine (if it is loaded)"""
+        engine = self._availability
+        if engine is None:
+            return
+        if room_number is None or fulfillment_status == "Cancelled" or engine.room_type(room_number) is None:
+            engine.release(reservation_id)
+            return
+        try:
+            engine.book(reservation_id, room_number, checkin, checkout)
+        except (RoomUnavailable, ValueError) as e:
+            logger.warning(f"Availability for room {room_number} out of date ({e}); reloading it")
+            try:
+                self._reload_room(room_number)
+            except Error as err:
+                logger.error(f"Error reloading room {room_number}: {err}")
+
+    @_uses_connection
+    def sync_availability(self, reservation_ids: Iterable[str] = (), deleted_ids: Iterable[str] = ()) -> None:
+        """Apply reservation changes seen on the change feed to the engine"""
+        engine = self._availability
+        if engine is None:
+            return  # Loads current data on first use
+        for reservation_id in deleted_ids:
+            engine.release(reservation_id)
+        reservation_ids = list(reservation_ids)
+        if not reservation_ids:
+            return
+        try:
+            with self.connection.cursor() as cursor:
+                placeholders = ", ".join(["%s"] * len(reservation_ids))
+                cursor.execute(
+                    f"""
+                    SELECT reservation_id, room_number, checkin_date, checkout_date, fulfillment_status
+                    FROM reservations WHERE reservation_id IN ({placeholders})
+                    """,
+                    reservation_ids
+                )
+                rows = cursor.fetchall()
+            found = set()
+            for row in rows:
+                found.add(row[0])
+                self._track_booking(*row)
+            for reservation_id in set(reservation_ids) - found:
+                engine.release(reservation_id)
+        except Error as err:
+            logger.error(f"Error syncing room availability: {err}")
+
+    def _rollup_reservation(self, cursor, reservation_id: str, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one reservation's share of monthly_rollups"""
+        cursor.execute(
+            """
+            INSERT INTO monthly_rollups (month, room_type, revenue, bookings, cancellations)
+            SELECT
+                DATE_FORMAT(created_at, '%Y-%m-01'),
+                room_type,
+                %s * IF(fulfillment_status <> 'Cancelled'
+                        AND payment_status NOT IN ('Cancelled', 'Pending'), booking_amount, 0),
+                %s,
+                %s * (fulfillment_status = 'Cancelled')
+            FROM reservations
+            WHERE reservation_id = %s
+            ON DUPLICATE KEY UPDATE
+                revenue = revenue + VALUES(revenue),
+                bookings = bookings + VALUES(bookings),
+                cancellations = cancellations + VALUES(cancellations)
+            """,
+            (sign, sign, sign, reservation_id)
+        )
+
+    def _rollup_customer(self, cursor, customer_id: str, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one customer from monthly_rollups"""
+        cursor.execute(
+            """
+            INSERT INTO monthly_rollups (month, room_type, new_customers)
+            SELECT DATE_FORMAT(created_at, '%Y-%m-01'), '', %s
+            FROM customers
+            WHERE customer_id = %s
+            ON DUPLICATE KEY UPDATE new_customers = new_customers + VALUES(new_customers)
+            """,
+            (sign, customer_id)
+        )
+
+    @_invalidates("monthly_rollups")
+    @_uses_connection
+    def rebuild_monthly_rollups(self) -> bool:
+        """Recompute monthly_rollups from scratch from reservations and customers"""
+        try:
+            with self._transaction(), self.connection.cursor() as cursor:
+                cursor.execute("DELETE FROM monthly_rollups")
+                cursor.execute(REBUILD_RESERVATION_ROLLUPS)
+                cursor.execute(REBUILD_CUSTOMER_ROLLUPS)
+            logger.info("Monthly rollups rebuilt")
+            return True
+        except Error as err:
+            logger.error(f"Error rebuilding monthly rollups: {err}")
+            return False
+
+    @_uses_connection
+    def rebuild_occupancy(self, start=None, end=None) -> bool:
+        """Recompute room_occupancy for the nights in [start, end) from reservations
+
+        Without dates the whole table is replaced, covering every night that
+        has a booking.  Rooms per type come from the rooms inventory.
+        """
+        from occupancy import occupancy_matrix, occupancy_rows  # NumPy loads on first use
+
+        try:
+            with self._transaction(), self.connection.cursor() as cursor:
+                if start is None or end is None:
+                    cursor.execute("""
+                        SELECT MIN(checkin_date), MAX(checkout_date)
+                        FROM reservations WHERE fulfillment_status <> 'Cancelled'
+                    """)
+                    start, end = cursor.fetchone()
+                    cursor.execute("DELETE FROM room_occupancy")
+                    if start is None:
+                        return True
+                else:
+                    start, end = as_date(start), as_date(end)
+                    cursor.execute("DELETE FROM room_occupancy WHERE date >= %s AND date < %s", (start, end))
+
+                cursor.execute("SELECT room_type, COUNT(*) FROM rooms WHERE status = 'Active' GROUP BY room_type")
+                capacity = dict(cursor.fetchall())
+                cursor.execute(
+                    """
+                    SELECT room_type, checkin_date, checkout_date FROM reservations
+                    WHERE fulfillment_status <> 'Cancelled' AND checkin_date < %s AND checkout_date > %s
+                    """,
+                    (end, start)
+                )
+                stays = cursor.fetchall()
+
+                room_types = sorted(set(capacity) | {room_type for room_type, _, _ in stays})
+                rows = occupancy_rows(occupancy_matrix(stays, room_types, start, end), room_types, start, capacity)
+                if rows:
+                    cursor.executemany(
+                        "INSERT INTO room_occupancy (date, room_type, occupied_rooms, total_rooms) "
+                        "VALUES (%s, %s, %s, %s)",
+                        rows
+                    )
+            logger.debug(f"Occupancy rebuilt from {start} to {end} ({len(rows)} rows)")
+            return True
+        except Error as err:
+            logger.error(f"Error rebuilding occupancy: {err}")
+            return False
+
+    def _refresh_occupancy(self, *stays) -> None:
+        """Rebuild room_occupancy over just the nights of ``stays`` ((check-in, check-out) pairs)"""
+        spans = sorted((as_date(a), as_date(b)) for a, b in stays if a is not None and b is not None)
+        merged: List[List] = []
+        for start, end in spans:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        try:
+            for start, end in merged:
+                if start < end:
+                    self.rebuild_occupancy(start, end)
+        except ImportError as e:
+            logger.warning(f"room_occupancy not updated: {e}")
+
+    @staticmethod
+    def _rollup_series_query(column: str, months: int, room_type: Optional[str] = None) -> Tuple[str, list]:
+        """SQL and params for per-month totals of one monthly_rollups column, oldest first"""
+        start_month = (datetime.now() - timedelta(days=30 * months)).replace(day=1).date()
+        query = f"""
+            SELECT month, DATE_FORMAT(month, '%b') AS month_label, SUM({column}) AS total
+            FROM monthly_rollups
+            WHERE month >= %s
+        """
+        params = [start_month]
+        if room_type is not None:
+            query += " AND room_type = %s"
+            params.append(room_type)
+        query += " GROUP BY month ORDER BY month ASC"
+        return query, params
+
+    def _rollup_series(self, column: str, months: int, room_type: Optional[str] = None) -> List[Dict]:
+        """Per-month totals of one monthly_rollups column, oldest first"""
+        query, params = self._rollup_series_query(column, months, room_type)
+        with self.connection.cursor(dictionary=True) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    @staticmethod
+    def _revenue_by_month(results: List[Dict], months: int) -> Dict[str, float]:
+        """Revenue per month label, with every month in the window present"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=30 * months)
+
+        # Initialize dictionary with all recent months as 0.0
+        all_months = {}
+        month_iter = start_date.replace(day=1)
+        while month_iter <= end_date:
+            month_key = month_iter.strftime('%b')
+            all_months[month_key] = 0.0
+            month_iter += timedelta(days=32)
+            month_iter = month_iter.replace(day=1)
+
+        for row in results:
+            all_months[row['month_label']] = float(row['total'])
+
+        return all_months
+
+    @_cached(60, "monthly_rollups")
+    @_uses_connection
     def get_customer_growth(self, months: int = 6) -> Dict[str, int]:
         """Get customer growth data for the last N months"""
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30 * months)
-
-            query = """
-                SELECT 
-                    DATE_FORMAT(created_at, '%Y-%m') AS month_group,
-                    DATE_FORMAT(created_at, '%b') AS month,
-                    COUNT(*) AS new_customers
-                FROM customers
-                WHERE created_at BETWEEN %s AND %s
-                GROUP BY month_group, month
-                ORDER BY month_group ASC
-            """
-
-            with self.connection.cursor(dictionary=True) as cursor:
-                cursor.execute(query, (start_date, end_date))
-                results = cursor.fetchall()
+            results = self._rollup_series("new_customers", months, room_type="")
 
             # Fill in missing months with 0 values
             all_months = {}
@@ -657,113 +1285,91 @@ class DatabaseManager:
 
             # Update with actual data
             for row in results:
-                all_months[row['month']] = int(row['new_customers'])
+                all_months[row['month_label']] = int(row['total'])
 
             return all_months
         except Error as err:
             logger.error(f"Error fetching customer growth data: {err}")
             return {}
 
-    # def get_revenue_trends(self, months: int = 6) -> Dict[str, float]:
-    #     """Get revenue trends for the last N months"""
-    #     try:
-    #         end_date = datetime.now()
-    #         start_date = end_date - timedelta(days=30 * months)
-
-    #         query = """
-    #             SELECT 
-    #                 DATE_FORMAT(transaction_date, '%Y-%m') AS month_group,
-    #                 DATE_FORMAT(transaction_date, '%b') AS month,
-    #                 SUM(amount) AS revenue
-    #             FROM transactions
-    #             WHERE transaction_date BETWEEN %s AND %s
-    #             GROUP BY month_group, month
-    #             ORDER BY month_group ASC
-    #         """
-
-    #         with self.connection.cursor(dictionary=True) as cursor:
-    #             cursor.execute(query, (start_date, end_date))
-    #             results = cursor.fetchall()
-
-    #         # Fill in missing months
-    #         all_months = {}
-    #         current_date = start_date
-    #         while current_date <= end_date:
-    #             month_key = current_date.strftime('%b')
-    #             all_months[month_key] = 0.0
-    #             current_date += timedelta(days=30)
-
-    #         for row in results:
-    #             all_months[row['month']] = float(row['revenue'])
-
-    #         return all_months
-    #     except Error as err:
-    #         logger.error(f"Error getting revenue trends: {err}")
-    #         return {}
-
+    @_cached(60, "monthly_rollups")
+    @_uses_connection
     def get_revenue_trends(self, months: int = 6) -> Dict[str, float]:
         """Get monthly booking_amount from reservations (excluding Cancelled/Pending)"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30 * months)
-
-            query = """
-                SELECT 
-                    created_at,
-                    booking_amount
-                FROM reservations
-                WHERE created_at BETWEEN %s AND %s
-                AND LOWER(fulfillment_status) != 'cancelled'
-                AND LOWER(payment_status) NOT IN ('cancelled', 'pending')
-            """
-
-            with self.connection.cursor(dictionary=True) as cursor:
-                cursor.execute(query, (start_date, end_date))
-                results = cursor.fetchall()
-
-            # Initialize dictionary with all recent months as 0.0
-            all_months = {}
-            month_iter = start_date.replace(day=1)
-            while month_iter <= end_date:
-                month_key = month_iter.strftime('%b')
-                all_months[month_key] = 0.0
-                month_iter += timedelta(days=32)
-                month_iter = month_iter.replace(day=1)
-
-            # Group and sum revenue per month using Python
-            for row in results:
-                created_at = row['created_at']
-                amount = float(row['booking_amount'])
-                month_key = created_at.strftime('%b')
-                all_months[month_key] += amount
-
-            return all_months
-
+            return self._revenue_by_month(self._rollup_series("revenue", months), months)
         except Error as err:
             logger.error(f"Error getting revenue trends from reservations: {err}")
             return {}
 
-    
+    @_cached(30, "reservations", "customers", "monthly_rollups")
+    @_uses_connection
+    def get_dashboard_snapshot(self, role: str, months: int = 6, recent_limit: int = 10) -> Dict:
+        """Everything a dashboard shows, fetched in one multi-statement round trip
+
+        Returns the role's KPI counters plus ``revenue_trends`` (month -> revenue)
+        and ``recent_bookings`` (rows shaped like ``get_reservations``).  The
+        three statements go as one ``;``-joined batch, which the pinned
+        mysql-connector (9.2) runs from a plain ``execute``; ``nextset()``
+        steps through the result sets.
+        """
+        if role not in DASHBOARD_KPIS:
+            raise ValueError(f"No dashboard snapshot defined for role '{role}'")
+
+        kpi_query = "SELECT " + ",\n".join(
+            f"({KPI_QUERIES[name]}) AS {name}" for name in DASHBOARD_KPIS[role]
+        )
+        revenue_query, revenue_params = self._rollup_series_query("revenue", months)
+        recent_query = """
+            SELECT
+                r.reservation_id,
+                r.guest_name,
+                r.room_type,
+                DATE_FORMAT(r.checkin_date, '%Y-%m-%d') AS check_in,
+                DATE_FORMAT(r.checkout_date, '%Y-%m-%d') AS check_out,
+                r.booking_amount AS amount,
+                r.payment_status,
+                r.fulfillment_status AS status,
+                r.updated_at
+            FROM reservations r
+            ORDER BY r.checkin_date DESC
+            LIMIT %s
+        """
+
+        snapshot = {}
+        try:
+            with self.connection.cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    ";\n".join([kpi_query, revenue_query, recent_query]),
+                    [*revenue_params, recent_limit]
+                )
+                kpis = cursor.fetchall()
+                cursor.nextset()
+                revenue_rows = cursor.fetchall()
+                cursor.nextset()
+                recent_rows = cursor.fetchall()
+
+            for name, value in (kpis[0] if kpis else {}).items():
+                snapshot[name] = float(value or 0) if name == "total_bookings_cost" else int(value or 0)
+            snapshot["revenue_trends"] = self._revenue_by_month(revenue_rows, months)
+            snapshot["recent_bookings"] = recent_rows
+            return snapshot
+        except Error as err:
+            logger.error(f"Error getting {role} dashboard snapshot: {err}")
+            return {
+                **{name: 0 for name in DASHBOARD_KPIS[role]},
+                "revenue_trends": {},
+                "recent_bookings": []
+            }
+
+    @_cached(60, "monthly_rollups")
+    @_uses_connection
     def get_booking_trends(self, months: int = 6) -> Dict[str, int]:
         """Get booking trends for the last N months"""
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30 * months)
-
-            query = """
-                SELECT 
-                    DATE_FORMAT(created_at, '%Y-%m') AS month_group,
-                    DATE_FORMAT(created_at, '%b') AS month,
-                    COUNT(*) AS bookings
-                FROM reservations
-                WHERE created_at BETWEEN %s AND %s
-                GROUP BY month_group, month
-                ORDER BY month_group ASC
-            """
-
-            with self.connection.cursor(dictionary=True) as cursor:
-                cursor.execute(query, (start_date, end_date))
-                results = cursor.fetchall()
+            results = self._rollup_series("bookings", months)
 
             # Fill in missing months
             all_months = {}
@@ -774,13 +1380,60 @@ class DatabaseManager:
                 current_date += timedelta(days=30)
 
             for row in results:
-                all_months[row['month']] = int(row['bookings'])
+                all_months[row['month_label']] = int(row['total'])
 
             return all_months
         except Error as err:
             logger.error(f"Error getting booking trends: {err}")
             return {}
 
+    def _fetch_page(
+            self,
+            query: str,
+            conditions: List[str],
+            params: list,
+            sorts: Dict[str, str],
+            sort: str,
+            key: str,
+            descending: bool,
+            after: Optional[Tuple],
+            limit: int
+    ) -> Dict:
+        """Run ``query`` as one keyset page ordered by (sort, key)
+
+        ``after`` is the ``next_cursor`` of the previous page, i.e. the
+        (sort value, key) of its last row.  One extra row is fetched to tell
+        whether another page follows.
+        """
+        if sort not in sorts:
+            raise ValueError(f"Unknown sort column '{sort}'")
+        sort_column, key_column = sorts[sort], sorts[key]
+        conditions, params = list(conditions), list(params)
+
+        if after is not None:
+            op = "<" if descending else ">"
+            conditions.append(
+                f"({sort_column} {op} %s OR ({sort_column} = %s AND {key_column} {op} %s))"
+            )
+            params += [after[0], after[0], after[1]]
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        direction = "DESC" if descending else "ASC"
+        query += f" ORDER BY {sort_column} {direction}, {key_column} {direction} LIMIT %s"
+        params.append(limit + 1)
+
+        with self.connection.cursor(dictionary=True) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][sort], rows[-1][key])
+        return {"rows": rows, "next_cursor": next_cursor}
+
+    @_uses_connection
     def get_customers(self, status_filter: str = "all") -> List[Dict]:
         """Get customers with optional status filter"""
         try:
@@ -804,6 +1457,35 @@ class DatabaseManager:
             logger.error(f"Error fetching customers: {err}")
             return []
 
+    @_uses_connection
+    def get_customers_page(
+            self,
+            status_filter: str = "all",
+            search: str = "",
+            sort: str = "full_name",
+            descending: bool = False,
+            after: Optional[Tuple] = None,
+            limit: int = 50
+    ) -> Dict:
+        """One keyset page of customers as ``{"rows": [...], "next_cursor": ...}``"""
+        conditions, params = [], []
+        if status_filter.lower() != "all":
+            conditions.append("status = %s")
+            params.append(status_filter.capitalize())
+        if search:
+            conditions.append("(full_name LIKE %s OR email LIKE %s OR address LIKE %s OR phone LIKE %s)")
+            params += [f"%{search}%"] * 4
+
+        try:
+            return self._fetch_page(
+                "SELECT customer_id, full_name, email, address, phone, status, updated_at FROM customers",
+                conditions, params, CUSTOMER_SORTS, sort, "customer_id", descending, after, limit
+            )
+        except Error as err:
+            logger.error(f"Error fetching customers page: {err}")
+            return {"rows": [], "next_cursor": None}
+
+    @_uses_connection
     def search_customers(self, search_query: str) -> List[Dict]:
         """Search customers by name, email, address or phone"""
         try:
@@ -828,10 +1510,12 @@ class DatabaseManager:
             logger.error(f"Error searching customers: {err}")
             return []
 
+    @_invalidates("customers", "monthly_rollups")
+    @_uses_connection
     def add_customer(self, customer_data: Dict) -> bool:
         """Add a new customer to the database"""
         try:
-            with self.connection.cursor() as cursor:
+            with self._transaction(), self.connection.cursor() as cursor:
                 cursor.execute(
                     """
                     INSERT INTO customers 
@@ -847,13 +1531,15 @@ class DatabaseManager:
                         customer_data["status"]
                     )
                 )
-                self.connection.commit()
+                self._rollup_customer(cursor, customer_data["customer_id"], 1)
                 return True
         except Error as err:
             logger.error(f"Error adding customer: {err}")
             self.connection.rollback()
             return False
 
+    @_invalidates("customers")
+    @_uses_connection
     def update_customer(self, customer_id: str, updated_data: Dict) -> bool:
         """Update an existing customer"""
         try:
@@ -891,21 +1577,24 @@ class DatabaseManager:
             self.connection.rollback()
             return False
 
+    @_invalidates("customers", "monthly_rollups")
+    @_uses_connection
     def delete_customer(self, customer_id: str) -> bool:
         """Delete a customer from the database"""
         try:
-            with self.connection.cursor() as cursor:
+            with self._transaction(), self.connection.cursor() as cursor:
+                self._rollup_customer(cursor, customer_id, -1)
                 cursor.execute(
                     "DELETE FROM customers WHERE customer_id = %s",
                     (customer_id,)
                 )
-                self.connection.commit()
                 return cursor.rowcount > 0
         except Error as err:
             logger.error(f"Error deleting customer: {err}")
             self.connection.rollback()
             return False
 
+    @_uses_connection
     def get_reservations(self, status_filter: str = "all") -> List[Dict]:
         """Get reservations with optional status filter"""
         try:
@@ -939,10 +1628,90 @@ class DatabaseManager:
             logger.error(f"Error fetching reservations: {err}")
             return []
 
-    def create_reservation(self, reservation_data: Dict) -> bool:
-        """Create a new reservation with proper customer_id handling"""
+    @_uses_connection
+    def get_reservations_page(
+            self,
+            status_filter: str = "all",
+            search: str = "",
+            sort: str = "check_in",
+            descending: bool = True,
+            after: Optional[Tuple] = None,
+            limit: int = 50
+    ) -> Dict:
+        """One keyset page of reservations (same row shape as get_reservations)"""
+        query = """
+            SELECT 
+                r.reservation_id,
+                r.guest_name AS guest_name,
+                r.room_type,
+                DATE_FORMAT(r.checkin_date, '%Y-%m-%d') AS check_in,
+                DATE_FORMAT(r.checkout_date, '%Y-%m-%d') AS check_out,
+                r.booking_amount AS amount,
+                r.payment_status,
+                r.fulfillment_status AS status,
+                COALESCE(c.full_name, 'N/A') AS customer_name,
+                r.version
+            FROM reservations r
+            LEFT JOIN customers c ON r.customer_id = c.customer_id
+        """
+        conditions, params = [], []
+        if status_filter.lower() != "all":
+            conditions.append("r.fulfillment_status = %s")
+            params.append(status_filter.capitalize())
+        if search:
+            conditions.append(
+                "(r.reservation_id LIKE %s OR r.guest_name LIKE %s "
+                "OR DATE_FORMAT(r.checkin_date, '%Y-%m-%d') LIKE %s OR r.payment_status LIKE %s)"
+            )
+            params += [f"%{search}%"] * 4
+
         try:
-            with self.connection.cursor() as cursor:
+            return self._fetch_page(
+                query, conditions, params, RESERVATION_SORTS, sort, "reservation_id", descending, after, limit
+            )
+        except Error as err:
+            logger.error(f"Error fetching reservations page: {err}")
+            return {"rows": [], "next_cursor": None}
+
+    @_invalidates("reservations", "monthly_rollups")
+    @_uses_connection
+    def create_reservation(self, reservation_data: Dict) -> Tuple[bool, str]:
+        """Create a new reservation with proper customer_id handling; returns (success, message)"""
+        inserted, message = self._book_reservation(reservation_data)
+        return inserted is not None, message
+
+    def _book_reservation(self, reservation_data: Dict) -> Tuple[Optional[int], str]:
+        """Hold a room, then write the reservation and consume the hold
+
+        Cancelled bookings need no room and skip the hold.  Returns the
+        insert's lastrowid (None if no room was free or the write failed)
+        and a message saying what happened.
+        """
+        reservation_id = reservation_data["reservation_id"]
+        room_type = reservation_data.get("room_type", "Single")
+        status = reservation_data.get("fulfillment_status", "Pending")
+        checkin, checkout = reservation_data.get("checkin_date"), reservation_data.get("checkout_date")
+
+        hold = None
+        if status != "Cancelled":
+            hold = self.hold_room(room_type, checkin, checkout, reservation_id, holder=HOLD_OWNER,
+                                  preferred=reservation_data.get("room_number"))
+            if hold is None:
+                logger.warning(f"No {room_type} room free for reservation {reservation_id}")
+                return None, f"No {room_type} room available for these dates"
+
+        try:
+            with self._transaction(), self.connection.cursor() as cursor:
+                if hold is not None:
+                    # Consuming the hold under its row lock; an expired one may already be someone else's room
+                    cursor.execute(
+                        "DELETE FROM room_holds WHERE hold_id = %s AND expires_at > NOW()",
+                        (hold["hold_id"],)
+                    )
+                    if cursor.rowcount == 0:
+                        logger.warning(f"Room hold for reservation {reservation_id} expired before confirmation")
+                        return None, "The room could not be kept for this booking; please try again"
+
                 # Get customer_id from user_id if not provided
                 if 'customer_id' not in reservation_data and 'user_id' in reservation_data:
                     cursor.execute("SELECT customer_id FROM customers WHERE user_id = %s",
@@ -954,29 +1723,40 @@ class DatabaseManager:
                 cursor.execute(
                     """
                     INSERT INTO reservations 
-                    (reservation_id, user_id, customer_id, guest_name, room_type,
+                    (reservation_id, user_id, customer_id, guest_name, room_type, room_number,
                      checkin_date, checkout_date, booking_amount, 
                      payment_status, fulfillment_status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """,
                     (
-                        reservation_data["reservation_id"],
+                        reservation_id,
                         reservation_data.get("user_id"),
                         reservation_data.get("customer_id"),
                         reservation_data["guest_name"],
-                        reservation_data.get("room_type", "Single"),
-                        reservation_data["checkin_date"],
-                        reservation_data["checkout_date"],
+                        room_type,
+                        hold["room_number"] if hold else None,
+                        checkin,
+                        checkout,
                         float(reservation_data.get("booking_amount", 0)),
                         reservation_data.get("payment_status", "Pending"),
-                        reservation_data.get("fulfillment_status", "Pending"),
+                        status,
                     ),
                 )
-                return True
+                self._rollup_reservation(cursor, reservation_id, 1)
+                inserted = cursor.lastrowid
         except Error as err:
             logger.error(f"Error creating reservation: {err}")
-            return False
+            if hold is not None:
+                self.release_hold(hold["hold_id"])
+            return None, "Database operation failed"
+
+        # After the commit, so a concurrent summary read cannot re-cache the old figures
+        self.invalidate_customer(reservation_data.get("user_id"))
+        self._track_booking(reservation_id, hold["room_number"] if hold else None, checkin, checkout, status)
+        self._refresh_occupancy((checkin, checkout))
+        return inserted, "Reservation created"
 
+    @_uses_connection
     def get_reservation_by_id(self, reservation_id: str) -> Optional[Dict]:
         """Get a specific reservation by ID with all details"""
         try:
@@ -1001,6 +1781,7 @@ class DatabaseManager:
             logger.error(f"Error getting reservation {reservation_id}: {err}")
             return None
 
+    @_uses_connection
     def get_reservations_by_user(self, user_id: int) -> List[Dict]:
         """Get all reservations for a specific user with formatted dates"""
         try:
@@ -1023,13 +1804,100 @@ class DatabaseManager:
             logger.error(f"Error getting reservations for user {user_id}: {err}")
             return []
 
-    def update_reservation(self, reservation_id: str, updated_data: Dict) -> bool:
-        """Update an existing reservation"""
+    @_uses_connection
+    def get_reservation_grid_rows(self, reservation_ids: Optional[List[str]] = None) -> List[Tuple]:
+        """Staff reservation grid rows, all or only ``reservation_ids``
+
+        Each tuple is the eight display columns followed by the row version.
+        """
+        if reservation_ids is not None and not reservation_ids:
+            return []
+        query = """
+            SELECT 
+                reservation_id as id,
+                guest_name as name,
+                room_type,
+                DATE_FORMAT(checkin_date, '%b %d, %Y') as checkin,
+                DATE_FORMAT(checkout_date, '%b %d, %Y') as checkout,
+                CONCAT('$', FORMAT(booking_amount, 2)) as amount,
+                payment_status,
+                fulfillment_status,
+                version
+            FROM reservations
+        """
+        params = ()
+        if reservation_ids is not None:
+            query += f" WHERE reservation_id IN ({', '.join(['%s'] * len(reservation_ids))})"
+            params = tuple(reservation_ids)
+        query += " ORDER BY checkin_date DESC"
         try:
             with self.connection.cursor() as cursor:
-                query = "UPDATE reservations SET "
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        except Error as err:
+            logger.error(f"Error fetching reservation rows: {err}")
+            return []
+
+    def update_reservation(self, reservation_id: str, updated_data: Dict,
+                           expected_version: Optional[int] = None) -> bool:
+        """Update an existing reservation"""
+        status, _ = self.update_reservation_checked(reservation_id, updated_data, expected_version)
+        return status == "updated"
+
+    @_invalidates("reservations", "monthly_rollups")
+    @_uses_connection
+    def update_reservation_checked(self, reservation_id: str, updated_data: Dict,
+                                   expected_version: Optional[int] = None) -> Tuple[str, Optional[Dict]]:
+        """Update a reservation if nobody else has changed it since ``expected_version``
+
+        Returns ``(status, row)``:
+
+        - ``"updated"``: ``row`` is the reservation as saved, with its new version
+        - ``"conflict"``: the version moved on; ``row`` is the current row to merge with
+        - ``"missing"``, ``"unavailable"`` (no room free for new dates/type) or ``"error"``: ``row`` is None
+
+        The version is checked under the row lock, so the check and the write
+        are a single call with no separate read first.  Without
+        ``expected_version`` the last writer wins, as before.
+        """
+        try:
+            with self._transaction(), self.connection.cursor() as cursor:
+                current = self._lock_reservation(cursor, reservation_id)
+                if current is None:
+                    return "missing", None
+                if expected_version is not None and current["version"] != expected_version:
+                    logger.info(
+                        f"Reservation {reservation_id} changed since version {expected_version} "
+                        f"(now {current['version']})"
+                    )
+                    return "conflict", current
+
+                query = "UPDATE reservations SET version = version + 1, "
                 params = []
 
+                room_number = current["room_number"]
+                room_type = updated_data.get("room_type", current["room_type"])
+                checkin = as_date(updated_data.get("checkin_date", current["checkin_date"]))
+                checkout = as_date(updated_data.get("checkout_date", current["checkout_date"]))
+                status = updated_data.get("fulfillment_status", current["fulfillment_status"])
+                moved = (room_type, checkin, checkout) != (
+                    current["room_type"], current["checkin_date"], current["checkout_date"]
+                )
+                if status != "Cancelled" and (moved or current["fulfillment_status"] == "Cancelled"):
+                    # Nothing is written yet, so returning here leaves the row untouched
+                    room_number = self._assign_room(
+                        cursor, room_type, checkin, checkout, reservation_id,
+                        preferred=room_number if room_type == current["room_type"] else None
+                    )
+                    if room_number is None:
+                        logger.warning(f"No {room_type} room free for reservation {reservation_id}")
+                        return "unavailable", None
+                    query += "room_number = %s, "
+                    params.append(room_number)
+
+                # Back out the old contribution to the monthly rollups first
+                self._rollup_reservation(cursor, reservation_id, -1)
+
                 if 'guest_name' in updated_data:
                     query += "guest_name = %s, "
                     params.append(updated_data['guest_name'])
@@ -1059,15 +1927,32 @@ class DatabaseManager:
                 params.append(reservation_id)
 
                 cursor.execute(query, params)
-                return cursor.rowcount > 0
+                self._rollup_reservation(cursor, reservation_id, 1)
+
+            saved = {
+                **current,
+                **{k: v for k, v in updated_data.items() if k in RESERVATION_ROW_COLUMNS},
+                "room_number": room_number,
+                "checkin_date": checkin,
+                "checkout_date": checkout,
+                "version": current["version"] + 1,
+            }
+            self.invalidate_customer(current["user_id"])
+            self._track_booking(reservation_id, room_number, checkin, checkout, status)
+            self._refresh_occupancy((current["checkin_date"], current["checkout_date"]), (checkin, checkout))
+            return "updated", saved
         except Error as err:
             logger.error(f"Error updating reservation: {err}")
-            return False
+            return "error", None
 
+    @_invalidates("reservations", "monthly_rollups")
+    @_uses_connection
     def delete_reservation(self, reservation_id: str) -> bool:
         """Delete a reservation from the database"""
         try:
-            with self.connection.cursor() as cursor:
+            with self._transaction(), self.connection.cursor() as cursor:
+                current = self._lock_reservation(cursor, reservation_id)
+                self._rollup_reservation(cursor, reservation_id, -1)
                 cursor.execute(
                     """
                     DELETE FROM reservations 
@@ -1075,11 +1960,17 @@ class DatabaseManager:
                     """,
                     (reservation_id,),
                 )
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+            if current is not None:
+                self.invalidate_customer(current["user_id"])
+                self._track_booking(reservation_id, None, None, None, None)
+                self._refresh_occupancy((current["checkin_date"], current["checkout_date"]))
+            return deleted
         except Error as err:
             logger.error(f"Error deleting reservation: {err}")
             return False
 
+    @_uses_connection
     def get_staff_members(self, status="all"):
         """Get staff members filtered by status"""
         query = """
@@ -1102,6 +1993,38 @@ class DatabaseManager:
             logger.error(f"Error fetching staff members: {err}")
             return []
 
+    @_uses_connection
+    def get_staff_members_page(
+            self,
+            status: str = "all",
+            search: str = "",
+            sort: str = "full_name",
+            descending: bool = False,
+            after: Optional[Tuple] = None,
+            limit: int = 50
+    ) -> Dict:
+        """One keyset page of staff members as ``{"rows": [...], "next_cursor": ...}``"""
+        query = """
+            SELECT staff_id, full_name, email, phone, address, status, updated_at,
+                   (SELECT gender FROM users WHERE email = staff.email) as gender
+            FROM staff
+        """
+        conditions, params = [], []
+        if status.lower() != "all":
+            conditions.append("status = %s")
+            params.append(status.capitalize())
+        if search:
+            conditions.append("(staff_id LIKE %s OR full_name LIKE %s OR email LIKE %s OR phone LIKE %s)")
+            params += [f"%{search}%"] * 4
+
+        try:
+            return self._fetch_page(query, conditions, params, STAFF_SORTS, sort, "staff_id", descending, after, limit)
+        except Error as err:
+            logger.error(f"Error fetching staff page: {err}")
+            return {"rows": [], "next_cursor": None}
+
+    @_invalidates("staff")
+    @_uses_connection
     def add_staff_member(self, staff_data):
         """Add a new staff member with complete validation"""
         try:
@@ -1158,6 +2081,7 @@ class DatabaseManager:
                 return False, "Staff ID or email already exists"
             return False, "Failed to add staff member"
 
+    @_uses_connection
     def search_staff_members(self, search_query):
         """Search staff members by name, email or staff ID"""
         query = """
@@ -1178,6 +2102,8 @@ class DatabaseManager:
             logger.error(f"Error searching staff members: {err}")
             return []
 
+    @_invalidates("staff")
+    @_uses_connection
     def update_staff_member(self, staff_id, updated_data):
         """Update staff member details"""
         try:
@@ -1239,6 +2165,8 @@ class DatabaseManager:
             self.connection.rollback()
             return False
 
+    @_invalidates("staff")
+    @_uses_connection
     def delete_staff_member(self, staff_id):
         """Delete a staff member and associated user"""
         try:
@@ -1264,53 +2192,386 @@ class DatabaseManager:
             self.connection.rollback()
             return False
 
+    @_invalidates("reservations", "monthly_rollups")
+    @_uses_connection
     def add_reservation(self, reservation_data: Dict) -> Optional[int]:
         """Add a new reservation to the database with proper date handling"""
+        booking = {key: value for key, value in reservation_data.items() if key != "customer_id"}
+        booking["reservation_id"] = self.generate_reservation_id()
+        booking.setdefault("guest_name", "Guest")
+        booking.setdefault("room_type", "Single")
+        return self._book_reservation(booking)[0]
+
+    # ----- bulk import -----
+
+    def _new_ids(self, prefix: str, count: int) -> List[str]:
+        """``count`` fresh prefixed IDs claimed from the sequence in one round trip"""
+        if count == 0:
+            return []
+        high = self._reserve_id_block(prefix, count)
+        digits = ID_FORMATS[prefix][0]
+        return [f"{prefix}{value:0{digits}d}" for value in range(high - count + 1, high + 1)]
+
+    @staticmethod
+    def _insert_rows(cursor, query: str, params: List[Tuple]) -> Dict[int, str]:
+        """executemany ``params``, falling back to one row at a time if the batch is rejected
+
+        A failed statement is rolled back on its own, so rows already written
+        in the transaction stand.  Returns {index in params: error} for the
+        rows that could not be written.
+        """
         try:
-            with self.connection.cursor() as cursor:
-                # Generate reservation ID
+            cursor.executemany(query, params)
+            return {}
+        except Error as err:
+            if err.errno in RETRYABLE_LOCK_ERRORS:
+                raise
+            logger.warning(f"Batch insert rejected ({err}); inserting row by row")
+
+        failed = {}
+        for i, row in enumerate(params):
+            try:
+                cursor.execute(query, row)
+            except Error as err:
+                if err.errno in RETRYABLE_LOCK_ERRORS:
+                    raise
+                failed[i] = err.msg
+        return failed
+
+    def _plan_rooms(self, cursor, stays: Dict[int, Tuple[str, date, date, Optional[str]]]) -> Dict[int, str]:
+        """Lock the rooms of the stays' types and give each stay (type, in, out, preferred) a free one
+
+        The room rows are locked like _assign_room locks them, so interactive
+        bookings of these types wait for the import to commit.  Existing stays
+        and unexpired holds are read once for the whole batch's date span.
+        Stays that find no room are left out of the result.
+        """
+        if not stays:
+            return {}
+        types = sorted({room_type for room_type, _, _, _ in stays.values()})
+        cursor.execute(
+            f"""
+            SELECT room_number, room_type FROM rooms
+            WHERE room_type IN ({", ".join(["%s"] * len(types))}) AND status = 'Active'
+            ORDER BY room_number FOR UPDATE
+            """,
+            types
+        )
+        rooms = cursor.fetchall()
+        if not rooms:
+            return {}
+
+        numbers = [room_number for room_number, _ in rooms]
+        marks = ", ".join(["%s"] * len(numbers))
+        span = (max(s[2] for s in stays.values()), min(s[1] for s in stays.values()))
+        cursor.execute(
+            f"""
+            SELECT reservation_id, room_number, checkin_date, checkout_date FROM reservations
+            WHERE room_number IN ({marks}) AND fulfillment_status <> 'Cancelled'
+            AND checkin_date < %s AND checkout_date > %s
+            LOCK IN SHARE MODE
+            """,
+            (*numbers, *span)
+        )
+        taken = cursor.fetchall()
+        cursor.execute(
+            f"""
+            SELECT CONCAT('hold:', hold_id), room_number, checkin_date, checkout_date FROM room_holds
+            WHERE room_number IN ({marks}) AND expires_at > NOW()
+            AND checkin_date < %s AND checkout_date > %s
+            LOCK IN SHARE MODE
+            """,
+            (*numbers, *span)
+        )
+        taken += cursor.fetchall()
+
+        planner = AvailabilityEngine()
+        planner.load(rooms, taken)
+        assigned = {}
+        for key, (room_type, checkin, checkout, preferred) in sorted(stays.items(), key=lambda s: (s[1][1], s[0])):
+            if preferred and planner.room_type(preferred) == room_type and planner.is_free(preferred, checkin, checkout):
+                room_number = preferred
+            else:
+                free = planner.free_rooms(room_type, checkin, checkout)
+                if not free:
+                    continue
+                room_number = free[0]
+            planner.book(f"import:{key}", room_number, checkin, checkout)
+            assigned[key] = room_number
+        return assigned
+
+    @_invalidates("reservations", "monthly_rollups")
+    @_uses_connection
+    def import_reservations(self, rows: List[Dict]) -> Dict[int, str]:
+        """Insert a batch of rows from bulk_import.normalize_reservation in one transaction
+
+        One query resolves every user's customer_id (and rejects unknown
+        users), one finds reservation ids that already exist, rooms are
+        planned for the whole batch, and the rows go in with executemany.
+        Returns {index in rows: error} for the rows that were not imported.
+        """
+        errors: Dict[int, str] = {}
+        given_ids = {}
+        for i, row in enumerate(rows):
+            reservation_id = row.get("reservation_id")
+            if reservation_id in given_ids:
+                errors[i] = f"Reservation {reservation_id} appears twice in the batch"
+            elif reservation_id:
+                given_ids[reservation_id] = i
+        if len(errors) == len(rows):
+            return errors
+
+        try:
+            new_ids = iter(self._new_ids("RES", sum(1 for row in rows if not row.get("reservation_id"))))
+            ids = [row.get("reservation_id") or next(new_ids) for row in rows]
+            now = datetime.now()
+
+            with self._transaction(), self.connection.cursor() as cursor:
+                user_ids = sorted({row["user_id"] for row in rows})
                 cursor.execute(
-                    "SELECT IFNULL(MAX(CAST(SUBSTRING(reservation_id, 5) AS UNSIGNED)), 0) FROM reservations")
-                max_id = cursor.fetchone()[0]
-                reservation_id = f"RES{max_id + 1:05d}"
+                    f"""
+                    SELECT u.user_id, MIN(c.customer_id) FROM users u
+                    LEFT JOIN customers c ON c.user_id = u.user_id
+                    WHERE u.user_id IN ({", ".join(["%s"] * len(user_ids))})
+                    GROUP BY u.user_id
+                    """,
+                    user_ids
+                )
+                customers = dict(cursor.fetchall())
+                existing = set()
+                if given_ids:
+                    cursor.execute(
+                        f"SELECT reservation_id FROM reservations "
+                        f"WHERE reservation_id IN ({', '.join(['%s'] * len(given_ids))})",
+                        list(given_ids)
+                    )
+                    existing = {reservation_id for reservation_id, in cursor.fetchall()}
+
+                stays = {}
+                for i, row in enumerate(rows):
+                    if i in errors:
+                        continue
+                    if row["user_id"] not in customers:
+                        errors[i] = f"Unknown user_id {row['user_id']}"
+                    elif ids[i] in existing:
+                        errors[i] = f"Reservation {ids[i]} already exists"
+                    elif row["fulfillment_status"] != "Cancelled":
+                        stays[i] = (row["room_type"], row["checkin_date"], row["checkout_date"],
+                                    row.get("room_number"))
+                rooms = self._plan_rooms(cursor, stays)
+                for i in stays:
+                    if i not in rooms:
+                        errors[i] = f"No {rows[i]['room_type']} room free for the stay"
+
+                batch = [i for i in range(len(rows)) if i not in errors]
+                failed = self._insert_rows(
+                    cursor,
+                    """
+                    INSERT INTO reservations
+                    (reservation_id, user_id, customer_id, guest_name, room_type, room_number,
+                     checkin_date, checkout_date, booking_amount, payment_status, fulfillment_status, created_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    [
+                        (
+                            ids[i], rows[i]["user_id"], rows[i].get("customer_id") or customers[rows[i]["user_id"]],
+                            rows[i]["guest_name"], rows[i]["room_type"], rooms.get(i),
+                            rows[i]["checkin_date"], rows[i]["checkout_date"], rows[i]["booking_amount"],
+                            rows[i]["payment_status"], rows[i]["fulfillment_status"], rows[i].get("created_at") or now,
+                        )
+                        for i in batch
+                    ]
+                )
+                for position, message in failed.items():
+                    errors[batch[position]] = message
+                written = [i for i in batch if i not in errors]
 
-                # Get customer_id from user_id if available
-                customer_id = None
-                if 'user_id' in reservation_data:
-                    cursor.execute("SELECT customer_id FROM customers WHERE user_id = %s",
-                                   (reservation_data['user_id'],))
-                    result = cursor.fetchone()
-                    if result:
-                        customer_id = result[0]
+                if written:
+                    cursor.execute(
+                        f"""
+                        INSERT INTO monthly_rollups (month, room_type, revenue, bookings, cancellations)
+                        SELECT
+                            DATE_FORMAT(created_at, '%Y-%m-01') AS month,
+                            room_type,
+                            SUM(IF(fulfillment_status <> 'Cancelled'
+                                   AND payment_status NOT IN ('Cancelled', 'Pending'), booking_amount, 0)),
+                            COUNT(*),
+                            SUM(fulfillment_status = 'Cancelled')
+                        FROM reservations
+                        WHERE reservation_id IN ({", ".join(["%s"] * len(written))})
+                        GROUP BY month, room_type
+                        ON DUPLICATE KEY UPDATE
+                            revenue = revenue + VALUES(revenue),
+                            bookings = bookings + VALUES(bookings),
+                            cancellations = cancellations + VALUES(cancellations)
+                        """,
+                        [ids[i] for i in written]
+                    )
+        except (Error, RuntimeError) as err:
+            # RuntimeError: no connection could be opened to claim new ids
+            logger.error(f"Error importing reservations: {err}")
+            return {i: errors.get(i, str(err)) for i in range(len(rows))}
+
+        for user_id in {rows[i]["user_id"] for i in written}:
+            self.invalidate_customer(user_id)
+        for i in written:
+            self._track_booking(ids[i], rooms.get(i), rows[i]["checkin_date"], rows[i]["checkout_date"],
+                                rows[i]["fulfillment_status"])
+        self._refresh_occupancy(*((rows[i]["checkin_date"], rows[i]["checkout_date"]) for i in written if i in rooms))
+        logger.info(f"Imported {len(written)} of {len(rows)} reservations")
+        return errors
+
+    @_invalidates("customers", "monthly_rollups")
+    @_uses_connection
+    def import_customers(self, rows: List[Dict]) -> Dict[int, str]:
+        """Insert a batch of rows from bulk_import.normalize_customer in one transaction
+
+        One query finds emails and ids that are already taken and one links
+        rows without a user_id to the user account with the same email.
+        Returns {index in rows: error} for the rows that were not imported.
+        """
+        errors: Dict[int, str] = {}
+        emails, given_ids = set(), set()
+        for i, row in enumerate(rows):
+            if row["email"] in emails:
+                errors[i] = f"Email {row['email']} appears twice in the batch"
+            elif row.get("customer_id") in given_ids:
+                errors[i] = f"Customer {row['customer_id']} appears twice in the batch"
+            emails.add(row["email"])
+            if row.get("customer_id"):
+                given_ids.add(row["customer_id"])
+        if len(errors) == len(rows):
+            return errors
+
+        try:
+            new_ids = iter(self._new_ids("CUST", sum(1 for row in rows if not row.get("customer_id"))))
+            ids = [row.get("customer_id") or next(new_ids) for row in rows]
+            now = datetime.now()
 
+            with self._transaction(), self.connection.cursor() as cursor:
+                email_marks = ", ".join(["%s"] * len(emails))
+                id_marks = ", ".join(["%s"] * len(given_ids)) or "NULL"
                 cursor.execute(
+                    f"SELECT customer_id, email FROM customers "
+                    f"WHERE email IN ({email_marks}) OR customer_id IN ({id_marks})",
+                    (*emails, *given_ids)
+                )
+                taken_ids, taken_emails = set(), set()
+                for customer_id, email in cursor.fetchall():
+                    taken_ids.add(customer_id)
+                    taken_emails.add(email)
+                cursor.execute(f"SELECT email, user_id FROM users WHERE email IN ({email_marks})", tuple(emails))
+                users = dict(cursor.fetchall())
+
+                for i, row in enumerate(rows):
+                    if i in errors:
+                        continue
+                    if row["email"] in taken_emails:
+                        errors[i] = f"A customer with email {row['email']} already exists"
+                    elif ids[i] in taken_ids:
+                        errors[i] = f"Customer {ids[i]} already exists"
+
+                batch = [i for i in range(len(rows)) if i not in errors]
+                failed = self._insert_rows(
+                    cursor,
                     """
-                    INSERT INTO reservations 
-                    (reservation_id, user_id, customer_id, guest_name, room_type,
-                     checkin_date, checkout_date, booking_amount, 
-                     payment_status, fulfillment_status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    INSERT INTO customers
+                    (customer_id, user_id, full_name, email, address, phone, status, created_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                     """,
-                    (
-                        reservation_id,
-                        reservation_data.get("user_id"),
-                        customer_id,
-                        reservation_data.get("guest_name", "Guest"),
-                        reservation_data.get("room_type", "Standard"),
-                        reservation_data.get("checkin_date"),
-                        reservation_data.get("checkout_date"),
-                        float(reservation_data.get("booking_amount", 0)),
-                        reservation_data.get("payment_status", "Pending"),
-                        reservation_data.get("fulfillment_status", "Pending"),
-                    ),
+                    [
+                        (
+                            ids[i], rows[i].get("user_id") or users.get(rows[i]["email"]),
+                            rows[i]["full_name"], rows[i]["email"], rows[i]["address"], rows[i]["phone"],
+                            rows[i]["status"], rows[i].get("created_at") or now,
+                        )
+                        for i in batch
+                    ]
                 )
-                self.connection.commit()
-                return cursor.lastrowid
-        except Error as err:
-            logger.error(f"Error adding reservation: {err}")
-            self.connection.rollback()
+                for position, message in failed.items():
+                    errors[batch[position]] = message
+                written = [i for i in batch if i not in errors]
+
+                if written:
+                    cursor.execute(
+                        f"""
+                        INSERT INTO monthly_rollups (month, room_type, new_customers)
+                        SELECT DATE_FORMAT(created_at, '%Y-%m-01') AS month, '', COUNT(*)
+                        FROM customers
+                        WHERE customer_id IN ({", ".join(["%s"] * len(written))})
+                        GROUP BY month
+                        ON DUPLICATE KEY UPDATE new_customers = new_customers + VALUES(new_customers)
+                        """,
+                        [ids[i] for i in written]
+                    )
+        except (Error, RuntimeError) as err:
+            # RuntimeError: no connection could be opened to claim new ids
+            logger.error(f"Error importing customers: {err}")
+            return {i: errors.get(i, str(err)) for i in range(len(rows))}
+
+        logger.info(f"Imported {len(written)} of {len(rows)} customers")
+        return errors
+
+    # ----- exports -----
+
+    def export_reservation_history(self, writer, chunk_size: int = 5000) -> Optional[int]:
+        """Stream every reservation with its customer to ``writer`` (see history_export)"""
+        return self._stream_query(RESERVATION_HISTORY_QUERY, writer, chunk_size, "reservation history")
+
+    def export_analytics_table(self, table: str, writer, chunk_size: int = 50000) -> Optional[int]:
+        """Stream one of ANALYTICS_EXPORT_QUERIES to ``writer`` (see parquet_export)"""
+        return self._stream_query(ANALYTICS_EXPORT_QUERIES[table], writer, chunk_size, table)
+
+    def _stream_query(self, query: str, writer, chunk_size: int, what: str) -> Optional[int]:
+        """Run ``query`` and hand its rows to ``writer`` in chunks, without ever holding the full result
+
+        ``writer.start(columns)`` gets the column names, then ``writer.write(rows)``
+        each chunk of up to ``chunk_size`` tuples.  The query runs on a
+        connection of its own, in a read-only consistent snapshot, through an
+        unbuffered cursor: rows are read off the socket as they are fetched,
+        so only one chunk is held in memory and the app's own connection
+        stays free.  Returns the number of rows, or None if the export failed.
+        """
+        try:
+            connection = self._open_connection()
+        except RuntimeError as err:
+            logger.error(f"Error exporting {what}: {err}")
             return None
 
+        finished = False
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION net_write_timeout = %s", (EXPORT_NET_WRITE_TIMEOUT,))
+            cursor.close()
+            connection.start_transaction(consistent_snapshot=True, readonly=True)
+
+            cursor = connection.cursor(buffered=False)
+            cursor.execute(query)
+            writer.start(cursor.column_names)
+            total = 0
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                writer.write(rows)
+                total += len(rows)
+            cursor.close()
+            connection.commit()
+            finished = True
+            logger.info(f"Exported {total} rows of {what}")
+            return total
+        except Error as err:
+            logger.error(f"Error exporting {what}: {err}")
+            return None
+        finally:
+            if finished:
+                connection.close()
+            else:
+                # close() would first read the rest of an abandoned result; just drop the socket
+                connection.shutdown()
+
+    @_cached(300, "reservations")
+    @_uses_connection
     def get_room_types(self) -> List[Dict]:
         """Get available room types and their rates"""
         try:
@@ -1340,6 +2601,7 @@ class DatabaseManager:
                 {"type": "Deluxe", "rate": 249, "description": "Premium deluxe room with amenities"}
             ]
 
+    @_uses_connection
     def get_customer_reservations(self, user_id: int) -> List[Dict]:
         """Get all reservations for a specific user with formatted dates"""
         try:
@@ -1362,6 +2624,7 @@ class DatabaseManager:
             logger.error(f"Error getting reservations for user {user_id}: {err}")
             return []
 
+    @_uses_connection
     def get_customer_past_reservations_count(self, user_id: int) -> int:
         """Get count of past reservations for a customer"""
         try:
@@ -1377,9 +2640,66 @@ class DatabaseManager:
             logger.error(f"Error getting past reservations count: {err}")
             return 0
 
+    @_uses_connection
+    def get_change_watermark(self) -> Optional[int]:
+        """Newest change_log id, where a fresh change-feed reader starts"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT COALESCE(MAX(change_id), 0) FROM change_log")
+                return cursor.fetchone()[0]
+        except Error as err:
+            logger.error(f"Error reading change watermark: {err}")
+            return None
+
+    @_uses_connection
+    def get_changes_since(self, change_id: int, limit: int = 1000) -> List[Dict]:
+        """change_log rows with an id above ``change_id``, oldest first"""
+        try:
+            with self.connection.cursor(dictionary=True) as cursor:
+                cursor.execute("""
+                    SELECT change_id, table_name, row_key, op
+                    FROM change_log
+                    WHERE change_id > %s
+                    ORDER BY change_id
+                    LIMIT %s
+                """, (change_id, limit))
+                return cursor.fetchall()
+        except Error as err:
+            logger.error(f"Error reading change log: {err}")
+            return []
+
+    @_uses_connection
+    def prune_change_log(self, retention_hours: int = 24) -> int:
+        """Delete change_log rows older than ``retention_hours``; returns how many"""
+        try:
+            with self._transaction(), self.connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM change_log WHERE changed_at < NOW(6) - INTERVAL %s HOUR",
+                    (retention_hours,)
+                )
+                return cursor.rowcount
+        except Error as err:
+            logger.error(f"Error pruning change log: {err}")
+            return 0
+
 
     def close(self) -> None:
         """Close connection with proper resource cleanup"""
+        with self._id_lock:
+            if self._id_connection is not None and self._id_connection.is_connected():
+                try:
+                    self._id_connection.close()
+                except Error as err:
+                    logger.error(f"Error closing ID connection: {err}")
+            self._id_connection = None
+
+        if self._pool is not None:
+            self.release_connection()
+            self._pool.close()
+            self._pool = None
+            logger.info("Database connection pool closed")
+            return
+
         if self.connection and self.connection.is_connected():
             try:
                 self.connection.close()
@@ -0,0 +1,59 @@
+import threading
+import logging
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# prefix -> (digits, block size)
+ID_FORMATS: Dict[str, Tuple[int, int]] = {
+    "RES": (5, 20),
+    "CUST": (4, 10),
+    "STAFF": (4, 5),
+}
+
+
+class IdAllocator:
+    """Hand out prefixed IDs (RES00042, CUST0007, ...) from in-process hi/lo blocks
+
+    ``reserve_block(prefix, size)`` must atomically advance the shared
+    sequence for ``prefix`` by ``size`` and return the new upper bound; every
+    ID up to and including that bound then belongs to this process.  Blocks
+    are never returned, so IDs from a closed terminal leave gaps rather than
+    duplicates.
+
+    ``reserve_block`` is called without holding the allocator's lock, so it
+    may wait on database locks held by a thread that is itself asking for an
+    ID.  Two threads refilling at once each claim a block; the spare one is
+    queued and used next.
+    """
+
+    def __init__(self, reserve_block: Callable[[str, int], int], formats: Dict[str, Tuple[int, int]] = None):
+        self._reserve_block = reserve_block
+        self._formats = formats or ID_FORMATS
+        # prefix -> claimed blocks as [last issued, upper bound], oldest first
+        self._blocks: Dict[str, List[List[int]]] = {}
+        self._lock = threading.Lock()
+
+    def next_value(self, prefix: str) -> int:
+        """Next numeric value for ``prefix``, refilling the block when exhausted"""
+        if prefix not in self._formats:
+            raise ValueError(f"Unknown ID prefix '{prefix}'")
+
+        while True:
+            with self._lock:
+                blocks = self._blocks.setdefault(prefix, [])
+                while blocks and blocks[0][0] >= blocks[0][1]:
+                    blocks.pop(0)
+                if blocks:
+                    blocks[0][0] += 1
+                    return blocks[0][0]
+
+            block_size = self._formats[prefix][1]
+            high = self._reserve_block(prefix, block_size)
+            logger.debug(f"Reserved {prefix} IDs {high - block_size + 1}-{high}")
+            with self._lock:
+                self._blocks[prefix].append([high - block_size, high])
+
+    def next_id(self, prefix: str) -> str:
+        digits = self._formats[prefix][0] if prefix in self._formats else 0
+        return f"{prefix}{self.next_value(prefix):0{digits}d}"
@@ -0,0 +1,510 @@
+import hashlib
+import logging
+from typing import Callable, List, Tuple, Union
+from mysql.connector import Error, errorcode
+from availability import assign_rooms
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK = "hotel_schema_migration"
+MIGRATION_LOCK_TIMEOUT = 30  # seconds
+
+SCHEMA_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        description VARCHAR(200) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# A step is a SQL string, a (sql, params) tuple, or a callable taking a cursor
+Step = Union[str, Tuple[str, tuple], Callable]
+
+
+# MySQL commits every DDL statement on its own, while schema_version is only
+# written once a whole migration succeeds.  Schema changes are therefore
+# written as the guarded steps below, so re-running a migration that failed
+# halfway skips what the earlier attempt already did.
+
+def _schema_has(cursor, query: str, params: tuple) -> bool:
+    cursor.execute(query, params)
+    return cursor.fetchone()[0] > 0
+
+
+def _has_index(cursor, table: str, name: str) -> bool:
+    return _schema_has(
+        cursor,
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (table, name)
+    )
+
+
+def _create_index(table: str, name: str, columns: str, unique: bool = False) -> Callable:
+    def step(cursor):
+        if not _has_index(cursor, table, name):
+            cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({columns})")
+    return step
+
+
+def _drop_index(table: str, name: str) -> Callable:
+    def step(cursor):
+        if _has_index(cursor, table, name):
+            cursor.execute(f"ALTER TABLE {table} DROP INDEX {name}")
+    return step
+
+
+def _add_column(table: str, column: str, definition: str) -> Callable:
+    def step(cursor):
+        if not _schema_has(
+                cursor,
+                "SELECT COUNT(*) FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+                (table, column)
+        ):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def _add_foreign_key(table: str, name: str, definition: str) -> Callable:
+    def step(cursor):
+        if not _schema_has(
+                cursor,
+                "SELECT COUNT(*) FROM information_schema.table_constraints "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND constraint_name = %s "
+                "AND constraint_type = 'FOREIGN KEY'",
+                (table, name)
+        ):
+            cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY {definition}")
+    return step
+
+
+def _default_admin_step():
+    password_hash = hashlib.sha256("admin123".encode("utf-8")).hexdigest()
+    return (
+        """
+        INSERT INTO users (full_name, email, password_hash, gender, role)
+        SELECT %s, %s, %s, %s, %s
+        FROM DUAL
+        WHERE NOT EXISTS (SELECT 1 FROM users WHERE email = %s)
+        """,
+        ("Admin User", "admin@example.com", password_hash, "Male", "admin", "admin@example.com")
+    )
+
+
+# Tables whose row changes are recorded in change_log, with their key column
+CHANGE_LOG_TABLES = {
+    "reservations": "reservation_id",
+    "customers": "customer_id",
+    "staff": "staff_id",
+}
+
+
+def _change_log_triggers() -> List[str]:
+    """AFTER INSERT/UPDATE/DELETE triggers so every writer (other terminals, raw SQL) is logged
+
+    Each trigger is dropped first so a half-applied run can be repeated.
+    With binary logging on (the MySQL 8 default), creating triggers needs
+    the SUPER privilege or ``log_bin_trust_function_creators = 1`` on the
+    server; without either, migration 6 fails with error 1419.
+    """
+    triggers = []
+    for table, key in CHANGE_LOG_TABLES.items():
+        for op, row in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD")):
+            triggers.append(f"DROP TRIGGER IF EXISTS trg_{table}_{op}_log")
+            triggers.append(
+                f"CREATE TRIGGER trg_{table}_{op}_log AFTER {op.upper()} ON {table} FOR EACH ROW "
+                f"INSERT INTO change_log (table_name, row_key, op) VALUES ('{table}', {row}.{key}, '{op}')"
+            )
+    return triggers
+
+
+# Rooms seeded by migration 8: room type -> (first room number, count)
+ROOM_INVENTORY = {
+    "Single": (101, 10),
+    "Double": (201, 10),
+    "Suite": (301, 5),
+    "Deluxe": (401, 5),
+}
+
+
+def _seed_rooms_step():
+    rows = [
+        (str(first + i), room_type)
+        for room_type, (first, count) in ROOM_INVENTORY.items()
+        for i in range(count)
+    ]
+    placeholders = ", ".join(["(%s, %s)"] * len(rows))
+    return (
+        f"INSERT IGNORE INTO rooms (room_number, room_type) VALUES {placeholders}",
+        tuple(value for row in rows for value in row)
+    )
+
+
+def _assign_existing_reservations(cursor) -> None:
+    """Give every active reservation a room of its type, first come first served"""
+    cursor.execute("SELECT room_number, room_type FROM rooms WHERE status = 'Active'")
+    rooms = cursor.fetchall()
+    cursor.execute("""
+        SELECT reservation_id, room_type, checkin_date, checkout_date
+        FROM reservations
+        WHERE room_number IS NULL AND fulfillment_status <> 'Cancelled'
+        AND checkout_date > checkin_date
+    """)
+    assigned, unplaced = assign_rooms(rooms, cursor.fetchall())
+    if assigned:
+        cursor.executemany(
+            "UPDATE reservations SET room_number = %s WHERE reservation_id = %s",
+            [(room, reservation_id) for reservation_id, room in assigned.items()]
+        )
+    if unplaced:
+        logger.warning(f"{len(unplaced)} overlapping reservations left without a room: {unplaced[:20]}")
+
+
+# Recompute monthly_rollups from raw rows; shared by migration 4 and
+# DatabaseManager.rebuild_monthly_rollups.  Revenue counts paid, non-cancelled
+# bookings, matching the revenue trend chart.
+REBUILD_RESERVATION_ROLLUPS = """
+    INSERT INTO monthly_rollups (month, room_type, revenue, bookings, cancellations)
+    SELECT
+        DATE_FORMAT(created_at, '%Y-%m-01') AS month,
+        room_type,
+        SUM(IF(fulfillment_status <> 'Cancelled'
+               AND payment_status NOT IN ('Cancelled', 'Pending'), booking_amount, 0)),
+        COUNT(*),
+        SUM(fulfillment_status = 'Cancelled')
+    FROM reservations
+    GROUP BY month, room_type
+    ON DUPLICATE KEY UPDATE
+        revenue = VALUES(revenue),
+        bookings = VALUES(bookings),
+        cancellations = VALUES(cancellations)
+"""
+
+REBUILD_CUSTOMER_ROLLUPS = """
+    INSERT INTO monthly_rollups (month, room_type, new_customers)
+    SELECT DATE_FORMAT(created_at, '%Y-%m-01') AS month, '', COUNT(*)
+    FROM customers
+    GROUP BY month
+    ON DUPLICATE KEY UPDATE new_customers = VALUES(new_customers)
+"""
+
+# Ordered list of (version, description, steps).  Never change what a shipped
+# migration does; append a new one instead.  Version 1 uses IF NOT EXISTS so
+# databases created before migrations existed are adopted as-is, and later
+# schema changes use the guarded steps above so they can be re-run.
+MIGRATIONS: List[Tuple[int, str, List[Step]]] = [
+    (1, "Initial schema", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INT AUTO_INCREMENT PRIMARY KEY,
+            full_name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) NOT NULL COLLATE utf8mb4_bin,
+            password_hash VARCHAR(255) NOT NULL,
+            gender ENUM('Male','Female','Other') NOT NULL,
+            role ENUM('admin','staff','customer') NOT NULL DEFAULT 'customer',
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE INDEX idx_email (email)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            session_id VARCHAR(255) PRIMARY KEY,
+            user_id INT NOT NULL,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS auth_logs (
+            log_id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NULL,
+            email VARCHAR(100) NOT NULL,
+            action ENUM('register','login','logout','fail') NOT NULL,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS customers (
+            customer_id VARCHAR(20) PRIMARY KEY,
+            user_id INT,
+            full_name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) NOT NULL COLLATE utf8mb4_bin,
+            address TEXT NOT NULL,
+            phone VARCHAR(20) NOT NULL,
+            status ENUM('Active','Inactive') NOT NULL DEFAULT 'Active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL,
+            UNIQUE INDEX idx_email (email),
+            INDEX idx_status (status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS staff (
+            staff_id VARCHAR(20) PRIMARY KEY,
+            user_id INT,
+            full_name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) NOT NULL COLLATE utf8mb4_bin,
+            phone VARCHAR(20) NOT NULL,
+            address TEXT NOT NULL,
+            status ENUM('Active','Inactive') NOT NULL DEFAULT 'Active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL,
+            UNIQUE INDEX idx_staff_email (email)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS reservations (
+            reservation_id VARCHAR(20) PRIMARY KEY,
+            user_id INT NOT NULL,
+            customer_id VARCHAR(20),
+            guest_name VARCHAR(100) NOT NULL,
+            room_type VARCHAR(50) NOT NULL,
+            checkin_date DATE NOT NULL,
+            checkout_date DATE NOT NULL,
+            booking_amount DECIMAL(10,2) NOT NULL,
+            payment_status ENUM('Paid', 'Pending', 'Cancelled') DEFAULT 'Pending',
+            fulfillment_status ENUM('Confirmed', 'Pending', 'Cancelled') DEFAULT 'Pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (customer_id) REFERENCES customers(customer_id) ON DELETE SET NULL,
+            INDEX idx_reservations_created (created_at),
+            INDEX idx_reservations_user (user_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id INT AUTO_INCREMENT PRIMARY KEY,
+            customer_id VARCHAR(20),
+            reservation_id VARCHAR(20),
+            amount DECIMAL(10,2) NOT NULL,
+            transaction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (customer_id) REFERENCES customers(customer_id) 
+                ON DELETE SET NULL
+                ON UPDATE CASCADE,
+            FOREIGN KEY (reservation_id) REFERENCES reservations(reservation_id)
+                ON DELETE SET NULL
+                ON UPDATE CASCADE,
+            INDEX idx_transactions_date (transaction_date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS room_occupancy (
+            record_id INT AUTO_INCREMENT PRIMARY KEY,
+            date DATE NOT NULL,
+            occupied_rooms INT NOT NULL,
+            total_rooms INT NOT NULL,
+            UNIQUE KEY unique_date (date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS password_recovery_requests (
+            request_id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            username VARCHAR(100) NOT NULL,
+            full_name VARCHAR(100) NOT NULL,
+            request_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+            INDEX idx_recovery_status (status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    ]),
+    (2, "Default admin account", [
+        _default_admin_step()
+    ]),
+    (3, "ID sequences for RES/CUST/STAFF prefixes", [
+        """
+        CREATE TABLE IF NOT EXISTS id_sequences (
+            name VARCHAR(20) PRIMARY KEY,
+            next_value BIGINT UNSIGNED NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        # Seed from existing IDs once; timestamp fallback IDs (10+ digits) are skipped
+        """
+        INSERT IGNORE INTO id_sequences (name, next_value)
+        SELECT 'RES', COALESCE(MAX(CAST(SUBSTRING(reservation_id, 4) AS UNSIGNED)), 0)
+        FROM reservations
+        WHERE reservation_id REGEXP '^RES[0-9]{1,9}$'
+        """,
+        """
+        INSERT IGNORE INTO id_sequences (name, next_value)
+        SELECT 'CUST', COALESCE(MAX(CAST(SUBSTRING(customer_id, 5) AS UNSIGNED)), 0)
+        FROM customers
+        WHERE customer_id REGEXP '^CUST[0-9]{1,9}$'
+        """,
+        """
+        INSERT IGNORE INTO id_sequences (name, next_value)
+        SELECT 'STAFF', COALESCE(MAX(CAST(SUBSTRING(staff_id, 6) AS UNSIGNED)), 0)
+        FROM staff
+        WHERE staff_id REGEXP '^STAFF[0-9]{1,9}$'
+        """
+    ]),
+    (4, "Monthly rollups for trend charts", [
+        """
+        CREATE TABLE IF NOT EXISTS monthly_rollups (
+            month DATE NOT NULL,
+            room_type VARCHAR(50) NOT NULL DEFAULT '',
+            revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+            bookings INT NOT NULL DEFAULT 0,
+            cancellations INT NOT NULL DEFAULT 0,
+            new_customers INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, room_type)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        REBUILD_RESERVATION_ROLLUPS,
+        REBUILD_CUSTOMER_ROLLUPS
+    ]),
+    (5, "Keyset pagination indexes", [
+        _create_index("reservations", "idx_reservations_checkin_key", "checkin_date, reservation_id"),
+        _create_index("reservations", "idx_reservations_status_checkin_key",
+                      "fulfillment_status, checkin_date, reservation_id"),
+        _create_index("customers", "idx_customers_name_key", "full_name, customer_id"),
+        _create_index("customers", "idx_customers_status_name_key", "status, full_name, customer_id"),
+        _create_index("staff", "idx_staff_name_key", "full_name, staff_id"),
+    ]),
+    # Needs SUPER or log_bin_trust_function_creators when binary logging is on
+    (6, "Change log for the change feed", [
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            table_name VARCHAR(64) NOT NULL,
+            row_key VARCHAR(20) NOT NULL,
+            op ENUM('insert', 'update', 'delete') NOT NULL,
+            changed_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+            INDEX idx_change_log_changed_at (changed_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        *_change_log_triggers()
+    ]),
+    (7, "Per-customer summary index", [
+        # Serves both the per-user aggregates and the newest-first recent bookings
+        _create_index("reservations", "idx_reservations_user_checkin", "user_id, checkin_date, reservation_id"),
+    ]),
+    (8, "Room inventory", [
+        """
+        CREATE TABLE IF NOT EXISTS rooms (
+            room_number VARCHAR(10) PRIMARY KEY,
+            room_type VARCHAR(50) NOT NULL,
+            status ENUM('Active', 'Out of Service') DEFAULT 'Active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_rooms_type (room_type)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        _seed_rooms_step(),
+        _add_column("reservations", "room_number", "VARCHAR(10) NULL AFTER room_type"),
+        _create_index("reservations", "idx_reservations_room_stay", "room_number, checkin_date, checkout_date"),
+        _add_foreign_key("reservations", "fk_reservations_room",
+                         "(room_number) REFERENCES rooms (room_number) ON DELETE SET NULL"),
+        _assign_existing_reservations,
+    ]),
+    (9, "Occupancy per room type", [
+        # Existing per-day rows become the 'All' totals next to one row per room type
+        _add_column("room_occupancy", "room_type", "VARCHAR(50) NOT NULL DEFAULT 'All' AFTER date"),
+        _create_index("room_occupancy", "unique_date_type", "date, room_type", unique=True),
+        _drop_index("room_occupancy", "unique_date"),
+    ]),
+    (10, "Short-lived room holds", [
+        """
+        CREATE TABLE IF NOT EXISTS room_holds (
+            hold_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            room_number VARCHAR(10) NOT NULL,
+            reservation_id VARCHAR(20) NOT NULL,
+            checkin_date DATE NOT NULL,
+            checkout_date DATE NOT NULL,
+            holder VARCHAR(100),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL,
+            FOREIGN KEY (room_number) REFERENCES rooms(room_number) ON DELETE CASCADE,
+            INDEX idx_room_holds_stay (room_number, checkin_date, checkout_date),
+            INDEX idx_room_holds_expiry (expires_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+    ]),
+    (11, "Reservation row versions for optimistic edits", [
+        _add_column("reservations", "version", "INT NOT NULL DEFAULT 0"),
+    ]),
+]
+
+HEAD_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(connection) -> int:
+    """Schema version recorded in the database, 0 if migrations never ran"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT MAX(version) FROM schema_version")
+            result = cursor.fetchone()
+            return result[0] or 0
+    except Error as err:
+        if err.errno == errorcode.ER_NO_SUCH_TABLE:
+            return 0
+        raise
+
+
+def migrate(connection, target: int = HEAD_VERSION) -> int:
+    """Apply pending migrations up to ``target``; returns the resulting version
+
+    When the schema is already current this costs a single query.  Otherwise a
+    named lock keeps two terminals from migrating the same database at once.
+    """
+    version = current_version(connection)
+    if version >= target:
+        return version
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+        if not cursor.fetchone()[0]:
+            raise RuntimeError("Timed out waiting for another instance to finish migrating")
+
+        try:
+            cursor.execute(SCHEMA_VERSION_DDL)
+            # Another instance may have migrated while we waited for the lock
+            version = current_version(connection)
+
+            for migration_version, description, steps in MIGRATIONS:
+                if migration_version <= version or migration_version > target:
+                    continue
+
+                logger.info(f"Applying migration {migration_version}: {description}")
+                for step in steps:
+                    _run_step(cursor, step)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (migration_version, description)
+                )
+                connection.commit()
+                version = migration_version
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchone()
+
+    logger.info(f"Database schema at version {version}")
+    return version
+
+
+def _run_step(cursor, step: Step) -> None:
+    if callable(step):
+        step(cursor)
+    elif isinstance(step, tuple):
+        cursor.execute(*step)
+    else:
+        cursor.execute(step)
+
+
+if __name__ == "__main__":
+    from db_helper import DatabaseManager
+
+    with DatabaseManager() as db:
+        print(f"Schema version: {current_version(db.connection)} (head {HEAD_VERSION})")
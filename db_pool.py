@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_POLICIES = ("always", "idle", "never")
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection becomes free within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of MySQL connections
+
+    Connections are opened lazily by ``factory`` up to ``size`` and reused in
+    LIFO order so the warmest connection is handed out first.  The health-check
+    policy decides when a connection is pinged before checkout:
+
+    - ``always``: ping on every checkout
+    - ``idle``: ping only if the connection sat unused for ``idle_timeout`` seconds
+    - ``never``: trust the connection, rely on errors surfacing in the caller
+    """
+
+    def __init__(
+            self,
+            factory: Callable,
+            size: int = 5,
+            checkout_timeout: float = 10.0,
+            health_check: str = "idle",
+            idle_timeout: float = 30.0
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        if health_check not in HEALTH_CHECK_POLICIES:
+            raise ValueError(f"Unknown health check policy '{health_check}'")
+
+        self._factory = factory
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.health_check = health_check
+        self.idle_timeout = idle_timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._closed = False
+
+    def acquire(self, timeout: float = None):
+        """Check out a connection, waiting up to ``timeout`` seconds for a free slot"""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolTimeoutError(
+                f"No database connection available after {timeout:.1f}s "
+                f"({self.size} in use)"
+            )
+
+        try:
+            conn = self._take_idle()
+            if conn is None:
+                conn = self._factory()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._checked_out += 1
+        return conn
+
+    def release(self, conn) -> None:
+        """Return a connection to the pool, discarding it if it is broken"""
+        try:
+            if self._closed or not self._is_reusable(conn):
+                self._discard(conn)
+            else:
+                self._idle.put((conn, time.monotonic()))
+        finally:
+            with self._lock:
+                self._checked_out -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections; checked-out ones are closed on release"""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, int]:
+        """Current pool usage, for logging and diagnostics"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "checked_out": self._checked_out,
+                "idle": self._idle.qsize(),
+            }
+
+    def _take_idle(self):
+        """Pop an idle connection that passes the health-check policy, if any"""
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+
+            if self._is_healthy(conn, last_used):
+                return conn
+            logger.info("Discarding stale pooled database connection")
+            self._discard(conn)
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        if self.health_check == "never":
+            return True
+        if self.health_check == "idle" and time.monotonic() - last_used < self.idle_timeout:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception as err:
+            logger.warning(f"Pooled connection failed health check: {err}")
+            return False
+
+    @staticmethod
+    def _is_reusable(conn) -> bool:
+        try:
+            if getattr(conn, "in_transaction", False):
+                conn.rollback()
+            return True
+        except Exception as err:
+            logger.warning(f"Pooled connection could not be reset: {err}")
+            return False
+
+    @staticmethod
+    def _discard(conn) -> None:
+        try:
+            conn.close()
+        except Exception as err:
+            logger.debug(f"Error closing pooled connection: {err}")
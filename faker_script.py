@@ -5,6 +5,7 @@ import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
+from db_migrations import REBUILD_RESERVATION_ROLLUPS, REBUILD_CUSTOMER_ROLLUPS
 
 # Load environment variables
 load_dotenv()
@@ -119,7 +120,13 @@ def populate_dashboard_data(db):
         """, (current_date.date(), occupied, 100))
         
         current_date += timedelta(days=1)
-    
+
+    # Customers were replaced wholesale, so recompute the trend rollups
+    with db.connection.cursor() as cursor:
+        cursor.execute("DELETE FROM monthly_rollups")
+        cursor.execute(REBUILD_RESERVATION_ROLLUPS)
+        cursor.execute(REBUILD_CUSTOMER_ROLLUPS)
+
     db.connection.commit()
     print("✅ Test data populated successfully")
 
@@ -0,0 +1,100 @@
+"""Full reservation history export: every reservation with its customer, as CSV
+
+    python history_export.py reservations.csv.gz [--chunk-size 5000]
+
+DatabaseManager.export_reservation_history streams the join through an
+unbuffered cursor in fetchmany chunks and HistoryCsvWriter writes each chunk
+as it arrives (gzip-compressed when the name ends in .gz), so memory use does
+not grow with the number of rows.  The Reports page runs the same export on
+a background thread.
+"""
+import argparse
+import csv
+import gzip
+import io
+import os
+import sys
+import time
+from typing import Callable, Optional, Sequence
+
+HISTORY_CHUNK_SIZE = 5000
+
+
+class HistoryCsvWriter:
+    """Write streamed chunks to ``path``; the file only appears once the export completes
+
+    Rows go to ``path + ".part"`` first and are moved into place by
+    ``close(keep=True)``, so a failed or interrupted export never leaves a
+    truncated file under the real name.  ``progress`` is called with the
+    running row count after every chunk.
+    """
+
+    def __init__(self, path: str, compress: Optional[bool] = None,
+                 progress: Optional[Callable[[int], None]] = None):
+        self.path = path
+        self.compress = path.lower().endswith(".gz") if compress is None else compress
+        self.progress = progress
+        self.rows = 0
+        self._part = path + ".part"
+        if self.compress:
+            self._file = io.TextIOWrapper(gzip.open(self._part, "wb"), encoding="utf-8", newline="")
+        else:
+            self._file = open(self._part, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+
+    def start(self, columns: Sequence[str]) -> None:
+        self._writer.writerow(columns)
+
+    def write(self, rows: Sequence[Sequence]) -> None:
+        self._writer.writerows(rows)
+        self.rows += len(rows)
+        if self.progress:
+            self.progress(self.rows)
+
+    def close(self, keep: bool) -> None:
+        self._file.close()
+        if keep:
+            os.replace(self._part, self.path)
+        elif os.path.exists(self._part):
+            os.remove(self._part)
+
+
+def export_history(db, path: str, chunk_size: int = HISTORY_CHUNK_SIZE, compress: Optional[bool] = None,
+                   progress: Optional[Callable[[int], None]] = None) -> Optional[int]:
+    """Export the full reservation history to ``path``; returns the row count, or None on failure"""
+    writer = HistoryCsvWriter(path, compress, progress)
+    count = None
+    try:
+        count = db.export_reservation_history(writer, chunk_size)
+    finally:
+        writer.close(keep=count is not None)
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="output file; a .gz name is gzip-compressed")
+    parser.add_argument("--chunk-size", type=int, default=HISTORY_CHUNK_SIZE, help="rows fetched per round trip")
+    parser.add_argument("--gzip", action="store_true", help="compress even without a .gz name")
+    args = parser.parse_args()
+
+    from db_helper import DatabaseManager
+
+    started = time.perf_counter()
+
+    def progress(rows: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"  {rows:,} rows ({rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)", end="\r", flush=True)
+
+    with DatabaseManager() as db:
+        count = export_history(db, args.path, args.chunk_size, True if args.gzip else None, progress)
+    print()
+    if count is None:
+        print("❌ Export failed; see the log for details")
+        return 1
+    print(f"✅ Exported {count:,} reservations to {args.path} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,4 +2,4 @@ from db_helper import DatabaseManager
 
 if __name__ == "__main__":
     with DatabaseManager() as db:
-        print("✅ Database tables created successfully")
\ No newline at end of file
+        print(f"✅ Database schema at version {db.schema_version}")
\ No newline at end of file
@@ -1,7 +1,6 @@
 import customtkinter as ctk
 import tkinter as tk
-from PIL import Image, ImageTk, ImageFilter
-import os
+from backgrounds import screen_background
 
 
 class HotelBookingSystem(ctk.CTkFrame):
@@ -13,20 +12,9 @@ class HotelBookingSystem(ctk.CTkFrame):
         # Configure window with yellow tinge background
         self.configure(fg_color="#fff8dc")
 
-        # Load the hotel lobby image
+        # Load the hotel lobby image (resized and blurred once, then cached on disk)
         try:
-            # Get the directory of the current script
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-
-            # Path to the hotel lobby image - adjust filename as needed
-            image_path = os.path.join(current_dir, "hotel_lobby.jpg")
-
-            # Load and resize the image
-            self.bg_image = Image.open(image_path)
-            self.bg_image = self.bg_image.resize((2000, 1000), Image.Resampling.LANCZOS)
-
-            # Apply blur effect to the image
-            self.blurred_image = self.bg_image.filter(ImageFilter.GaussianBlur(radius=5))
+            self.blurred_image = screen_background("landing")
 
             # Use CTkImage instead of ImageTk.PhotoImage for better high DPI support
             self.bg_photo = ctk.CTkImage(light_image=self.blurred_image,
@@ -141,6 +129,6 @@ class HotelBookingSystem(ctk.CTkFrame):
 
     def show_login_as(self, user_type):
         """Show login page with specified user type"""
-        login_frame = self.controller.frames["LoginApp"]
+        login_frame = self.controller.get_frame("LoginApp")
         login_frame.set_user_type(user_type)
         self.controller.show_frame("LoginApp")
\ No newline at end of file
@@ -1,5 +1,5 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk, ImageFilter
+from backgrounds import screen_background
 import tkinter.messagebox as messagebox
 import hashlib
 import re
@@ -19,9 +19,7 @@ class LoginApp(ctk.CTkFrame):
 
         # Background Image
         try:
-            bg_image = Image.open("Welcome.jpg")
-            bg_image = bg_image.resize((1920, 1080), Image.LANCZOS)
-            blurred_bg_image = bg_image.filter(ImageFilter.GaussianBlur(radius=5))
+            blurred_bg_image = screen_background("login")
             # Use CTkImage instead of ImageTk.PhotoImage for better high DPI support
             self.bg_photo = ctk.CTkImage(light_image=blurred_bg_image,
                                          dark_image=blurred_bg_image,
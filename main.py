@@ -1,23 +1,51 @@
 import customtkinter as ctk
-from dashboard import HotelBookingDashboard
-from login import LoginApp
-from register import RegistrationApp
-from landing import HotelBookingSystem
-from password_recovery import PasswordRecoveryApp
-from mcustomer import CustomerManagementScreen
-from Report import HotelReportsPage
-from Reservations import HotelReservationsPage
-from staff_member import StaffMemberScreen
-from CustomerDashboard import CustomerDashboard
-from StaffDashboard import StaffDashboard
-from StaffReservationsPage import StaffReservationsPage
-from StaffCustomerManagementScreen import StaffCustomerManagementScreen
-from CustomerReservationPage import CustomerReservationPage
+import importlib
 from db_helper import DatabaseManager
+from db_async import BackgroundQueryExecutor
+from change_feed import ChangeFeed
+from refresh_scheduler import RefreshScheduler
+from backgrounds import prerender_backgrounds
+import threading
 import logging
+import os
+
+# Module defining each frame class (named like the frame).  Page modules pull
+# in matplotlib, tksheet, tkcalendar and fpdf, so they are imported the first
+# time their frame is built rather than before the landing page shows;
+# bench_startup.py keeps them out of the startup import graph.
+FRAME_MODULES = {
+    "HotelBookingSystem": "landing",
+    "LoginApp": "login",
+    "RegistrationApp": "register",
+    "HotelBookingDashboard": "dashboard",
+    "CustomerManagementScreen": "mcustomer",
+    "HotelReportsPage": "Report",
+    "HotelReservationsPage": "Reservations",
+    "StaffMemberScreen": "staff_member",
+    "CustomerDashboard": "CustomerDashboard",
+    "StaffDashboard": "StaffDashboard",
+    "StaffReservationsPage": "StaffReservationsPage",
+    "StaffCustomerManagementScreen": "StaffCustomerManagementScreen",
+    "CustomerReservationPage": "CustomerReservationPage"
+}
+
+# Frames a user typically opens next from each dashboard, built during idle time
+LIKELY_NEXT_FRAMES = {
+    "HotelBookingDashboard": ["HotelReservationsPage", "CustomerManagementScreen", "HotelReportsPage"],
+    "StaffDashboard": ["StaffReservationsPage", "StaffCustomerManagementScreen"],
+    "CustomerDashboard": ["CustomerReservationPage"]
+}
+PREWARM_DELAY_MS = 200
+# How often abandoned room holds (e.g. from a terminal that crashed mid-booking) are expired
+HOLD_SWEEP_MS = 60 * 1000
+# The UI runs pooled by default: with one shared connection every call the Tk
+# thread makes waits behind whatever query a background worker is running.
+# The executor takes all but one of these, which stays free for the Tk thread.
+APP_POOL_SIZE = 4
+
 
 class HotelApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, prewarm=True):
         super().__init__()
         self.title("Hotel Management System")
         self.geometry("1400x900")
@@ -35,7 +63,7 @@ class HotelApp(ctk.CTk):
         retry_delay = 2
         for attempt in range(max_retries):
             try:
-                self.db = DatabaseManager()
+                self.db = DatabaseManager(pool_size=int(os.getenv("DB_POOL_SIZE", str(APP_POOL_SIZE))))
                 self.current_user = None
                 break
             except Exception as e:
@@ -46,54 +74,99 @@ class HotelApp(ctk.CTk):
                 import time
                 time.sleep(retry_delay)
 
+        # Worker pool for database calls so pages never block the Tk main loop
+        self.db_executor = BackgroundQueryExecutor(self, self.db)
+        # Every periodic refresh goes through one scheduler that follows the visible frame
+        self.scheduler = RefreshScheduler(self, self.db_executor)
+        self.scheduler.bind_window()
+        # One change_log poller for all screens; runs while someone is logged in
+        self.change_feed = ChangeFeed(self.db, self.scheduler)
+        # Keep the in-memory room availability in step with bookings made anywhere
+        self.change_feed.subscribe(("reservations",), self.on_reservations_changed)
+        self.scheduler.register(
+            "room_hold_sweeper",
+            self.db.expire_room_holds,
+            interval_ms=HOLD_SWEEP_MS,
+            priority=-10,
+            visible_only=False
+        )
+        self.current_frame_name = None
+
         # Create container frame
         self.container = ctk.CTkFrame(self)
         self.container.pack(side="top", fill="both", expand=True)
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
 
-        # Initialize all frames with error handling
+        # Frames are registered here and only built (and their modules imported) the first time they are shown
         self.frames = {}
-        frames_classes = [
-            ("HotelBookingSystem", HotelBookingSystem),
-            ("LoginApp", LoginApp),
-            ("RegistrationApp", RegistrationApp),
-            ("HotelBookingDashboard", HotelBookingDashboard),
-            ("CustomerManagementScreen", CustomerManagementScreen),
-            ("HotelReportsPage", HotelReportsPage),
-            ("HotelReservationsPage", HotelReservationsPage),
-            ("StaffMemberScreen", StaffMemberScreen),
-            ("CustomerDashboard", CustomerDashboard),
-            ("StaffDashboard", StaffDashboard),
-            ("StaffReservationsPage", StaffReservationsPage),
-            ("StaffCustomerManagementScreen", StaffCustomerManagementScreen),
-            ("CustomerReservationPage", CustomerReservationPage)
-        ]
-
-        for name, FrameClass in frames_classes:
-            try:
-                frame = FrameClass(parent=self.container, controller=self, db=self.db)
-                self.frames[name] = frame
-                frame.grid(row=0, column=0, sticky="nsew")
-                logging.info(f"Successfully initialized frame: {name}")
-            except Exception as e:
-                logging.error(f"Failed to initialize frame {name}: {str(e)}")
-                if name in ["StaffReservationsPage", "StaffCustomerManagementScreen", "StaffPasswordRecoveryPage"]:
-                    # Create placeholder frame if essential staff frames fail
-                    placeholder = ctk.CTkFrame(self.container)
-                    self.frames[name] = placeholder
-                    placeholder.grid(row=0, column=0, sticky="nsew")
-                    logging.warning(f"Created placeholder for {name}")
+        self.frame_modules = FRAME_MODULES
+        self.prewarm = prewarm
+        self._prewarm_queue = []
+
+        # Decode (or render and cache, on first launch) the auth screen backgrounds off the Tk thread
+        threading.Thread(target=prerender_backgrounds, name="prerender-backgrounds", daemon=True).start()
 
         self.show_frame("HotelBookingSystem")
 
+    def get_frame(self, page_name):
+        """Return the frame for page_name, constructing it on first use"""
+        frame = self.frames.get(page_name)
+        if frame is not None:
+            return frame
+
+        module_name = self.frame_modules.get(page_name)
+        if module_name is None:
+            return None
+
+        try:
+            FrameClass = getattr(importlib.import_module(module_name), page_name)
+            frame = FrameClass(parent=self.container, controller=self, db=self.db)
+            logging.info(f"Successfully initialized frame: {page_name}")
+        except Exception as e:
+            logging.error(f"Failed to initialize frame {page_name}: {str(e)}")
+            if page_name not in ["StaffReservationsPage", "StaffCustomerManagementScreen", "StaffPasswordRecoveryPage"]:
+                return None
+            # Create placeholder frame if essential staff frames fail
+            frame = ctk.CTkFrame(self.container)
+            logging.warning(f"Created placeholder for {page_name}")
+
+        self.frames[page_name] = frame
+        frame.grid(row=0, column=0, sticky="nsew")
+        # New frames stack on top; keep them behind the page currently shown
+        frame.lower()
+        return frame
+
+    def prewarm_frames(self, page_names):
+        """Build frames ahead of time, one per idle slot so the UI stays responsive"""
+        if not self.prewarm:
+            return
+        self._prewarm_queue = [name for name in page_names if name not in self.frames]
+        if self._prewarm_queue:
+            self.after(PREWARM_DELAY_MS, self._prewarm_next)
+
+    def _prewarm_next(self):
+        while self._prewarm_queue:
+            page_name = self._prewarm_queue.pop(0)
+            if page_name not in self.frames:
+                self.get_frame(page_name)
+                break
+        if self._prewarm_queue:
+            self.after(PREWARM_DELAY_MS, self._prewarm_next)
+
     def show_frame(self, page_name, user_type=None):
         """Show a frame and update window title"""
-        frame = self.frames.get(page_name)
+        frame = self.get_frame(page_name)
         if not frame:
-            logging.error(f"Frame {page_name} not found in available frames: {list(self.frames.keys())}")
+            logging.error(f"Frame {page_name} not found in available frames: {list(self.frame_modules.keys())}")
             return
 
+        # Drop results still in flight for the page being left
+        previous = self.frames.get(self.current_frame_name)
+        if previous is not None and previous is not frame:
+            self.db_executor.cancel(previous)
+        self.current_frame_name = page_name
+
         frame.tkraise()
 
         # Update window title
@@ -125,6 +198,10 @@ class HotelApp(ctk.CTk):
                 except Exception as e:
                     logging.error(f"Failed to update user display: {e}")
 
+        # Only the frame on screen gets refresh jobs and change-feed events
+        self.scheduler.set_active(frame)
+        self.change_feed.set_active(frame)
+
         # Pass user_type to LoginApp if provided
         if page_name == "LoginApp" and user_type and hasattr(frame, 'set_user_type'):
             frame.set_user_type(user_type)
@@ -133,17 +210,31 @@ class HotelApp(ctk.CTk):
         """Handle post-login operations"""
         try:
             self.current_user = user_data
+            self.change_feed.start()
+            # Load room availability now so the booking dialogs answer from memory
+            self.db_executor.submit(self.db.load_availability)
             self.show_frame(dashboard_name)
+            self.prewarm_frames(LIKELY_NEXT_FRAMES.get(dashboard_name, []))
             logging.info(f"User {user_data.get('email', 'unknown')} logged in successfully")
         except Exception as e:
             logging.error(f"Login failed: {e}")
             self.show_frame("LoginApp")
 
+    def on_reservations_changed(self, event):
+        """Re-read changed reservations into the availability engine on a worker"""
+        self.db_executor.submit(
+            self.db.sync_availability,
+            sorted(event.upserted("reservations")),
+            sorted(event.deleted("reservations")),
+            on_error=lambda e: logging.warning(f"Availability sync failed: {e}")
+        )
+
     def logout(self):
         """Handle logout operation"""
         try:
             username = self.current_user.get('email', 'unknown') if self.current_user else 'unknown'
             self.current_user = None
+            self.change_feed.stop()
             self.show_frame("HotelBookingSystem")
             logging.info(f"User {username} logged out")
         except Exception as e:
@@ -152,6 +243,10 @@ class HotelApp(ctk.CTk):
 
     def __del__(self):
         """Cleanup resources"""
+        if hasattr(self, 'scheduler'):
+            self.scheduler.shutdown()
+        if hasattr(self, 'db_executor'):
+            self.db_executor.shutdown()
         if hasattr(self, 'db'):
             try:
                 self.db.close()
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+
+# room_occupancy.room_type of the per-day row that sums every type
+ALL_ROOM_TYPES = "All"
+
+
+def occupancy_matrix(stays: Iterable[Tuple[str, date, date]], room_types: Sequence[str],
+                     start: date, end: date) -> np.ndarray:
+    """Rooms occupied per night and room type, as a (days, len(room_types)) array
+
+    ``stays`` are (room_type, check-in, check-out); a stay occupies the nights
+    from check-in up to, not including, check-out, and is clipped to
+    [start, end).  Each stay adds +1 at its first night and -1 after its last
+    in a difference array, so the whole calendar is one cumulative sum no
+    matter how long the stays are.  Stays of types not in ``room_types`` are
+    ignored.
+    """
+    days = max((end - start).days, 0)
+    column = {room_type: i for i, room_type in enumerate(room_types)}
+    rows = [(column[t], checkin, checkout) for t, checkin, checkout in stays if t in column]
+
+    diff = np.zeros((days + 1, len(room_types)), dtype=np.int64)
+    if rows and days:
+        types = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        origin = np.datetime64(start, "D")
+        first = np.array([r[1] for r in rows], dtype="datetime64[D]") - origin
+        last = np.array([r[2] for r in rows], dtype="datetime64[D]") - origin
+        first = np.clip(first.astype(np.int64), 0, days)
+        last = np.clip(last.astype(np.int64), 0, days)
+        inside = first < last
+        # add.at, not fancy-index assignment, so stays sharing a day all count
+        np.add.at(diff, (first[inside], types[inside]), 1)
+        np.add.at(diff, (last[inside], types[inside]), -1)
+    return np.cumsum(diff[:-1], axis=0)
+
+
+def occupancy_rows(matrix: np.ndarray, room_types: Sequence[str], start: date,
+                   capacity: Dict[str, int]) -> List[Tuple[date, str, int, int]]:
+    """room_occupancy rows (date, room_type, occupied_rooms, total_rooms) for a matrix
+
+    Every day gets one row per type plus an ALL_ROOM_TYPES row with the totals.
+    """
+    totals = np.array([capacity.get(t, 0) for t in room_types], dtype=np.int64)
+    all_total = int(totals.sum())
+    occupied_all = matrix.sum(axis=1)
+    rows = []
+    for day in range(matrix.shape[0]):
+        current = start + timedelta(days=day)
+        for i, room_type in enumerate(room_types):
+            rows.append((current, room_type, int(matrix[day, i]), int(totals[i])))
+        rows.append((current, ALL_ROOM_TYPES, int(occupied_all[day]), all_total))
+    return rows
@@ -0,0 +1,96 @@
+import customtkinter as ctk
+from typing import Dict, Optional, Tuple
+
+PAGE_SIZE = 50
+
+
+class KeysetPager:
+    """Remembers the keyset cursor of every page visited so far
+
+    Keyset pages can only be fetched forwards, so going back means re-running
+    the query from the cursor that produced the previous page.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start again from the first page (after a filter, search or sort change)"""
+        self._cursors = [None]
+        self.next_cursor = None
+
+    @property
+    def cursor(self) -> Optional[Tuple]:
+        """Cursor to pass as ``after`` when (re)loading the current page"""
+        return self._cursors[-1]
+
+    @property
+    def page_number(self) -> int:
+        return len(self._cursors)
+
+    @property
+    def has_previous(self) -> bool:
+        return len(self._cursors) > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def loaded(self, page: Dict) -> None:
+        """Record the ``next_cursor`` of the page that was just fetched"""
+        self.next_cursor = page.get("next_cursor")
+
+    def advance(self) -> bool:
+        if not self.has_next:
+            return False
+        self._cursors.append(self.next_cursor)
+        self.next_cursor = None
+        return True
+
+    def back(self) -> bool:
+        if not self.has_previous:
+            return False
+        self._cursors.pop()
+        self.next_cursor = None
+        return True
+
+
+class PageControls(ctk.CTkFrame):
+    """Prev / "Page N" / Next strip shown under the list screens"""
+
+    def __init__(self, parent, on_previous, on_next, **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+
+        self.prev_btn = ctk.CTkButton(
+            self,
+            text="‹ Prev",
+            fg_color="#e2e8f0",
+            text_color="#2c3e50",
+            hover_color="#cbd5e1",
+            width=70,
+            height=30,
+            state="disabled",
+            command=on_previous
+        )
+        self.prev_btn.pack(side="left", padx=5)
+
+        self.page_label = ctk.CTkLabel(self, text="Page 1", font=("Arial", 12), text_color="#64748b")
+        self.page_label.pack(side="left", padx=5)
+
+        self.next_btn = ctk.CTkButton(
+            self,
+            text="Next ›",
+            fg_color="#e2e8f0",
+            text_color="#2c3e50",
+            hover_color="#cbd5e1",
+            width=70,
+            height=30,
+            state="disabled",
+            command=on_next
+        )
+        self.next_btn.pack(side="left", padx=5)
+
+    def update_state(self, pager: KeysetPager) -> None:
+        self.page_label.configure(text=f"Page {pager.page_number}")
+        self.prev_btn.configure(state="normal" if pager.has_previous else "disabled")
+        self.next_btn.configure(state="normal" if pager.has_next else "disabled")
@@ -0,0 +1,203 @@
+"""Columnar export of reservations, customers, transactions and occupancy to Parquet
+
+    python parquet_export.py exports/ [--tables reservations customers] [--chunk-size 50000]
+
+Each table becomes a Hive-partitioned dataset, ``<root>/<table>/month=YYYY-MM/``,
+so tools such as DuckDB, pandas or Spark read only the months a query needs.
+Columns are typed: dates as date32, amounts as decimal(10,2), timestamps in
+seconds and statuses and room types dictionary-encoded.  Rows are streamed
+from the database (DatabaseManager.export_analytics_table) in month order and
+written a row group at a time, so memory holds at most one row group.
+"""
+import argparse
+import itertools
+import os
+import shutil
+import sys
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PARTITION_COLUMN = "month"
+ROW_GROUP_SIZE = 64 * 1024
+ANALYTICS_CHUNK_SIZE = 50000
+
+_CATEGORY = pa.dictionary(pa.int8(), pa.string())
+_MONEY = pa.decimal128(10, 2)
+_TIMESTAMP = pa.timestamp("s")
+
+# Column order matches DatabaseManager's ANALYTICS_EXPORT_QUERIES, which add
+# the partition column last
+SCHEMAS: Dict[str, pa.Schema] = {
+    "reservations": pa.schema([
+        ("reservation_id", pa.string()),
+        ("user_id", pa.int32()),
+        ("customer_id", pa.string()),
+        ("guest_name", pa.string()),
+        ("room_type", _CATEGORY),
+        ("room_number", pa.string()),
+        ("checkin_date", pa.date32()),
+        ("checkout_date", pa.date32()),
+        ("booking_amount", _MONEY),
+        ("payment_status", _CATEGORY),
+        ("fulfillment_status", _CATEGORY),
+        ("created_at", _TIMESTAMP),
+        ("updated_at", _TIMESTAMP),
+    ]),
+    "customers": pa.schema([
+        ("customer_id", pa.string()),
+        ("user_id", pa.int32()),
+        ("full_name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("status", _CATEGORY),
+        ("created_at", _TIMESTAMP),
+        ("updated_at", _TIMESTAMP),
+    ]),
+    "transactions": pa.schema([
+        ("transaction_id", pa.int32()),
+        ("customer_id", pa.string()),
+        ("reservation_id", pa.string()),
+        ("amount", _MONEY),
+        ("transaction_date", _TIMESTAMP),
+    ]),
+    "room_occupancy": pa.schema([
+        ("date", pa.date32()),
+        ("room_type", _CATEGORY),
+        ("occupied_rooms", pa.int32()),
+        ("total_rooms", pa.int32()),
+    ]),
+}
+ANALYTICS_TABLES = tuple(SCHEMAS)
+
+
+class PartitionedParquetWriter:
+    """Write one table's streamed chunks as ``<root>/<table>/month=YYYY-MM/part-N.parquet``
+
+    Rows arrive as tuples with the month last.  Rows of the current month
+    are buffered into row groups of ``row_group_size``; when the month
+    changes its file is closed, so with month-ordered input each partition
+    is a single file.  Everything is written under ``<table>.part`` and
+    swapped in by ``close(keep=True)``, so readers never see half an export.
+    """
+
+    def __init__(self, root: str, table: str, row_group_size: int = ROW_GROUP_SIZE,
+                 progress: Optional[Callable[[int], None]] = None):
+        self.schema = SCHEMAS[table]
+        self.path = os.path.join(root, table)
+        self.row_group_size = row_group_size
+        self.progress = progress
+        self.rows = 0
+        self._part = self.path + ".part"
+        shutil.rmtree(self._part, ignore_errors=True)
+        os.makedirs(self._part)
+        self._month = None
+        self._pending = []
+        self._file = None
+        self._files_per_month: Dict[str, int] = {}
+
+    def start(self, columns: Sequence[str]) -> None:
+        expected = self.schema.names + [PARTITION_COLUMN]
+        if list(columns) != expected:
+            raise ValueError(f"Expected columns {expected}, got {list(columns)}")
+
+    def write(self, rows: Sequence[Sequence]) -> None:
+        for month, month_rows in itertools.groupby(rows, key=lambda row: row[-1]):
+            if month != self._month:
+                self._close_month()
+                self._month = month
+            for row in month_rows:
+                self._pending.append(row[:-1])
+                if len(self._pending) >= self.row_group_size:
+                    self._flush()
+        self.rows += len(rows)
+        if self.progress:
+            self.progress(self.rows)
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        columns = list(zip(*self._pending))
+        batch = pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+        if self._file is None:
+            month = self._month if self._month is not None else "__HIVE_DEFAULT_PARTITION__"
+            directory = os.path.join(self._part, f"{PARTITION_COLUMN}={month}")
+            os.makedirs(directory, exist_ok=True)
+            # A month seen again (unordered input) gets another file instead of overwriting
+            number = self._files_per_month.get(month, 0)
+            self._files_per_month[month] = number + 1
+            self._file = pq.ParquetWriter(os.path.join(directory, f"part-{number}.parquet"), self.schema,
+                                          compression="zstd")
+        self._file.write_table(batch)
+        self._pending = []
+
+    def _close_month(self) -> None:
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self, keep: bool) -> None:
+        try:
+            self._close_month()
+        finally:
+            if keep:
+                shutil.rmtree(self.path, ignore_errors=True)
+                os.replace(self._part, self.path)
+            else:
+                shutil.rmtree(self._part, ignore_errors=True)
+
+
+def export_analytics(db, root: str, tables: Iterable[str] = ANALYTICS_TABLES,
+                     chunk_size: int = ANALYTICS_CHUNK_SIZE,
+                     progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, Optional[int]]:
+    """Export ``tables`` under ``root``; returns {table: rows written, or None if it failed}
+
+    ``progress`` is called with the table name and its running row count.
+    A failed table keeps whatever a previous export left in place.
+    """
+    counts = {}
+    for table in tables:
+        writer = PartitionedParquetWriter(
+            root, table, progress=(lambda rows, table=table: progress(table, rows)) if progress else None
+        )
+        count = None
+        try:
+            count = db.export_analytics_table(table, writer, chunk_size)
+        finally:
+            writer.close(keep=count is not None)
+        counts[table] = count
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="directory the datasets are written under")
+    parser.add_argument("--tables", nargs="+", choices=ANALYTICS_TABLES, default=list(ANALYTICS_TABLES))
+    parser.add_argument("--chunk-size", type=int, default=ANALYTICS_CHUNK_SIZE, help="rows fetched per round trip")
+    args = parser.parse_args()
+
+    from db_helper import DatabaseManager
+
+    started = time.perf_counter()
+    with DatabaseManager() as db:
+        counts = export_analytics(
+            db, args.root, args.tables, args.chunk_size,
+            progress=lambda table, rows: print(f"  {table}: {rows:,} rows", end="\r", flush=True)
+        )
+    print()
+    for table, count in counts.items():
+        if count is None:
+            print(f"❌ {table}: failed; see the log")
+        else:
+            print(f"✅ {table}: {count:,} rows")
+    print(f"Finished in {time.perf_counter() - started:.1f}s")
+    return 0 if all(count is not None for count in counts.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
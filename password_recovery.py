@@ -1,8 +1,8 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk, ImageFilter
+from PIL import ImageTk
+from backgrounds import screen_background
 import tkinter.messagebox as messagebox
 import re
-import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,11 +20,7 @@ class PasswordRecoveryApp(ctk.CTkFrame):
 
         # Background Image (Blurred)
         try:
-            bg_image = Image.open("password.jpg")
-            bg_image = bg_image.resize((1920, 1080), Image.LANCZOS)
-
-            # Apply blur effect
-            blurred_bg_image = bg_image.filter(ImageFilter.GaussianBlur(radius=5))
+            blurred_bg_image = screen_background("password_recovery")
 
             self.bg_photo = ImageTk.PhotoImage(blurred_bg_image)
 
@@ -193,31 +189,18 @@ class PasswordRecoveryApp(ctk.CTkFrame):
 
         # Update password in database
         try:
-            if not self.db or not self.db.connection.is_connected():
+            if not self.db:
                 messagebox.showerror("Error", "Database connection error")
                 return
 
-            # Hash the new password
-            hashed_password = hashlib.sha256(new_password.encode()).hexdigest()
-
-            with self.db.connection.cursor() as cursor:
-                # Check if email exists
-                cursor.execute("SELECT user_id FROM users WHERE email = %s", (email,))
-                user = cursor.fetchone()
-
-                if not user:
-                    messagebox.showerror("Error", "Email not found in our system")
-                    return
-
-                # Update password
-                cursor.execute(
-                    "UPDATE users SET password_hash = %s WHERE email = %s",
-                    (hashed_password, email)
-                )
-                self.db.connection.commit()
+            # The DatabaseManager checks out (and returns) its own connection
+            success, message = self.db.reset_password(email, new_password)
+            if not success:
+                messagebox.showerror("Error", message)
+                return
 
-                # messagebox.showinfo("Success", "Password has been reset successfully!")
-                self.controller.show_frame("LoginApp")
+            # messagebox.showinfo("Success", "Password has been reset successfully!")
+            self.controller.show_frame("LoginApp")
 
         except Exception as e:
             logger.error(f"Password reset failed: {e}")
@@ -0,0 +1,8 @@
+from db_helper import DatabaseManager
+
+if __name__ == "__main__":
+    with DatabaseManager() as db:
+        if db.rebuild_occupancy():
+            print("✅ Room occupancy rebuilt from reservations")
+        else:
+            print("❌ Failed to rebuild room occupancy")
@@ -0,0 +1,8 @@
+from db_helper import DatabaseManager
+
+if __name__ == "__main__":
+    with DatabaseManager() as db:
+        if db.rebuild_monthly_rollups():
+            print("✅ Monthly rollups rebuilt")
+        else:
+            print("❌ Failed to rebuild monthly rollups")
@@ -0,0 +1,217 @@
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_SECONDS = 1.0
+MAX_BACKOFF = 8  # longest interval is MAX_BACKOFF times the registered one
+
+
+class RefreshJob:
+    """A periodic background query plus the Tk-thread callback that shows its result"""
+
+    def __init__(self, name: str, func: Callable, args: Tuple, on_result: Optional[Callable],
+                 on_error: Optional[Callable], interval_ms: int, priority: int, owner, visible_only: bool):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.on_result = on_result
+        self.on_error = on_error
+        self.interval = interval_ms / 1000.0
+        self.priority = priority
+        self.owner = owner
+        self.visible_only = visible_only
+        self.next_due = 0.0
+        self.backoff = 1
+        self.running = False
+        self.rerun = False
+        self.last_duration: Optional[float] = None
+
+    @property
+    def query(self) -> Tuple:
+        """Jobs with the same query share one database round trip"""
+        return self.func, self.args
+
+
+class RefreshScheduler:
+    """One timer for every periodic refresh in the app
+
+    Frames register jobs (a DatabaseManager call, an interval, a priority and
+    whether it only matters while the frame is shown) instead of running
+    their own ``after()`` loops.  Due jobs that run the same query are
+    coalesced into a single BackgroundQueryExecutor request whose result is
+    handed to all of them.  A job whose query is slow or fails has its
+    interval doubled (up to MAX_BACKOFF times) until it is fast again, a job
+    never overlaps itself, and nothing runs while the window is minimized.
+    """
+
+    def __init__(self, root, executor, slow_query_seconds: float = SLOW_QUERY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.root = root
+        self.executor = executor
+        self.slow_query_seconds = slow_query_seconds
+        self.clock = clock
+        self.jobs: List[RefreshJob] = []
+        self.active_owner = None
+        self.paused = False
+        self._after_id = None
+
+    # ----- registration -----
+
+    def register(
+            self,
+            name: str,
+            func: Callable,
+            *args,
+            on_result: Optional[Callable] = None,
+            on_error: Optional[Callable] = None,
+            interval_ms: int = 60000,
+            priority: int = 0,
+            owner=None,
+            visible_only: bool = True,
+            run_now: bool = False
+    ) -> RefreshJob:
+        """Run ``func(*args)`` every ``interval_ms`` and pass the result to ``on_result``
+
+        ``visible_only`` jobs are skipped while ``owner`` is not the frame on
+        screen; when several jobs are due, higher ``priority`` goes first.
+        """
+        job = RefreshJob(name, func, args, on_result, on_error, interval_ms, priority, owner, visible_only)
+        job.next_due = self.clock() if run_now else self.clock() + job.interval
+        self.jobs.append(job)
+        self._reschedule()
+        return job
+
+    def unregister(self, owner) -> None:
+        """Drop every job registered for ``owner``"""
+        self.jobs = [job for job in self.jobs if job.owner is not owner]
+        self._reschedule()
+
+    def request(self, job: RefreshJob) -> None:
+        """Run ``job`` as soon as it is allowed to, e.g. after a change-feed event"""
+        if job.running:
+            # The result in flight may predate the change; go again when it lands
+            job.rerun = True
+            return
+        job.next_due = min(job.next_due, self.clock())
+        self._reschedule()
+
+    # ----- visibility -----
+
+    def set_active(self, owner) -> None:
+        """Mark ``owner`` as the frame on screen; its overdue jobs run right away"""
+        self.active_owner = owner
+        self._reschedule()
+
+    def bind_window(self) -> None:
+        """Pause while the main window is minimized or withdrawn"""
+        self.root.bind("<Unmap>", self._on_unmap, add="+")
+        self.root.bind("<Map>", self._on_map, add="+")
+
+    def _on_unmap(self, event) -> None:
+        # <Unmap> bound on the root also fires for every child widget
+        if event.widget is self.root and self.root.state() in ("iconic", "withdrawn"):
+            self.pause()
+
+    def _on_map(self, event) -> None:
+        if event.widget is self.root:
+            self.resume()
+
+    def pause(self) -> None:
+        if not self.paused:
+            logger.debug("Refresh scheduler paused")
+        self.paused = True
+        self._cancel_timer()
+
+    def resume(self) -> None:
+        if self.paused:
+            logger.debug("Refresh scheduler resumed")
+        self.paused = False
+        self._reschedule()
+
+    def shutdown(self) -> None:
+        self.jobs = []
+        self.paused = True
+        self._cancel_timer()
+
+    # ----- running -----
+
+    def _runnable(self, job: RefreshJob) -> bool:
+        if job.running:
+            return False
+        return not job.visible_only or job.owner is None or job.owner is self.active_owner
+
+    def _cancel_timer(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _reschedule(self) -> None:
+        self._cancel_timer()
+        if self.paused:
+            return
+        waiting = [job.next_due for job in self.jobs if self._runnable(job)]
+        if waiting:
+            delay = max(0.0, min(waiting) - self.clock())
+            self._after_id = self.root.after(int(delay * 1000), self._tick)
+
+    def _tick(self) -> None:
+        self._after_id = None
+        now = self.clock()
+        due = sorted(
+            (job for job in self.jobs if self._runnable(job) and job.next_due <= now),
+            key=lambda job: -job.priority
+        )
+
+        groups: Dict[Tuple, List[RefreshJob]] = {}
+        for job in due:
+            groups.setdefault(job.query, []).append(job)
+
+        for (func, args), group in groups.items():
+            for job in group:
+                job.running = True
+            try:
+                self.executor.submit(
+                    func,
+                    *args,
+                    on_success=lambda result, g=group, t=now: self._finish(g, t, result, None),
+                    on_error=lambda error, g=group, t=now: self._finish(g, t, None, error),
+                    owner=self
+                )
+            except RuntimeError as e:
+                # Executor already shut down
+                logger.debug(f"Refresh job {group[0].name} not started: {e}")
+                for job in group:
+                    job.running = False
+                    job.next_due = now + job.interval
+        self._reschedule()
+
+    def _finish(self, group: List[RefreshJob], started: float, result, error) -> None:
+        now = self.clock()
+        duration = now - started
+        slow = error is not None or duration > self.slow_query_seconds
+        for job in group:
+            job.running = False
+            job.last_duration = duration
+            job.backoff = min(job.backoff * 2, MAX_BACKOFF) if slow else 1
+            job.next_due = now if job.rerun else now + job.interval * job.backoff
+            job.rerun = False
+            if slow and job.backoff > 1:
+                logger.info(f"Refresh job {job.name} backing off to {job.interval * job.backoff:.0f}s")
+
+        for job in group:
+            if job not in self.jobs:
+                # Unregistered while its query was running
+                continue
+            callback = job.on_result if error is None else job.on_error
+            if callback is None:
+                continue
+            try:
+                callback(result if error is None else error)
+            except Exception as e:
+                logger.error(f"Refresh job {job.name} callback failed: {e}")
+        self._reschedule()
@@ -1,8 +1,8 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk, ImageFilter
+from PIL import ImageTk
+from backgrounds import screen_background
 import re
 import tkinter.messagebox as messagebox
-import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,9 +21,7 @@ class RegistrationApp(ctk.CTkFrame):
 
         # Background Image
         try:
-            bg_image = Image.open("registration.jpg")
-            bg_image = bg_image.resize((1920, 1080), Image.LANCZOS)
-            blurred_bg_image = bg_image.filter(ImageFilter.GaussianBlur(radius=5))
+            blurred_bg_image = screen_background("register")
             self.bg_photo = ImageTk.PhotoImage(blurred_bg_image)
             self.bg_label = ctk.CTkLabel(self, image=self.bg_photo, text="")
             self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
@@ -248,52 +246,28 @@ class RegistrationApp(ctk.CTkFrame):
         gender = self.gender_var.get()
         password = self.password_entry.get()
 
-        # Hash password
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-
         try:
-            if not self.db or not self.db.connection.is_connected():
+            if not self.db:
                 messagebox.showerror("Database Error", "No database connection")
                 return
 
-            with self.db.connection.cursor() as cursor:
-                # Check if email exists
-                cursor.execute("SELECT email FROM users WHERE email = %s", (email,))
-                if cursor.fetchone():
-                    messagebox.showerror("Error", "Email already registered")
-                    return
-
-                # Insert new user
-                cursor.execute(
-                    "INSERT INTO users (full_name, email, password_hash, gender, role) VALUES (%s, %s, %s, %s, %s)",
-                    (name, email, hashed_password, gender, "customer")
-                )
-                self.db.connection.commit()
-
-                # Create customer record
-                user_id = cursor.lastrowid
-                customer_id = f"CUST{user_id:04d}"
-                cursor.execute(
-                    """
-                    INSERT INTO customers 
-                    (customer_id, user_id, full_name, email, address, phone, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (customer_id, user_id, name, email, "Not specified", "Not specified", "Active")
-                )
-                self.db.connection.commit()
-
-                messagebox.showinfo("Success", "Registration successful!")
-
-                # Clear form
-                self.name_entry.delete(0, 'end')
-                self.email_entry.delete(0, 'end')
-                self.password_entry.delete(0, 'end')
-                self.terms_checkbox.deselect()
-                self.gender_var.set("Male")
-
-                # Redirect to login
-                self.controller.show_frame("LoginApp")
+            # Creates the user and customer rows and updates the monthly rollups
+            success, message = self.db.register_customer(name, email, password, gender)
+            if not success:
+                messagebox.showerror("Error", message)
+                return
+
+            messagebox.showinfo("Success", "Registration successful!")
+
+            # Clear form
+            self.name_entry.delete(0, 'end')
+            self.email_entry.delete(0, 'end')
+            self.password_entry.delete(0, 'end')
+            self.terms_checkbox.deselect()
+            self.gender_var.set("Male")
+
+            # Redirect to login
+            self.controller.show_frame("LoginApp")
 
         except Exception as e:
             logger.error(f"Registration failed: {e}")
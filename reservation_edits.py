@@ -0,0 +1,100 @@
+from datetime import date
+from typing import Dict, List, Sequence, Tuple
+from availability import as_date
+
+# Fields the edit dialogs can change, in the order conflicts are listed
+EDITABLE_FIELDS = (
+    "guest_name", "room_type", "checkin_date", "checkout_date",
+    "booking_amount", "payment_status", "fulfillment_status",
+)
+FIELD_LABELS = {
+    "guest_name": "Guest name",
+    "room_type": "Room type",
+    "checkin_date": "Check-in",
+    "checkout_date": "Check-out",
+    "booking_amount": "Amount",
+    "payment_status": "Payment",
+    "fulfillment_status": "Status",
+}
+DATE_FIELDS = ("checkin_date", "checkout_date")
+
+
+def normalize(field: str, value):
+    """Comparable form of a field value, whether it came from a grid, a dialog or the database"""
+    if value is None or value == "":
+        return None
+    if field in DATE_FIELDS:
+        return as_date(value)
+    if field == "booking_amount":
+        return round(float(str(value).replace("$", "").replace(",", "")), 2)
+    return str(value).strip()
+
+
+def format_value(field: str, value) -> str:
+    value = normalize(field, value)
+    if value is None:
+        return "—"
+    if isinstance(value, date):
+        return value.strftime("%b %d, %Y")
+    if field == "booking_amount":
+        return f"${value:,.2f}"
+    return value
+
+
+def from_grid_row(values: Sequence) -> Dict:
+    """Fields of a reservation grid row (id, name, room type, check-in, check-out, amount, payment, status)"""
+    return {
+        "reservation_id": values[0],
+        "guest_name": values[1],
+        "room_type": values[2],
+        "checkin_date": values[3],
+        "checkout_date": values[4],
+        "booking_amount": values[5],
+        "payment_status": values[6],
+        "fulfillment_status": values[7],
+    }
+
+
+def to_grid_row(row: Dict) -> Tuple:
+    """Display tuple for the reservation grids from a saved or current database row"""
+    return (
+        row["reservation_id"],
+        row.get("guest_name", ""),
+        row.get("room_type", ""),
+        format_value("checkin_date", row.get("checkin_date")),
+        format_value("checkout_date", row.get("checkout_date")),
+        format_value("booking_amount", row.get("booking_amount")),
+        row.get("payment_status", ""),
+        row.get("fulfillment_status", ""),
+    )
+
+
+def changes_between(base: Dict, edited: Dict) -> Dict:
+    """The editable fields whose value in ``edited`` differs from ``base``"""
+    return {
+        field: edited[field] for field in EDITABLE_FIELDS
+        if field in edited and normalize(field, edited[field]) != normalize(field, base.get(field))
+    }
+
+
+def merge_edit(base: Dict, mine: Dict, theirs: Dict) -> Tuple[Dict, List[str]]:
+    """Rebase an edit made from ``base`` onto ``theirs``, the row as someone else saved it
+
+    Returns the changes to re-apply and the fields both sides changed to
+    different values.  Fields only the other user changed keep their value.
+    """
+    changes = changes_between(base, mine)
+    conflicts = [
+        field for field, value in changes.items()
+        if normalize(field, theirs.get(field)) not in (normalize(field, base.get(field)), normalize(field, value))
+    ]
+    return changes, conflicts
+
+
+def describe_conflicts(fields: Sequence[str], mine: Dict, theirs: Dict) -> str:
+    """One line per field: the user's value and the one saved meanwhile"""
+    return "\n".join(
+        f"{FIELD_LABELS.get(field, field)}: yours {format_value(field, mine.get(field))}, "
+        f"saved {format_value(field, theirs.get(field))}"
+        for field in fields
+    )
@@ -2,7 +2,12 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
 from db_helper import DatabaseManager
+from paging import KeysetPager, PageControls, PAGE_SIZE
+from table_sync import TreeviewSync
 import re
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class StaffMemberScreen(ctk.CTkFrame):
@@ -15,6 +20,9 @@ class StaffMemberScreen(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
+        # Only one keyset page is fetched and rendered at a time
+        self.pager = KeysetPager()
+
         # Create components
         self.create_sidebar()
         self.create_main_content()
@@ -264,6 +272,9 @@ class StaffMemberScreen(ctk.CTkFrame):
         self.action_frame = ctk.CTkFrame(content, fg_color="transparent")
         self.action_frame.grid(row=3, column=0, sticky="e", pady=(0, 20))
 
+        self.page_controls = PageControls(self.action_frame, self.previous_page, self.next_page)
+        self.page_controls.pack(side="left", padx=(0, 20))
+
         # Edit button (will be enabled when a row is selected)
         self.edit_btn = ctk.CTkButton(
             self.action_frame,
@@ -293,35 +304,22 @@ class StaffMemberScreen(ctk.CTkFrame):
         # Bind selection event
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
 
-    def populate_table(self, staff_members):
-        """Populate the treeview with staff member data"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        if not staff_members:
-            return
-
-        # Add staff members to treeview
-        for staff in staff_members:
-            status = staff['status']
-            tags = ('active',) if status == 'Active' else ('inactive',)
-
-            self.tree.insert("", "end",
-                             values=(
-                                 staff['staff_id'],
-                                 staff['full_name'],
-                                 staff['email'],
-                                 staff['phone'],
-                                 staff['address'],
-                                 status
-                             ),
-                             tags=tags)
-
         # Configure tag colors
         self.tree.tag_configure('active', background='#f0fdf4', foreground='#166534')
         self.tree.tag_configure('inactive', background='#fef2f2', foreground='#991b1b')
 
+        # Refreshes reconcile rows by staff_id/updated_at instead of rebuilding the tree
+        self.tree_sync = TreeviewSync(
+            self.tree,
+            key=lambda s: s['staff_id'],
+            values=lambda s: (s['staff_id'], s['full_name'], s['email'], s['phone'], s['address'], s['status']),
+            tags=lambda s, i: ('active',) if s['status'] == 'Active' else ('inactive',)
+        )
+
+    def populate_table(self, staff_members):
+        """Show staff member data, touching only rows that were added, changed or removed"""
+        self.tree_sync.sync(staff_members or [])
+
     def on_tree_select(self, event):
         """Handle treeview selection event"""
         selected = self.tree.selection()
@@ -362,23 +360,45 @@ class StaffMemberScreen(ctk.CTkFrame):
     def filter_staff(self, status):
         """Filter staff members by status"""
         self.active_filter.set(status)
-        staff_members = self.db.get_staff_members(status)
-        self.populate_table(staff_members)
-        # Clear selection
-        self.tree.selection_remove(self.tree.selection())
+        self.pager.reset()
+        self.load_page()
 
     def search_staff(self, event):
         """Search staff members based on input"""
-        query = self.search_entry.get().strip()
+        self.pager.reset()
+        self.load_page()
+
+    def load_page(self):
+        """Fetch the current page for the active filter and search on a background worker"""
+        # No owner: the screen does not reload when shown again, so leaving it
+        # must not drop the page; the key lets a newer search supersede it
+        self.controller.db_executor.submit(
+            self.db.get_staff_members_page,
+            self.active_filter.get(),
+            search=self.search_entry.get().strip(),
+            after=self.pager.cursor,
+            limit=PAGE_SIZE,
+            on_success=self._on_page_loaded,
+            on_error=self._on_load_error,
+            key="staff_members_page"
+        )
 
-        if not query:
-            self.filter_staff(self.active_filter.get())
-            return
+    def _on_page_loaded(self, page):
+        self.pager.loaded(page)
+        self.page_controls.update_state(self.pager)
+        self.populate_table(page["rows"])
+
+    def _on_load_error(self, e):
+        logger.error(f"Failed to load staff members: {str(e)}")
+        messagebox.showerror("Error", f"Failed to load staff members: {str(e)}")
+
+    def next_page(self):
+        if self.pager.advance():
+            self.load_page()
 
-        staff_members = self.db.search_staff_members(query)
-        self.populate_table(staff_members)
-        # Clear selection
-        self.tree.selection_remove(self.tree.selection())
+    def previous_page(self):
+        if self.pager.back():
+            self.load_page()
 
     def open_add_staff_dialog(self):
         dialog = ctk.CTkToplevel(self)
@@ -422,7 +442,7 @@ class StaffMemberScreen(ctk.CTkFrame):
         # === Build form fields ===
         self.staff_form_vars = {}
         fields = [
-            ("Staff ID", "text", ""),
+            ("Staff ID", "text", self.db.generate_staff_id()),
             ("Name", "text", ""),
             ("Email", "text", ""),
             ("Phone", "text", ""),
@@ -579,7 +599,7 @@ class StaffMemberScreen(ctk.CTkFrame):
             success, message = self.db.add_staff_member(staff_data)
             if success:
                 messagebox.showinfo("Success", message)
-                self.filter_staff(self.active_filter.get())
+                self.load_page()
                 dialog.destroy()
             else:
                 messagebox.showerror("Error", message)
@@ -619,7 +639,7 @@ class StaffMemberScreen(ctk.CTkFrame):
         try:
             if self.db.update_staff_member(staff_id, updated_data):
                 messagebox.showinfo("Success", "Staff member updated successfully!")
-                self.filter_staff(self.active_filter.get())
+                self.load_page()
                 dialog.destroy()
             else:
                 messagebox.showerror("Error", "Failed to update staff member")
@@ -631,7 +651,7 @@ class StaffMemberScreen(ctk.CTkFrame):
         if messagebox.askyesno("Confirm", f"Delete staff member {staff['full_name']}?"):
             if self.db.delete_staff_member(staff['staff_id']):
                 messagebox.showinfo("Success", "Staff member deleted")
-                self.filter_staff(self.active_filter.get())
+                self.load_page()
             else:
                 messagebox.showerror("Error", "Failed to delete staff member")
 
@@ -0,0 +1,147 @@
+import logging
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def diff_keyed(shown: Dict[Hashable, Any], incoming: Dict[Hashable, Any]) -> Tuple[Set, Set, Set]:
+    """Compare {key: version} maps; returns (inserted, updated, deleted) key sets"""
+    inserted = incoming.keys() - shown.keys()
+    deleted = shown.keys() - incoming.keys()
+    updated = {k for k in incoming.keys() & shown.keys() if incoming[k] != shown[k]}
+    return set(inserted), updated, set(deleted)
+
+
+def _default_version(row):
+    """``updated_at`` when the query selects it, otherwise the whole row"""
+    if isinstance(row, dict) and row.get("updated_at") is not None:
+        return row["updated_at"]
+    return tuple(row.values()) if isinstance(row, dict) else tuple(row)
+
+
+class TreeviewSync:
+    """Keeps a ttk.Treeview in step with a keyed result set
+
+    Items use the row's primary key as their iid, so a refresh only inserts,
+    updates, deletes or moves the rows that actually changed; the selection
+    and the scroll position are left alone.  ``version`` decides whether a
+    row changed (``updated_at`` by default) and ``tags(row, index)`` may
+    depend on position, e.g. for striping.
+    """
+
+    def __init__(
+            self,
+            tree,
+            key: Callable[[Any], Hashable],
+            values: Callable[[Any], Tuple],
+            version: Callable[[Any], Any] = _default_version,
+            tags: Optional[Callable[[Any, int], Tuple]] = None
+    ):
+        self.tree = tree
+        self._key = key
+        self._values = values
+        self._version = version
+        self._tags = tags
+        self._versions: Dict[str, Any] = {}
+        self._shown_tags: Dict[str, Tuple] = {}
+        self._order: List[str] = []
+
+    def reset(self) -> None:
+        """Forget what is shown and clear the tree (for callers that wiped it)"""
+        for iid in self._order:
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+        self._versions, self._shown_tags, self._order = {}, {}, []
+
+    def sync(self, rows: Iterable) -> Tuple[int, int, int]:
+        """Reconcile the tree with ``rows``; returns (inserted, updated, deleted) counts"""
+        incoming, by_key, order = {}, {}, []
+        for row in rows:
+            iid = str(self._key(row))
+            if iid in by_key:
+                logger.warning(f"Duplicate row key {iid} ignored")
+                continue
+            incoming[iid] = self._version(row)
+            by_key[iid] = row
+            order.append(iid)
+
+        inserted, updated, deleted = diff_keyed(self._versions, incoming)
+        first_visible = self.tree.yview()[0]
+
+        if deleted:
+            self.tree.delete(*deleted)
+            for iid in deleted:
+                self._shown_tags.pop(iid, None)
+
+        for index, iid in enumerate(order):
+            row = by_key[iid]
+            tags = self._tags(row, index) if self._tags else ()
+            if iid in inserted:
+                self.tree.insert("", "end", iid=iid, values=self._values(row), tags=tags)
+            elif iid in updated:
+                self.tree.item(iid, values=self._values(row), tags=tags)
+            elif self._shown_tags.get(iid) != tags:
+                self.tree.item(iid, tags=tags)
+            self._shown_tags[iid] = tags
+
+        if list(self.tree.get_children()) != order:
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+
+        self._versions, self._order = incoming, order
+        self.tree.yview_moveto(first_visible)
+        return len(inserted), len(updated), len(deleted)
+
+
+class SheetSync:
+    """TreeviewSync counterpart for a tksheet.Sheet (rows are addressed by index)"""
+
+    def __init__(
+            self,
+            sheet,
+            key: Callable[[Any], Hashable],
+            values: Callable[[Any], List],
+            version: Callable[[Any], Any] = _default_version
+    ):
+        self.sheet = sheet
+        self._key = key
+        self._values = values
+        self._version = version
+        self._versions: Dict[Hashable, Any] = {}
+        self._order: List[Hashable] = []
+
+    def reset(self) -> None:
+        """Forget what is shown and clear the sheet (e.g. before showing a placeholder)"""
+        self.sheet.set_sheet_data([])
+        self._versions, self._order = {}, []
+
+    def sync(self, rows: Iterable) -> Tuple[int, int, int]:
+        """Apply row-level inserts, updates and deletes; returns their counts"""
+        incoming, by_key, order = {}, {}, []
+        for row in rows:
+            k = self._key(row)
+            if k in by_key:
+                continue
+            incoming[k] = self._version(row)
+            by_key[k] = row
+            order.append(k)
+
+        inserted, updated, deleted = diff_keyed(self._versions, incoming)
+
+        # Delete from the bottom up so earlier indexes stay valid
+        for index in sorted((i for i, k in enumerate(self._order) if k in deleted), reverse=True):
+            self.sheet.delete_row(index, redraw=False)
+        current = [k for k in self._order if k not in deleted]
+
+        for index, k in enumerate(order):
+            if k in inserted:
+                self.sheet.insert_row(self._values(by_key[k]), idx=index, redraw=False)
+                current.insert(index, k)
+            elif current[index] != k or k in updated:
+                # Moved or changed: overwrite this position in place
+                self.sheet.set_row_data(index, values=self._values(by_key[k]), redraw=False)
+                current[index] = k
+
+        self._versions, self._order = incoming, order
+        self.sheet.redraw()
+        return len(inserted), len(updated), len(deleted)
@@ -0,0 +1,63 @@
+from datetime import date
+
+import pytest
+
+from availability import AvailabilityEngine, RoomUnavailable, assign_rooms
+
+ROOMS = [("301", "Suite"), ("302", "Suite"), ("101", "Single")]
+
+
+def engine_with(*bookings):
+    engine = AvailabilityEngine()
+    assert engine.load(ROOMS, bookings) == []
+    return engine
+
+
+def test_free_rooms_treat_checkout_day_as_free():
+    engine = engine_with(("RES1", "301", date(2025, 6, 3), date(2025, 6, 7)))
+
+    assert engine.free_rooms("Suite", date(2025, 6, 4), date(2025, 6, 5)) == ["302"]
+    assert engine.free_rooms("Suite", date(2025, 6, 7), date(2025, 6, 9)) == ["301", "302"]
+    assert engine.free_rooms("Suite", "2025-06-01", "Jun 03, 2025") == ["301", "302"]
+    assert engine.overlapping("301", date(2025, 6, 1), date(2025, 6, 30)) == ["RES1"]
+    assert engine.free_counts(date(2025, 6, 5), date(2025, 6, 6)) == {"Suite": 1, "Single": 1}
+
+
+def test_book_rejects_overlap_and_moves_existing_booking():
+    engine = engine_with(("RES1", "301", date(2025, 6, 3), date(2025, 6, 7)))
+
+    with pytest.raises(RoomUnavailable):
+        engine.book("RES2", "301", date(2025, 6, 6), date(2025, 6, 8))
+
+    # Extending a stay only conflicts with other bookings, not with itself
+    engine.book("RES1", "301", date(2025, 6, 2), date(2025, 6, 8))
+    assert engine.booking("RES1") == ("301", date(2025, 6, 2), date(2025, 6, 8))
+    assert engine.is_free("301", date(2025, 6, 1), date(2025, 6, 2))
+    assert engine.is_free("301", date(2025, 6, 5), date(2025, 6, 6), ignore="RES1")
+
+    engine.book("RES1", "302", date(2025, 6, 2), date(2025, 6, 8))
+    assert engine.is_free("301", date(2025, 6, 1), date(2025, 6, 30))
+    assert engine.release("RES1") is True
+    assert engine.free_rooms("Suite", date(2025, 6, 1), date(2025, 6, 30)) == ["301", "302"]
+
+
+def test_load_reports_conflicting_bookings():
+    engine = AvailabilityEngine()
+    rejected = engine.load(ROOMS, [
+        ("RES1", "301", date(2025, 6, 3), date(2025, 6, 7)),
+        ("RES2", "301", date(2025, 6, 5), date(2025, 6, 6)),
+        ("RES3", "999", date(2025, 6, 5), date(2025, 6, 6)),
+    ])
+    assert rejected == ["RES2", "RES3"]
+
+
+def test_assign_rooms_first_fit_and_overflow():
+    stays = [
+        ("RES1", "Suite", date(2025, 6, 1), date(2025, 6, 5)),
+        ("RES2", "Suite", date(2025, 6, 2), date(2025, 6, 4)),
+        ("RES3", "Suite", date(2025, 6, 3), date(2025, 6, 4)),
+        ("RES4", "Suite", date(2025, 6, 5), date(2025, 6, 6)),
+    ]
+    assigned, unplaced = assign_rooms(ROOMS, stays)
+    assert assigned == {"RES1": "301", "RES2": "302", "RES4": "301"}
+    assert unplaced == ["RES3"]
@@ -0,0 +1,23 @@
+from datetime import date
+
+from bench_bookings import find_overlaps, summarize
+
+
+def test_find_overlaps_per_room():
+    stays = [
+        ("101", date(2099, 1, 1), date(2099, 1, 5), "RES1"),
+        ("101", date(2099, 1, 5), date(2099, 1, 6), "RES2"),  # starts on RES1's check-out day
+        ("101", date(2099, 1, 3), date(2099, 1, 4), "RES3"),
+        ("102", date(2099, 1, 3), date(2099, 1, 4), "RES4"),
+    ]
+    assert find_overlaps(stays) == [("RES1", "RES3")]
+
+
+def test_summarize():
+    stats = summarize([0.01, 0.02, 0.03, 0.04], booked=3, elapsed=2.0)
+    assert stats["attempts"] == 4
+    assert stats["rejected"] == 1
+    assert stats["booked_per_s"] == 1.5
+    assert stats["p50_ms"] == 30.0
+    assert stats["max_ms"] == 40.0
+    assert summarize([], booked=0, elapsed=0)["p95_ms"] == 0.0
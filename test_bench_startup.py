@@ -0,0 +1,23 @@
+from bench_startup import parse_importtime, check_budget
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2000 |     PIL._version
+import time:      3000 |       5000 |   PIL
+import time:     90000 |     250000 |     matplotlib.pyplot
+import time:      1000 |     300000 | dashboard
+import time:       500 |       5500 | landing
+"""
+
+
+def test_parse_importtime_reads_depth_and_times():
+    imports = parse_importtime(SAMPLE)
+    assert imports[0] == ("_io", 120, 120, 1)
+    assert imports[1] == ("PIL._version", 2000, 2000, 2)
+    assert imports[-1] == ("landing", 500, 5500, 0)
+
+
+def test_check_budget_flags_deferred_modules_and_total():
+    problems = check_budget(parse_importtime(SAMPLE), budget_ms=100)
+    assert problems == ["matplotlib is imported at startup", "startup imports take 306 ms (budget 100 ms)"]
+    assert check_budget(parse_importtime(SAMPLE), budget_ms=400, deferred=("fpdf",)) == []
@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from bulk_import import ImportReport, import_records, normalize_customer, normalize_reservation, read_records
+
+
+def test_normalize_reservation_accepts_export_style_columns():
+    row = normalize_reservation(
+        {"ID": "#12345", "Name": " Jack Smith ", "Room Type": "Suite", "Check-In": "Jun 23, 2024",
+         "checkout": "2024-06-25", "Amount": "$1,450.00", "Payment": "paid", "room_number": ""},
+        default_user_id=7,
+    )
+    assert row["reservation_id"] == "12345"
+    assert row["user_id"] == 7
+    assert row["guest_name"] == "Jack Smith"
+    assert (row["checkin_date"], row["checkout_date"]) == (date(2024, 6, 23), date(2024, 6, 25))
+    assert row["booking_amount"] == 1450.0
+    assert (row["payment_status"], row["fulfillment_status"]) == ("Paid", "Pending")
+    assert row["room_number"] is None
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({"name": "A", "room_type": "Suite", "checkin": "2024-06-23", "checkout": "2024-06-25", "amount": 1},
+     "Missing user_id"),
+    ({"user_id": 1, "name": "A", "room_type": "Suite", "checkin": "2024-06-23", "amount": 1},
+     "Missing check-in or check-out date"),
+    ({"user_id": 1, "name": "A", "room_type": "Suite", "checkin": "2024-06-23", "checkout": "2024-06-25",
+      "amount": 1, "status": "Done"}, "fulfillment_status must be one of"),
+    (None, "Not a row object"),
+])
+def test_normalize_reservation_rejects_bad_rows(raw, message):
+    with pytest.raises(ValueError, match=message):
+        normalize_reservation(raw)
+
+
+def test_read_records_reports_csv_line_numbers_and_bad_json_lines(tmp_path):
+    csv_file = tmp_path / "customers.csv"
+    csv_file.write_text("name,email\nAda,ada@example.com\nBob,bob@example.com\n")
+    assert [line for line, _ in read_records(str(csv_file))] == [2, 3]
+
+    jsonl_file = tmp_path / "customers.jsonl"
+    jsonl_file.write_text('{"name": "Ada"}\n\nnot json\n')
+    assert list(read_records(str(jsonl_file))) == [(1, {"name": "Ada"}), (3, None)]
+
+
+class RecordingDb:
+    """Accepts every customer except the ones named Bob"""
+
+    def __init__(self):
+        self.batches = []
+
+    def import_customers(self, rows):
+        self.batches.append(rows)
+        return {i: "rejected by database" for i, row in enumerate(rows) if row["full_name"] == "Bob"}
+
+
+def test_import_records_batches_and_keeps_going_past_bad_rows():
+    people = ["Ada", "Bob", "Cy", None, "Di"]
+    records = [
+        (line, {"name": name, "email": "x@example.com", "address": "1 Road", "phone": "555"})
+        for line, name in enumerate(people, 2)
+    ]
+    db = RecordingDb()
+    report = import_records(db, "customers", records, batch_size=2, report=ImportReport(clock=lambda: 1.0))
+
+    assert [len(batch) for batch in db.batches] == [2, 2]
+    assert (report.read, report.imported) == (5, 3)
+    assert report.errors == [(3, "rejected by database"), (5, "Missing full_name")]
+    assert normalize_customer({"name": "Ada", "email": "ada@example.com", "address": "x", "phone": "1",
+                               "status": "inactive"})["status"] == "Inactive"
@@ -0,0 +1,97 @@
+from change_feed import ChangeFeed, collapse_changes, REREAD_WINDOW
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.requested = []
+
+    def register(self, name, func, *args, **kwargs):
+        return name
+
+    def request(self, job):
+        self.requested.append(job)
+
+
+class FakeCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, tables):
+        self.invalidated.append(set(tables))
+
+
+class FakeDb:
+    def __init__(self):
+        self.cache = FakeCache()
+
+    def get_change_watermark(self):
+        return 100
+
+    def get_changes_since(self, change_id, limit):
+        return [{"since": change_id, "limit": limit}]
+
+    def prune_change_log(self, retention_hours):
+        return 0
+
+
+class Frame:
+    pass
+
+
+def change(change_id, table, key, op):
+    return {"change_id": change_id, "table_name": table, "row_key": key, "op": op}
+
+
+def make_feed():
+    feed = ChangeFeed(FakeDb(), FakeScheduler())
+    feed.start()
+    feed._on_read(feed._read())
+    return feed
+
+
+def test_collapse_keeps_last_op_per_row():
+    changes = collapse_changes([
+        change(3, "reservations", "RES1", "delete"),
+        change(1, "reservations", "RES1", "insert"),
+        change(2, "reservations", "RES2", "update"),
+        change(4, "customers", "C1", "update"),
+    ])
+    assert changes == {"reservations": ({"RES2"}, {"RES1"}), "customers": ({"C1"}, set())}
+
+
+def test_late_commits_are_published_once():
+    feed = make_feed()
+    events = []
+    feed.subscribe(("reservations",), events.append)
+
+    feed._publish([change(101, "reservations", "RES1", "insert"), change(103, "reservations", "RES3", "insert")])
+    # 102 committed late; the re-read window returns 101 and 103 again
+    feed._publish([change(101, "reservations", "RES1", "insert"),
+                   change(102, "reservations", "RES2", "insert"),
+                   change(103, "reservations", "RES3", "insert")])
+
+    assert [e.upserted("reservations") for e in events] == [{"RES1", "RES3"}, {"RES2"}]
+    assert feed.watermark == 103
+    assert feed.db.cache.invalidated[0] == {"reservations", "monthly_rollups"}
+    assert feed._read() == ("changes", [{"since": max(0, 103 - REREAD_WINDOW), "limit": feed.batch_size}])
+    assert feed.scheduler.requested == []
+
+
+def test_hidden_frames_catch_up_when_shown():
+    feed = make_feed()
+    reports, dashboard = Frame(), Frame()
+    seen = {"reports": [], "dashboard": []}
+    feed.subscribe(("reservations",), seen["reports"].append, owner=reports)
+    feed.subscribe(("reservations",), seen["dashboard"].append, owner=dashboard, catch_up=False)
+
+    feed._publish([change(101, "reservations", "RES1", "insert")])
+    feed._publish([change(102, "reservations", "RES1", "delete"), change(103, "reservations", "RES2", "update")])
+    assert seen == {"reports": [], "dashboard": []}
+
+    feed.set_active(reports)
+    feed.set_active(dashboard)
+    assert seen["dashboard"] == []
+    (event,) = seen["reports"]
+    assert (event.since, event.until) == (100, 103)
+    assert event.upserted("reservations") == {"RES2"}
+    assert event.deleted("reservations") == {"RES1"}
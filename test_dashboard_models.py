@@ -0,0 +1,35 @@
+from dashboard_models import CustomerDashboardModel, format_amount
+
+
+def summary(user_id, total=250.0, bookings=()):
+    return {"user_id": user_id, "total_spent": total, "upcoming_count": 1, "past_count": 2,
+            "recent_bookings": list(bookings)}
+
+
+def test_apply_reports_only_changed_parts():
+    model = CustomerDashboardModel()
+    model.set_user({"user_id": 7, "full_name": "Ann Lee"})
+    booking = {"reservation_id": "RES1", "amount": "$120.00"}
+
+    assert model.apply(summary(7, bookings=[booking])) == {"metrics", "recent_bookings"}
+    assert model.apply(summary(7, bookings=[booking])) == set()
+    assert model.apply(summary(7, total=300.0, bookings=[booking])) == {"metrics"}
+    assert model.metric_texts() == ("$300.00", "1", "2")
+    assert model.first_name == "Ann"
+
+
+def test_switching_user_drops_old_data_and_late_results():
+    model = CustomerDashboardModel()
+    model.set_user({"user_id": 7, "full_name": "Ann Lee"})
+    model.apply(summary(7))
+
+    assert model.set_user({"user_id": 8, "full_name": "Ben"}) is True
+    assert model.metric_texts() == ("—", "—", "—")
+    assert model.apply(summary(7)) == set()
+    assert model.set_user({"user_id": 8, "full_name": "Ben"}) is False
+
+
+def test_format_amount():
+    assert format_amount(1234.5) == "$1,234.50"
+    assert format_amount("99") == "$99.00"
+    assert format_amount("$5.00") == "$5.00"
@@ -0,0 +1,61 @@
+from db_cache import QueryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = QueryCache(clock=clock)
+    cache.put("total", 42, 30, ("reservations",), cache.generation(("reservations",)))
+
+    assert cache.get("total") == (True, 42)
+    clock.now = 31
+    assert cache.get("total") == (False, None)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_bound_evicts_least_recently_used():
+    cache = QueryCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, key, 60, ("customers",), cache.generation(("customers",)))
+    cache.get("a")
+    cache.put("c", "c", 60, ("customers",), cache.generation(("customers",)))
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "a")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_write_invalidates_only_matching_tables():
+    cache = QueryCache()
+    cache.put("revenue", {"Jan": 1.0}, 60, ("monthly_rollups",), cache.generation(("monthly_rollups",)))
+    cache.put("staff", 3, 60, ("staff",), cache.generation(("staff",)))
+
+    assert cache.invalidate(("reservations", "monthly_rollups")) == 1
+    assert cache.get("revenue") == (False, None)
+    assert cache.get("staff") == (True, 3)
+
+
+def test_read_racing_a_write_is_not_stored():
+    cache = QueryCache()
+    generation = cache.generation(("reservations",))
+    cache.invalidate(("reservations",))
+
+    assert not cache.put("total", 41, 30, ("reservations",), generation)
+    assert cache.get("total") == (False, None)
+
+
+def test_cached_values_are_copies():
+    cache = QueryCache()
+    cache.put("types", [{"type": "Suite"}], 60, ("reservations",), cache.generation(("reservations",)))
+    _, value = cache.get("types")
+    value.append({"type": "Deluxe"})
+
+    assert cache.get("types") == (True, [{"type": "Suite"}])
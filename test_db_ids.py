@@ -0,0 +1,98 @@
+import threading
+from db_ids import IdAllocator
+
+
+class FakeSequenceTable:
+    """Stands in for the id_sequences table shared by several terminals"""
+
+    def __init__(self):
+        self.values = {}
+        self.refills = 0
+        self.lock = threading.Lock()
+
+    def reserve_block(self, prefix, size):
+        with self.lock:
+            self.refills += 1
+            self.values[prefix] = self.values.get(prefix, 0) + size
+            return self.values[prefix]
+
+
+def test_ids_are_formatted_and_sequential():
+    table = FakeSequenceTable()
+    allocator = IdAllocator(table.reserve_block)
+
+    assert allocator.next_id("RES") == "RES00001"
+    assert allocator.next_id("RES") == "RES00002"
+    assert allocator.next_id("CUST") == "CUST0001"
+    assert allocator.next_id("STAFF") == "STAFF0001"
+
+
+def test_block_is_refilled_once_per_block_size():
+    table = FakeSequenceTable()
+    allocator = IdAllocator(table.reserve_block, {"RES": (5, 10)})
+
+    for _ in range(25):
+        allocator.next_id("RES")
+
+    assert table.refills == 3
+
+
+def test_terminals_sharing_a_sequence_never_collide():
+    table = FakeSequenceTable()
+    terminals = [IdAllocator(table.reserve_block, {"RES": (5, 7)}) for _ in range(4)]
+    issued = []
+    issued_lock = threading.Lock()
+
+    def book(allocator):
+        for _ in range(50):
+            reservation_id = allocator.next_id("RES")
+            with issued_lock:
+                issued.append(reservation_id)
+
+    threads = [threading.Thread(target=book, args=(t,)) for t in terminals for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(issued) == 400
+    assert len(set(issued)) == 400
+
+
+def test_refill_does_not_hold_the_allocator_lock():
+    # reserve_block needs the database lock, like _reserve_id_block in single-connection mode
+    table = FakeSequenceTable()
+    db_lock = threading.RLock()
+    refilling = threading.Event()
+
+    def reserve_block(prefix, size):
+        refilling.set()
+        with db_lock:
+            return table.reserve_block(prefix, size)
+
+    allocator = IdAllocator(reserve_block)
+    issued = {}
+
+    def worker():
+        with db_lock:
+            refilling.wait(5)
+            issued["CUST"] = allocator.next_id("CUST")
+
+    holder = threading.Thread(target=worker, daemon=True)
+    holder.start()
+    refiller = threading.Thread(target=lambda: issued.setdefault("RES", allocator.next_id("RES")), daemon=True)
+    refiller.start()
+    holder.join(5)
+    refiller.join(5)
+
+    assert issued == {"CUST": "CUST0001", "RES": "RES00001"}
+
+
+def test_concurrent_refills_keep_the_spare_block():
+    table = FakeSequenceTable()
+    allocator = IdAllocator(table.reserve_block, {"RES": (5, 2)})
+    allocator._blocks["RES"] = [[0, 2], [2, 4]]
+
+    assert [allocator.next_id("RES") for _ in range(4)] == ["RES00001", "RES00002", "RES00003", "RES00004"]
+    assert table.refills == 0
+
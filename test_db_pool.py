@@ -0,0 +1,77 @@
+import threading
+import pytest
+from db_pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+        self.pings = 0
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_connections():
+    opened = []
+
+    def factory():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    pool = ConnectionPool(factory, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert len(opened) == 1
+
+
+def test_checkout_times_out_when_exhausted():
+    pool = ConnectionPool(FakeConnection, size=1, checkout_timeout=0.05)
+    held = pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    pool.release(held)
+    assert pool.acquire() is held
+
+
+def test_unhealthy_connection_is_replaced():
+    pool = ConnectionPool(FakeConnection, size=1, health_check="always")
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.healthy = False
+
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert conn.closed
+
+
+def test_concurrent_checkouts_stay_within_bound():
+    pool = ConnectionPool(FakeConnection, size=3)
+    peak = []
+    barrier = threading.Barrier(6)
+
+    def worker():
+        barrier.wait()
+        with pool.connection(timeout=5):
+            peak.append(pool.stats()["checked_out"])
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) <= 3
+    assert pool.stats()["checked_out"] == 0
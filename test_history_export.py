@@ -0,0 +1,43 @@
+import csv
+import gzip
+from datetime import date
+from decimal import Decimal
+
+from history_export import export_history
+
+
+class StreamingDb:
+    """Hands the writer its rows in chunks, like export_reservation_history"""
+
+    def __init__(self, rows, fail=False):
+        self.rows = rows
+        self.fail = fail
+
+    def export_reservation_history(self, writer, chunk_size):
+        writer.start(("reservation_id", "checkin_date", "booking_amount", "customer_name"))
+        for i in range(0, len(self.rows), chunk_size):
+            writer.write(self.rows[i:i + chunk_size])
+        return None if self.fail else len(self.rows)
+
+
+ROWS = [(f"RES{i:05d}", date(2025, 1, 1), Decimal("99.50"), None) for i in range(7)]
+
+
+def test_export_writes_gzip_csv_in_chunks(tmp_path):
+    path = tmp_path / "history.csv.gz"
+    seen = []
+
+    assert export_history(StreamingDb(ROWS), str(path), chunk_size=3, progress=seen.append) == 7
+    assert seen == [3, 6, 7]
+    with gzip.open(path, "rt", newline="") as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == ["reservation_id", "checkin_date", "booking_amount", "customer_name"]
+    assert lines[1] == ["RES00000", "2025-01-01", "99.50", ""]
+    assert len(lines) == 8
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    path = tmp_path / "history.csv"
+
+    assert export_history(StreamingDb(ROWS, fail=True), str(path), chunk_size=3) is None
+    assert list(tmp_path.iterdir()) == []
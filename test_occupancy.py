@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from occupancy import ALL_ROOM_TYPES, occupancy_matrix, occupancy_rows  # noqa: E402
+
+TYPES = ["Double", "Suite"]
+
+
+def test_matrix_counts_nights_and_clips_to_span():
+    stays = [
+        ("Suite", date(2025, 6, 1), date(2025, 6, 4)),
+        ("Suite", date(2025, 6, 3), date(2025, 6, 5)),
+        ("Double", date(2025, 5, 20), date(2025, 6, 2)),  # starts before the span
+        ("Double", date(2025, 6, 4), date(2025, 6, 30)),  # ends after it
+        ("Penthouse", date(2025, 6, 1), date(2025, 6, 2)),  # unknown type
+    ]
+    matrix = occupancy_matrix(stays, TYPES, date(2025, 6, 1), date(2025, 6, 6))
+
+    assert matrix.tolist() == [
+        [1, 1],
+        [0, 1],
+        [0, 2],
+        [1, 1],
+        [1, 0],
+    ]
+
+
+def test_rows_include_per_day_totals():
+    matrix = occupancy_matrix([("Suite", date(2025, 6, 1), date(2025, 6, 2))], TYPES,
+                              date(2025, 6, 1), date(2025, 6, 3))
+    rows = occupancy_rows(matrix, TYPES, date(2025, 6, 1), {"Double": 10, "Suite": 5})
+
+    assert rows[:3] == [
+        (date(2025, 6, 1), "Double", 0, 10),
+        (date(2025, 6, 1), "Suite", 1, 5),
+        (date(2025, 6, 1), ALL_ROOM_TYPES, 1, 15),
+    ]
+    assert rows[-1] == (date(2025, 6, 2), ALL_ROOM_TYPES, 0, 15)
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from parquet_export import SCHEMAS, export_analytics  # noqa: E402
+
+
+class OccupancyDb:
+    """Streams room_occupancy rows (month last) in chunks, like export_analytics_table"""
+
+    def __init__(self, rows, fail=False):
+        self.rows = rows
+        self.fail = fail
+
+    def export_analytics_table(self, table, writer, chunk_size):
+        writer.start(SCHEMAS[table].names + ["month"])
+        for i in range(0, len(self.rows), chunk_size):
+            writer.write(self.rows[i:i + chunk_size])
+        return None if self.fail else len(self.rows)
+
+
+ROWS = [
+    (date(2025, 5, 30), "Suite", 3, 5, "2025-05"),
+    (date(2025, 5, 31), "Single", 8, 10, "2025-05"),
+    (date(2025, 6, 1), "Suite", 4, 5, "2025-06"),
+]
+
+
+def test_export_writes_typed_month_partitions(tmp_path):
+    counts = export_analytics(OccupancyDb(ROWS), str(tmp_path), tables=["room_occupancy"], chunk_size=2)
+
+    assert counts == {"room_occupancy": 3}
+    dataset = tmp_path / "room_occupancy"
+    assert sorted(p.name for p in dataset.iterdir()) == ["month=2025-05", "month=2025-06"]
+    may = pq.read_table(dataset / "month=2025-05" / "part-0.parquet")
+    assert may.schema.field("date").type == pa.date32()
+    assert pa.types.is_dictionary(may.schema.field("room_type").type)
+    assert may.column("occupied_rooms").to_pylist() == [3, 8]
+
+
+def test_failed_export_keeps_previous_dataset(tmp_path):
+    export_analytics(OccupancyDb(ROWS), str(tmp_path), tables=["room_occupancy"])
+    export_analytics(OccupancyDb(ROWS[:1], fail=True), str(tmp_path), tables=["room_occupancy"])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["room_occupancy"]
+    assert len(list((tmp_path / "room_occupancy").iterdir())) == 2
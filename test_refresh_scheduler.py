@@ -0,0 +1,91 @@
+from refresh_scheduler import RefreshScheduler, MAX_BACKOFF
+
+
+class FakeRoot:
+    def __init__(self):
+        self.timer = None
+
+    def after(self, delay, callback):
+        self.timer = (delay, callback)
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        self.timer = None
+
+
+class FakeExecutor:
+    """Runs queries inline, advancing the clock by the configured query time"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+        self.query_seconds = 0.1
+
+    def submit(self, func, *args, on_success=None, on_error=None, owner=None, key=None):
+        self.calls.append(func)
+        self.clock.now += self.query_seconds
+        on_success(func(*args))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler():
+    clock = Clock()
+    root = FakeRoot()
+    executor = FakeExecutor(clock)
+    return RefreshScheduler(root, executor, clock=clock), root, executor, clock
+
+
+def run_timer(root, clock):
+    delay, callback = root.timer
+    clock.now += delay / 1000.0
+    callback()
+
+
+def snapshot():
+    return "snapshot"
+
+
+def test_same_query_is_coalesced_and_hidden_owners_wait():
+    scheduler, root, executor, clock = make_scheduler()
+    seen = []
+    dashboard, reports = object(), object()
+    scheduler.register("a", snapshot, on_result=lambda r: seen.append(("a", r)), interval_ms=1000, owner=dashboard)
+    scheduler.register("b", snapshot, on_result=lambda r: seen.append(("b", r)), interval_ms=1000,
+                       visible_only=False, priority=1)
+    scheduler.register("hidden", snapshot, on_result=lambda r: seen.append(("hidden", r)), owner=reports,
+                       interval_ms=500)
+    scheduler.set_active(dashboard)
+
+    run_timer(root, clock)
+
+    assert executor.calls == [snapshot]
+    assert seen == [("b", "snapshot"), ("a", "snapshot")]
+
+
+def test_slow_queries_back_off_and_pause_stops_the_timer():
+    scheduler, root, executor, clock = make_scheduler()
+    job = scheduler.register("slow", snapshot, interval_ms=1000, visible_only=False)
+    executor.query_seconds = 5.0
+
+    for _ in range(5):
+        run_timer(root, clock)
+    assert job.backoff == MAX_BACKOFF
+    assert root.timer[0] == 8000
+
+    executor.query_seconds = 0.1
+    run_timer(root, clock)
+    assert job.backoff == 1
+
+    scheduler.pause()
+    assert root.timer is None
+    scheduler.request(job)
+    assert root.timer is None
+    scheduler.resume()
+    assert root.timer[0] == 0
@@ -0,0 +1,40 @@
+from datetime import date
+
+from reservation_edits import changes_between, describe_conflicts, merge_edit, to_grid_row
+
+BASE = {
+    "reservation_id": "RES1",
+    "guest_name": "Ada",
+    "room_type": "Suite",
+    "checkin_date": "2025-06-03",
+    "checkout_date": "2025-06-07",
+    "booking_amount": "$400.00",
+    "payment_status": "Pending",
+    "fulfillment_status": "Pending",
+}
+
+
+def test_changes_ignore_formatting_differences():
+    edited = dict(BASE, checkin_date="Jun 03, 2025", booking_amount=400, payment_status="Paid")
+    assert changes_between(BASE, edited) == {"payment_status": "Paid"}
+
+
+def test_merge_keeps_their_fields_and_reports_real_clashes():
+    mine = dict(BASE, payment_status="Paid", guest_name="Ada L.")
+    theirs = dict(BASE, fulfillment_status="Checked In", guest_name="Ada Lovelace", version=2)
+
+    changes, conflicts = merge_edit(BASE, mine, theirs)
+    assert changes == {"guest_name": "Ada L.", "payment_status": "Paid"}
+    assert conflicts == ["guest_name"]
+    assert describe_conflicts(conflicts, mine, theirs) == "Guest name: yours Ada L., saved Ada Lovelace"
+
+    # Both sides making the same change is not a conflict
+    _, conflicts = merge_edit(BASE, mine, dict(theirs, guest_name="Ada L."))
+    assert conflicts == []
+
+
+def test_grid_row_formats_saved_values():
+    row = dict(BASE, checkin_date=date(2025, 6, 3), booking_amount=1234.5)
+    assert to_grid_row(row) == (
+        "RES1", "Ada", "Suite", "Jun 03, 2025", "Jun 07, 2025", "$1,234.50", "Pending", "Pending"
+    )
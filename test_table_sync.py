@@ -0,0 +1,115 @@
+from table_sync import diff_keyed, TreeviewSync, SheetSync
+
+
+class FakeTree:
+    """Records the Treeview calls TreeviewSync makes"""
+
+    def __init__(self):
+        self.items = {}
+        self.children = []
+        self.calls = []
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, parent, index, iid, values, tags):
+        self.calls.append(("insert", iid))
+        self.items[iid] = (values, tags)
+        self.children.append(iid)
+
+    def item(self, iid, values=None, tags=None):
+        self.calls.append(("item", iid))
+        old_values, old_tags = self.items[iid]
+        self.items[iid] = (values if values is not None else old_values, tags if tags is not None else old_tags)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.calls.append(("delete", iid))
+            del self.items[iid]
+            self.children.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def yview(self):
+        return 0.4, 0.6
+
+    def yview_moveto(self, fraction):
+        self.calls.append(("yview_moveto", fraction))
+
+
+class FakeSheet:
+    def __init__(self):
+        self.data = []
+
+    def set_sheet_data(self, data):
+        self.data = [list(r) for r in data]
+
+    def insert_row(self, row, idx, redraw):
+        self.data.insert(idx, list(row))
+
+    def delete_row(self, idx, redraw):
+        del self.data[idx]
+
+    def set_row_data(self, r, values, redraw):
+        self.data[r] = list(values)
+
+    def redraw(self):
+        pass
+
+
+def customer(customer_id, name, updated_at):
+    return {"customer_id": customer_id, "full_name": name, "updated_at": updated_at}
+
+
+def test_diff_keyed():
+    inserted, updated, deleted = diff_keyed({"a": 1, "b": 1, "c": 1}, {"b": 1, "c": 2, "d": 1})
+    assert (inserted, updated, deleted) == ({"d"}, {"c"}, {"a"})
+
+
+def test_treeview_refresh_only_touches_changed_rows():
+    tree = FakeTree()
+    sync = TreeviewSync(tree, key=lambda c: c["customer_id"], values=lambda c: (c["customer_id"], c["full_name"]))
+    sync.sync([customer("C1", "Ann", 1), customer("C2", "Ben", 1), customer("C3", "Cat", 1)])
+    tree.calls.clear()
+
+    counts = sync.sync([customer("C2", "Ben", 1), customer("C3", "Cathy", 2), customer("C4", "Dan", 1)])
+
+    assert counts == (1, 1, 1)
+    assert [c for c in tree.calls if c[0] != "yview_moveto"] == [("delete", "C1"), ("item", "C3"), ("insert", "C4")]
+    assert tree.get_children() == ("C2", "C3", "C4")
+    assert tree.items["C3"][0] == ("C3", "Cathy")
+    assert ("yview_moveto", 0.4) in tree.calls
+
+
+def test_treeview_reorders_and_restripes():
+    tree = FakeTree()
+    sync = TreeviewSync(
+        tree,
+        key=lambda c: c["customer_id"],
+        values=lambda c: (c["full_name"],),
+        tags=lambda c, i: ("even",) if i % 2 == 0 else ("odd",)
+    )
+    sync.sync([customer("C1", "Ann", 1), customer("C2", "Ben", 1)])
+    sync.sync([customer("C0", "Al", 1), customer("C1", "Ann", 1), customer("C2", "Ben", 1)])
+
+    assert tree.get_children() == ("C0", "C1", "C2")
+    assert [tree.items[i][1] for i in tree.get_children()] == [("even",), ("odd",), ("even",)]
+
+
+def test_sheet_sync_matches_incoming_order():
+    sheet = FakeSheet()
+    sync = SheetSync(sheet, key=lambda r: r["id"], values=lambda r: [r["id"], r["status"]])
+    sync.sync([{"id": "R3", "status": "Paid"}, {"id": "R2", "status": "Pending"}, {"id": "R1", "status": "Paid"}])
+
+    sync.sync([
+        {"id": "R4", "status": "Pending"},
+        {"id": "R3", "status": "Paid"},
+        {"id": "R1", "status": "Cancelled"},
+    ])
+
+    assert sheet.data == [["R4", "Pending"], ["R3", "Paid"], ["R1", "Cancelled"]]
@@ -0,0 +1,102 @@
+import random
+from virtual_table import TableModel
+
+ROWS = [
+    ("RES00003", "Carol", "Suite", "$300.00"),
+    ("RES00001", "alice", "Single", "$99.00"),
+    ("RES00002", "Bob", "Double", "$1,129.00"),
+]
+
+
+def amount(value):
+    return float(value.replace("$", "").replace(",", ""))
+
+
+def test_filter_and_sort_only_reorder_the_view():
+    model = TableModel()
+    model.set_rows(ROWS)
+    model.sort(3, descending=True, key=amount)
+
+    assert [model.key(i) for i in range(len(model))] == ["RES00002", "RES00003", "RES00001"]
+
+    model.filter("SUITE")
+    assert len(model) == 1
+    assert model.row(0) == ROWS[0]
+    assert len(model.rows) == 3
+
+
+def test_filter_and_sort_survive_reload():
+    model = TableModel()
+    model.sort(1)
+    model.filter("res0000")
+    model.set_rows(ROWS + [("RES00004", "Aaron", "Deluxe", "$10.00")])
+
+    assert [model.row(i)[1] for i in range(len(model))] == ["Aaron", "alice", "Bob", "Carol"]
+
+    model.sort(None)
+    assert model.key(0) == "RES00003"
+
+
+def test_lookup_by_key_ignores_filter():
+    model = TableModel()
+    model.set_rows(ROWS)
+    model.filter("bob")
+
+    assert model.get("RES00001") == ROWS[1]
+    assert model.position_of("RES00001") is None
+    assert model.position_of("RES00002") == 0
+
+
+def test_apply_delta_patches_rows_in_place():
+    model = TableModel()
+    model.set_rows(ROWS)
+    model.apply_delta([("RES00001", "Alice", "Single", "$99.00"), ("RES00009", "Zed", "Suite", "$1.00")],
+                      deleted=["RES00003"])
+
+    assert [model.key(i) for i in range(len(model))] == ["RES00001", "RES00002", "RES00009"]
+    assert model.get("RES00001")[1] == "Alice"
+    assert model.get("RES00003") is None
+
+
+def test_apply_delta_matches_a_full_reload():
+    rng = random.Random(7)
+    rows = {f"RES{n:05d}": (f"RES{n:05d}", f"guest {n}", rng.choice(["Single", "Suite"]), f"${n}.00")
+            for n in range(200)}
+    model = TableModel()
+    model.set_rows(rows.values())
+    model.sort(3, descending=True, key=amount)
+    model.filter("suite")
+
+    for step in range(20):
+        upserts = [(f"RES{n:05d}", f"guest {n}", rng.choice(["Single", "Suite"]), f"${n + 1000 * step}.00")
+                   for n in rng.sample(range(260), 5)]
+        deleted = [f"RES{n:05d}" for n in rng.sample(range(260), 3)]
+        model.apply_delta(upserts, deleted)
+        rows.update((row[0], row) for row in upserts)
+        for key in deleted:
+            rows.pop(key, None)
+
+        fresh = TableModel()
+        fresh.set_rows(sorted(rows.values()))
+        fresh.sort(3, descending=True, key=amount)
+        fresh.filter("suite")
+        assert [model.key(i) for i in range(len(model))] == [fresh.key(i) for i in range(len(fresh))]
+        assert all(model.position_of(model.key(i)) == i for i in range(len(model)))
+
+
+def test_apply_delta_only_converts_the_changed_rows():
+    converted = []
+
+    def tracked(value):
+        converted.append(value)
+        return amount(value)
+
+    model = TableModel()
+    model.set_rows([(f"RES{n:05d}", f"${n}.00") for n in range(1024)])
+    model.sort(1, key=tracked)
+    converted.clear()
+
+    model.apply_delta([("RES00005", "$5000.00")])
+
+    assert model.key(len(model) - 1) == "RES00005"
+    assert len(converted) < 30
@@ -0,0 +1,353 @@
+from tkinter import ttk
+import bisect
+import logging
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TableModel:
+    """Full result set for a VirtualTreeview, kept as tuples plus a view index
+
+    Filtering and sorting only rebuild ``view`` (a list of row positions), so
+    the rows themselves are stored once no matter how often the user searches
+    or re-sorts.  ``apply_delta`` patches rows in place and moves only the
+    changed keys within the view.
+    """
+
+    def __init__(self, key_column: int = 0):
+        self.key_column = key_column
+        self.rows: List[Tuple] = []
+        self.view: List[int] = []
+        self._by_key = {}
+        self._search_text: Optional[List[str]] = None
+        self._positions: Optional[dict] = None  # key -> view position, built on first lookup
+        self._query = ""
+        self._sort: Optional[Tuple[int, bool, Optional[Callable]]] = None
+
+    def set_rows(self, rows: Iterable[Sequence]) -> None:
+        """Replace the result set, keeping the current filter and sort"""
+        self.rows = [tuple(r) for r in rows]
+        self._by_key = {r[self.key_column]: i for i, r in enumerate(self.rows)}
+        self._search_text = None
+        self._rebuild_view()
+
+    def apply_delta(self, upserts: Iterable[Sequence], deleted: Iterable = ()) -> None:
+        """Replace changed rows in place, append new ones and drop ``deleted`` keys
+
+        Only the touched keys leave the view and are re-inserted at their sorted
+        position, so the cost does not include re-sorting or re-lowercasing
+        the rows that did not change.
+        """
+        kc = self.key_column
+        upserts = [tuple(r) for r in upserts]
+        deleted = set(deleted)
+        positions = self._view_positions()
+
+        # Take every touched row out of the view; upserted ones go back in below
+        touched = {r[kc] for r in upserts} | deleted
+        removed = sorted((positions.pop(k) for k in touched if k in positions), reverse=True)
+        for position in removed:
+            del self.view[position]
+        start = removed[-1] if removed else len(self.view)
+
+        placed = {}
+        for row in upserts:
+            i = self._by_key.get(row[kc])
+            if i is None:
+                i = self._by_key[row[kc]] = len(self.rows)
+                self.rows.append(row)
+                if self._search_text is not None:
+                    self._search_text.append(self._row_text(row))
+            else:
+                self.rows[i] = row
+                if self._search_text is not None:
+                    self._search_text[i] = self._row_text(row)
+            placed[row[kc]] = i
+
+        dropped = sorted(i for i in (self._by_key.pop(k, None) for k in deleted) if i is not None)
+        if dropped:
+            for key in deleted:
+                placed.pop(key, None)
+            self._drop_rows(dropped)
+            placed = {key: i - bisect.bisect_left(dropped, i) for key, i in placed.items()}
+
+        for i in placed.values():
+            if self._query and self._query not in self._search_text[i]:
+                continue
+            position = self._insertion_point(i)
+            self.view.insert(position, i)
+            start = min(start, position)
+
+        rows, view = self.rows, self.view
+        for position in range(start, len(view)):
+            positions[rows[view[position]][kc]] = position
+
+    def _drop_rows(self, dropped: List[int]) -> None:
+        """Remove the rows at the (sorted) indexes ``dropped``, keeping load order"""
+        gone = set(dropped)
+        self.rows = [r for i, r in enumerate(self.rows) if i not in gone]
+        if self._search_text is not None:
+            self._search_text = [t for i, t in enumerate(self._search_text) if i not in gone]
+        self.view = [i - bisect.bisect_left(dropped, i) for i in self.view]
+        for i in range(dropped[0], len(self.rows)):
+            self._by_key[self.rows[i][self.key_column]] = i
+
+    def _insertion_point(self, i: int) -> int:
+        """View position for row ``i``: after its equals under the sort, else in load order"""
+        if self._sort is None:
+            return bisect.bisect_left(self.view, i)
+        descending = self._sort[1]
+        value = self._sort_value(i)
+        low, high = 0, len(self.view)
+        while low < high:
+            middle = (low + high) // 2
+            other = self._sort_value(self.view[middle])
+            if (value > other) if descending else (value < other):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def filter(self, query: str) -> None:
+        """Show only rows where some column contains ``query`` (case-insensitive)"""
+        self._query = query.strip().lower()
+        self._rebuild_view()
+
+    def sort(self, column: Optional[int], descending: bool = False, key: Optional[Callable] = None) -> None:
+        """Order the view by ``column``; ``key`` converts the display value first
+
+        ``column=None`` drops the sort and restores the order rows were loaded in.
+        """
+        self._sort = (column, descending, key) if column is not None else None
+        self._rebuild_view()
+
+    @staticmethod
+    def _row_text(row: Tuple) -> str:
+        return "\x1f".join(str(v) for v in row).lower()
+
+    def _sort_value(self, i: int):
+        column, _, key = self._sort
+        value = self.rows[i][column]
+        try:
+            return key(value) if key else str(value).lower()
+        except (TypeError, ValueError):
+            return key("") if key else ""
+
+    def _view_positions(self) -> dict:
+        if self._positions is None:
+            rows, kc = self.rows, self.key_column
+            self._positions = {rows[i][kc]: position for position, i in enumerate(self.view)}
+        return self._positions
+
+    def _rebuild_view(self) -> None:
+        self._positions = None
+        if self._query:
+            if self._search_text is None:
+                self._search_text = [self._row_text(r) for r in self.rows]
+            text = self._search_text
+            self.view = [i for i in range(len(self.rows)) if self._query in text[i]]
+        else:
+            self.view = list(range(len(self.rows)))
+
+        if self._sort is not None:
+            self.view.sort(key=self._sort_value, reverse=self._sort[1])
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def row(self, position: int) -> Tuple:
+        """Row at ``position`` in the current (filtered, sorted) view"""
+        return self.rows[self.view[position]]
+
+    def key(self, position: int):
+        return self.row(position)[self.key_column]
+
+    def get(self, key) -> Optional[Tuple]:
+        """Row with ``key`` regardless of the current filter"""
+        i = self._by_key.get(key)
+        return self.rows[i] if i is not None else None
+
+    def position_of(self, key) -> Optional[int]:
+        """Position of the row with ``key`` in the current view, if it is visible"""
+        return self._view_positions().get(key)
+
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview that only materializes the rows that fit on screen
+
+    The widget owns a fixed pool of item "slots" (one per visible line) and a
+    TableModel with the whole result set.  Scrolling or refreshing rewrites
+    the slot values in place, so the cost of a redraw depends on the window
+    height rather than on the number of rows.  Attach a scrollbar with
+    ``set_scrollbar`` so it tracks the model instead of the slots.
+    """
+
+    def __init__(self, master, columns: Sequence[str], key_column: int = 0,
+                 row_tags: Optional[Callable[[Tuple], Tuple]] = None, **kwargs):
+        kwargs.setdefault("show", "headings")
+        super().__init__(master, columns=columns, **kwargs)
+        self.model = TableModel(key_column)
+        self._row_tags = row_tags
+        self._offset = 0
+        self._visible_rows = int(self.cget("height") or 10)
+        self._slots: List[str] = []
+        self._selected_key = None
+        self._scrollbar = None
+
+        # Selection tracking lives on a private bindtag so screens can still
+        # bind <<TreeviewSelect>> on the widget without replacing it
+        select_tag = f"VirtualTreeview{id(self)}"
+        self.bind_class(select_tag, "<<TreeviewSelect>>", self._on_select)
+        self.bindtags((select_tag,) + self.bindtags())
+
+        self.bind("<Configure>", self._on_resize, add="+")
+        self.bind("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.bind("<Button-5>", lambda e: self._scroll_rows(3))
+        self.bind("<Up>", lambda e: self._move_selection(-1))
+        self.bind("<Down>", lambda e: self._move_selection(1))
+        self.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows))
+        self.bind("<Next>", lambda e: self._move_selection(self._visible_rows))
+
+    # ----- data -----
+
+    def set_rows(self, rows: Iterable[Sequence]) -> None:
+        """Load a new result set; selection survives if the selected key is still present"""
+        self.model.set_rows(rows)
+        self._clamp_offset()
+        self.render()
+
+    def apply_delta(self, upserts: Iterable[Sequence], deleted: Iterable = ()) -> None:
+        """Patch the changed rows without reloading the whole result set"""
+        self.model.apply_delta(upserts, deleted)
+        self._clamp_offset()
+        self.render()
+
+    def filter(self, query: str) -> None:
+        self.model.filter(query)
+        self._offset = 0
+        self.render()
+
+    def sort(self, column: Optional[int], descending: bool = False, key: Optional[Callable] = None) -> None:
+        self.model.sort(column, descending, key)
+        self._offset = 0
+        self.render()
+
+    def selected_values(self) -> Optional[Tuple]:
+        """Model row of the current selection, even if it is scrolled out of view"""
+        if self._selected_key is None:
+            return None
+        position = self.model.position_of(self._selected_key)
+        return self.model.row(position) if position is not None else None
+
+    def clear_selection(self) -> None:
+        self._selected_key = None
+        self.render()
+
+    # ----- scrolling -----
+
+    def set_scrollbar(self, scrollbar) -> None:
+        self._scrollbar = scrollbar
+        scrollbar.configure(command=self.yview)
+        self._update_scrollbar()
+
+    def yview(self, *args):
+        """Scrollbar protocol, applied to the model offset instead of the items"""
+        total = len(self.model)
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self._visible_rows if args[2] == "pages" else 1
+            self._offset += amount * step
+        self._clamp_offset()
+        self.render()
+
+    def _scroll_rows(self, amount: int) -> str:
+        self._offset += amount
+        self._clamp_offset()
+        self.render()
+        return "break"
+
+    def _on_mousewheel(self, event) -> str:
+        return self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _clamp_offset(self) -> None:
+        self._offset = max(0, min(self._offset, len(self.model) - self._visible_rows))
+
+    def _fractions(self) -> Tuple[float, float]:
+        total = len(self.model)
+        if total <= self._visible_rows:
+            return 0.0, 1.0
+        return self._offset / total, min(1.0, (self._offset + self._visible_rows) / total)
+
+    def _update_scrollbar(self) -> None:
+        if self._scrollbar is not None:
+            self._scrollbar.set(*self._fractions())
+
+    # ----- selection -----
+
+    def _on_select(self, event=None) -> None:
+        selected = self.selection()
+        if selected and selected[0] in self._slots:
+            position = self._offset + self._slots.index(selected[0])
+            if position < len(self.model):
+                self._selected_key = self.model.key(position)
+
+    def _move_selection(self, step: int) -> str:
+        if not len(self.model):
+            return "break"
+        position = self.model.position_of(self._selected_key) if self._selected_key is not None else None
+        position = 0 if position is None else max(0, min(len(self.model) - 1, position + step))
+        self._selected_key = self.model.key(position)
+
+        if position < self._offset:
+            self._offset = position
+        elif position >= self._offset + self._visible_rows:
+            self._offset = position - self._visible_rows + 1
+        self.render()
+        self.event_generate("<<TreeviewSelect>>")
+        return "break"
+
+    # ----- rendering -----
+
+    def _on_resize(self, event=None) -> None:
+        if not self._slots:
+            return
+        bbox = self.bbox(self._slots[0])
+        if not bbox:
+            return
+        _, top, _, row_height = bbox
+        fits = max(1, (self.winfo_height() - top) // max(1, row_height))
+        if fits != self._visible_rows:
+            self._visible_rows = fits
+            self._clamp_offset()
+            self.render()
+
+    def render(self) -> None:
+        """Rewrite the visible slots from the model"""
+        count = min(self._visible_rows, max(0, len(self.model) - self._offset))
+        while len(self._slots) < count:
+            self._slots.append(self.insert("", "end"))
+        while len(self._slots) > count:
+            self.delete(self._slots.pop())
+
+        selected_slot = None
+        for i, slot in enumerate(self._slots):
+            values = self.model.row(self._offset + i)
+            tags = self._row_tags(values) if self._row_tags else ()
+            self.item(slot, values=values, tags=tags)
+            if self._selected_key is not None and values[self.model.key_column] == self._selected_key:
+                selected_slot = slot
+
+        # Slots are reused for other rows, so the Tk selection follows the key
+        if selected_slot:
+            if self.selection() != (selected_slot,):
+                self.selection_set(selected_slot)
+            self.focus(selected_slot)
+        elif self.selection():
+            self.selection_remove(self.selection())
+        self._update_scrollbar()